@@ -3,6 +3,8 @@ FINPLOY SQL → SCREENING SYNC (NOT INTERESTED SYNC)
 WITH SCRIPT_RUN_LOG LOGGING (SUCCESS / FAILURE)
 """
 
+import os
+import sys
 import gspread
 import pandas as pd
 import mysql.connector
@@ -12,6 +14,9 @@ import re
 import gspread.utils
 import traceback
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from finploy_core.sheet_writes import WritePlanner
+
 
 # =====================================================================
 # GOOGLE SHEET LOGGING CONFIG  (Script_Run_Log)
@@ -205,7 +210,7 @@ class ScreeningNotInterestedSync:
         existing = idx["existing"]
         idx_remark = idx["idx_remark"]
 
-        updates = []
+        updates = WritePlanner()
         append_rows = []
         update_count = 0
         append_count = 0
@@ -223,8 +228,7 @@ class ScreeningNotInterestedSync:
             if phone in existing:
                 sheet_row = existing[phone]
 
-                a1 = gspread.utils.rowcol_to_a1(sheet_row, idx_remark + 1)
-                updates.append({"range": a1, "values": [["Not Interested"]]})
+                updates.set(sheet_row, idx_remark + 1, "Not Interested")
                 update_count += 1
 
                 print(f"🔄 UPDATE ONLY: {phone}")
@@ -234,7 +238,7 @@ class ScreeningNotInterestedSync:
                 print(f"🆕 APPEND NEW: {phone}")
 
         if updates:
-            self.ws.batch_update(updates)
+            updates.send(self.ws)
 
         if append_rows:
             self.ws.append_rows(append_rows)
@@ -6,6 +6,10 @@ from tkinter import messagebox
 import os
 import re
 import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from finploy_core.enrich import map_distinct
 
 # =====================================================
 # CONFIGURATION
@@ -45,7 +49,7 @@ def split_designation_company(text):
     parts = text.split(" at ", 1)
     return (parts[0].strip(), parts[1].strip()) if len(parts) == 2 else (text.strip(), "")
 
-df["designation"], df["company"] = zip(*df[employment_col].apply(split_designation_company))
+df["designation"], df["company"] = zip(*map_distinct(df[employment_col], split_designation_company))
 
 df["designation"] = df["designation"].fillna("NA")
 designations = sorted(set(df["designation"].tolist()))
@@ -1,8 +1,14 @@
 import pandas as pd
+import json
 import os
+import sys
 import customtkinter as ctk
 from tkinter import messagebox
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from finploy_core.enrich import map_distinct
+from finploy_core.segments import segment_name
+
 # -------------------------------
 # Phase 2.2 – Data Cleaning & Activity Tracking Script (Updated)
 # -------------------------------
@@ -12,6 +18,16 @@ input_file = r"D:\matching_harsh\Job_matching_Screened\output\output1.xlsx"
 OUTPUT_DIR = r"D:\matching_harsh\Job_matching_Screened\output"
 output_file = os.path.join(OUTPUT_DIR, "output2.xlsx")
 
+# Multi-segment mode: one run covers every (designation filter, department, product)
+# segment listed here instead of asking for a single department/product. The filter is a
+# case-insensitive regex on 'designation' (None = every row); a row is kept once per
+# segment it matches and tagged with a 'segment' column. [] = ask in the dialog.
+# The list is handed to the final stage, which fans rows out after enrichment.
+SEGMENTS = [
+    # ('home loan|housing|lap|mortgage', 3, 3),
+    # ('gold loan', 3, 5),
+]
+
 # Load the Excel file
 df = pd.read_excel(input_file)
 
@@ -43,7 +59,7 @@ def convert_to_lacs(value):
         return round(value / 100000, 2)  # Convert ₹ to Lacs
     return round(value, 2)  # Already in Lacs
 
-clean_salary = salary_series.apply(convert_to_lacs)
+clean_salary = map_distinct(salary_series, convert_to_lacs)  # once per distinct salary
 
 # Step 4: Insert or update the column
 if 'clean_salary' in df.columns:
@@ -156,18 +172,25 @@ class InputApp(ctk.CTk):
         global DEPT_VALUE, PROD_VALUE
         DEPT_VALUE, PROD_VALUE = dept, prod
 
-# Run the app
-app = InputApp()
-app.mainloop()
+if SEGMENTS:
+    # department/product are filled per segment by the final stage's fan-out
+    df['department'] = ''
+    df['product'] = ''
+    SUMMARY = f"Segments: {', '.join(dict.fromkeys(segment_name(d, p) for _, d, p in SEGMENTS))}"
+else:
+    # Run the app
+    app = InputApp()
+    app.mainloop()
 
-# -------------------------------
-# 🧩 Apply Values to DataFrame
-# -------------------------------
-df['department'] = DEPT_VALUE
-df['product'] = PROD_VALUE
+    # -------------------------------
+    # 🧩 Apply Values to DataFrame
+    # -------------------------------
+    df['department'] = DEPT_VALUE
+    df['product'] = PROD_VALUE
+    SUMMARY = f"Department: {DEPT_VALUE}\nProduct: {PROD_VALUE}"
 
-print(f"✅ Department set as: {DEPT_VALUE}")
-print(f"✅ Product set as: {PROD_VALUE}")
+    print(f"✅ Department set as: {DEPT_VALUE}")
+    print(f"✅ Product set as: {PROD_VALUE}")
 
 # -------------------------------
 # Task 7 – Reorder Columns
@@ -187,14 +210,15 @@ df = df[final_order]
 # Save Output
 # -------------------------------
 df.to_excel(output_file, index=False)
-messagebox.showinfo("Success", f"File saved successfully!\n\nDepartment: {DEPT_VALUE}\nProduct: {PROD_VALUE}\n\nSaved as:\n{output_file}")
+SEGMENT_ARGS = ["--segments", json.dumps(SEGMENTS)] if SEGMENTS else []
+messagebox.showinfo("Success", f"File saved successfully!\n\n{SUMMARY}\n\nSaved as:\n{output_file}")
 print(f"✅ File saved successfully at: {output_file}")
 
 import subprocess
 try:
     import subprocess
-    print("▶️ Running main2.py ...")
-    subprocess.run(["python", r"D:\matching_harsh\Job_matching_Screened\main2.py"], check=True)
-    print("✅ main2.py executed successfully!")
+    print("▶️ Running main3.py ...")
+    subprocess.run(["python", r"D:\matching_harsh\Job_matching_Screened\main3.py"] + SEGMENT_ARGS, check=True)
+    print("✅ main3.py executed successfully!")
 except Exception as e:
-    print(f"❌ Failed to run main2.py: {e}")
\ No newline at end of file
+    print(f"❌ Failed to run main3.py: {e}")
\ No newline at end of file
@@ -1,3 +1,5 @@
+import os
+import sys
 import time
 import math
 import pandas as pd
@@ -7,6 +9,10 @@ from gspread.exceptions import APIError
 from datetime import datetime
 import tkinter as tk
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from finploy_core.sheet_writes import WritePlanner
+from finploy_core.tracker import TrackerIndex, normalize_contact
+
 # ======================================================
 # CONFIG
 # ======================================================
@@ -86,16 +92,6 @@ def safe_api(fn,*a,**k):
             else:
                 raise
 
-def col_idx_to_letter(idx):
-    """Convert column index (0-based) to column letter (A, B, ..., Z, AA, AB, ...)"""
-    result = ""
-    idx += 1  # Convert to 1-based
-    while idx > 0:
-        idx -= 1
-        result = chr(65 + (idx % 26)) + result
-        idx //= 26
-    return result
-
 # ======================================================
 # LOAD DATA
 # ======================================================
@@ -130,16 +126,20 @@ ws_lineup = gc.open(GS_WORKBOOK_NAME).worksheet(TAB_LINEUP)
 # SCREENING (UNCHANGED LOGIC)
 # ======================================================
 screen_values = ws_screening.get_all_values()
-headers = screen_values[0]
-col_idx = {h:i for i,h in enumerate(headers)}
+screen_tracker = TrackerIndex(screen_values)
+headers = screen_tracker.headers
+col_idx = {h:i-1 for h,i in screen_tracker.columns.items()}
 screen_df = pd.DataFrame(screen_values[1:], columns=headers)
 
 new_rows = []
 updated_indices = set()
 unique_candidates = merged_df.drop_duplicates("clean_phone", keep="last")
 
-for _, row in unique_candidates.iterrows():
-    phone = str(row.get("clean_phone","")).strip()
+# Update-vs-append for every candidate in one lookup against the tracker index
+phones = normalize_contact(unique_candidates["clean_phone"])
+tracker_rows = screen_tracker.match(phones)
+
+for (_, row), phone, rownum in zip(unique_candidates.iterrows(), phones, tracker_rows):
     if not phone:
         continue
 
@@ -150,14 +150,9 @@ for _, row in unique_candidates.iterrows():
     name = str(row.get("name of candidate","")).strip()
     location = str(row.get("location","")).strip()
 
-    matches = (
-        screen_df.index[screen_df["Contact"].astype(str).str.strip()==phone].tolist()
-        if "Contact" in screen_df.columns else []
-    )
-
-    if matches:
+    if rownum:
         # Entry exists - UPDATE all values except Contact column
-        match_idx = matches[-1]
+        match_idx = rownum - 2
         for col_name in headers:
             if col_name == "Contact":
                 # Don't update Contact column
@@ -183,10 +178,7 @@ for _, row in unique_candidates.iterrows():
         updated_indices.add(match_idx)
     else:
         # Entry doesn't exist - CREATE new row
-        next_id = int(pd.to_numeric(
-            screen_df.get("candidate_id",pd.Series()),
-            errors="coerce"
-        ).max() or 0) + 1
+        next_id = screen_tracker.next_candidate_id()
 
         buf = [""]*len(headers)
 
@@ -205,19 +197,20 @@ for _, row in unique_candidates.iterrows():
         put("Location",location)
 
         new_rows.append(buf)
+        screen_tracker.append(buf)
 
 
-# Handle updated rows - update them in Google Sheets
-if updated_indices:
-    for idx in updated_indices:
-        # Get the row number in the sheet (add 2 because sheet starts at row 1, and row 1 is headers)
-        row_number = idx + 2
-        updated_row = screen_df.iloc[idx].tolist()
-        updated_row = sanitize_rows_for_gs([updated_row], headers, "SCREENING")[0]
-        # Calculate the correct column range based on number of headers
-        end_col = col_idx_to_letter(len(headers) - 1)
-        range_name = f"A{row_number}:{end_col}{row_number}"
-        safe_api(ws_screening.update, values=[updated_row], range_name=range_name, value_input_option="USER_ENTERED")
+# Handle updated rows - send only the cells that differ from the fetched sheet
+screen_writes = WritePlanner()
+changed_rows = 0
+for idx in sorted(updated_indices):
+    # Get the row number in the sheet (add 2 because sheet starts at row 1, and row 1 is headers)
+    row_number = idx + 2
+    updated_row = screen_df.iloc[idx].tolist()
+    updated_row = sanitize_rows_for_gs([updated_row], headers, "SCREENING")[0]
+    if screen_writes.set_row_changes(row_number, updated_row, screen_tracker.row(row_number)):
+        changed_rows += 1
+screen_writes.send(ws_screening, call=safe_api, value_input_option="USER_ENTERED")
 
 # Handle new rows - append them to Google Sheets
 if new_rows:
@@ -228,13 +221,10 @@ if new_rows:
 # LINEUP (FULL MAPPING FIXED)
 # ======================================================
 line_values = ws_lineup.get_all_values()
-line_headers = line_values[0]
+line_tracker = TrackerIndex(line_values)
+line_headers = line_tracker.headers
 line_idx = {norm(h):i for i,h in enumerate(line_headers)}
 
-line_df = pd.DataFrame(line_values[1:], columns=line_headers)
-candidate_series = pd.to_numeric(line_df.get("candidate_id"), errors="coerce")
-lineup_max_id = int(candidate_series.max()) if candidate_series.notna().any() else 0
-
 intstd_df = txt_df[txt_df["status"].str.strip().str.lower()=="intstd"]
 lineup_merge = matches_df.merge(
     intstd_df,
@@ -246,7 +236,7 @@ lineup_merge = matches_df.merge(
 line_new_rows = []
 
 for _, r in lineup_merge.iterrows():
-    lineup_max_id += 1
+    lineup_id = line_tracker.next_candidate_id()
     l_date_str, l_time_str = extract_date_time(r.get("entry_date"))
     buf = [""]*len(line_headers)
 
@@ -255,7 +245,7 @@ for _, r in lineup_merge.iterrows():
         if k in line_idx:
             buf[line_idx[k]] = v
 
-    put("candidate_id",str(lineup_max_id))
+    put("candidate_id",str(lineup_id))
     put("Date",l_date_str)
     put("Computer_Time",l_time_str)
     put("HR",r.get("job_hr_name",""))
@@ -282,6 +272,7 @@ for _, r in lineup_merge.iterrows():
     put("Education",r.get("education 2",""))
 
     line_new_rows.append(buf)
+    line_tracker.append(buf)
 
 if line_new_rows:
     line_new_rows = sanitize_rows_for_gs(line_new_rows, line_headers, "LINEUP")
@@ -290,6 +281,7 @@ if line_new_rows:
 # ======================================================
 # SUMMARY
 # ======================================================
+print("SCREENING updated:", changed_rows, "of", len(updated_indices), "matched rows changed")
 print("SCREENING appended:", len(new_rows))
 print("LINEUP appended:", len(line_new_rows))
 
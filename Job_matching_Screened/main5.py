@@ -1,5 +1,18 @@
 import pandas as pd
+import argparse
 import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from finploy_core.matching import PrefixHierarchy
+from finploy_core.rules import compile_rule
+from finploy_core.geo import city_neighbours
+from finploy_core.match_store import MatchStore
+from finploy_core.candidate_pool import CandidatePool
+from finploy_core.ranking import rank_matches
+from finploy_core.segments import export_segments
+from finploy_core.diagnostics import match_stats, write_match_stats
 
 # =============================================================================
 # CONFIGURATION - UPDATE THESE!
@@ -7,6 +20,41 @@ import os
 JOBS_FILE = r'D:\matching_harsh\Job_matching_Screened\final_input\MASTER FILE LOCATIONS - Mapping.xlsx'
 CANDIDATES_FILE = r'D:\matching_harsh\Job_matching_Screened\output\output4.xlsx'
 OUTPUT_DIR = r'D:\matching_harsh\Job_matching_Screened\final_output\all_job_matches'
+SEGMENT_DIR = os.path.join(OUTPUT_DIR, 'segments')  # multi-segment runs: one file per segment
+MATCH_STORE_FILE = r'D:\matching_harsh\Job_matching_Screened\output\match_state.sqlite'  # reruns reuse unchanged matches
+POOL_DIR = r'D:\matching_harsh\Job_matching_Screened\candidate_pool'  # every day's output4, by city_id
+MATCH_WORKERS = os.cpu_count()  # processes for city_id-sharded matching (1 = in-process)
+
+# Related codes a job also accepts: job code -> candidate codes, e.g.
+# PRODUCT_HIERARCHY = {8: [9]} lets product 8 (mortgage) jobs see product 9 (home loan) candidates
+DEPARTMENT_HIERARCHY = {}
+PRODUCT_HIERARCHY = {}
+
+# Radius mode: jobs also take candidates from every city within MATCH_RADIUS_KM
+# (None = same city_id only). Coordinates CSV columns: city_id, latitude, longitude.
+CITY_COORDINATES_FILE = r'D:\matching_harsh\city_coordinates.csv'
+MATCH_RADIUS_KM = None
+
+HIERARCHY = PrefixHierarchy(
+    DEPARTMENT_HIERARCHY, PRODUCT_HIERARCHY,
+    cities=city_neighbours(CITY_COORDINATES_FILE, MATCH_RADIUS_KM) if MATCH_RADIUS_KM else None,
+)
+
+# Match rule (keys as in finploy_core.rules.RULE_DEFAULTS): the job pays a
+# 10%–90% hike over the candidate salary, compared as shown in the Hike column
+MATCH_RULE = {
+    'hike_pct': (10, 90),
+    'hike_decimals': 1,
+}
+SALARY_RULE = compile_rule(MATCH_RULE)
+
+# Fan-out limits on the exported matches (None = no limit, the full match list
+# as before). Set e.g. 10 jobs per candidate / 300 candidates per job to bound
+# the export; pairs are then ranked by hike closeness to the middle of the
+# hike band, job Date and candidate Activity/Modification.
+TOP_JOBS_PER_CANDIDATE = None
+TOP_CANDIDATES_PER_JOB = None
+MATCH_BUDGET = None
 
 JOBS_COLUMNS = {
     'job_id_col': 'job_id',
@@ -42,126 +90,37 @@ def load_excel_data():
         return None, None
 
 
-def parse_composite_key(key_str):
-    """Split key into parts; return prefix, salary, and full parts."""
-    if pd.isna(key_str) or '_' not in str(key_str) or str(key_str).count('_') != 3:
-        raise ValueError(f"Invalid key '{key_str}': Must be exactly 4 parts separated by '_' (e.g., '126_5_8_2.6').")
-    parts = str(key_str).split('_')
-    prefix = '_'.join(parts[:3])
-    try:
-        salary = float(parts[3])
-    except ValueError:
-        raise ValueError(f"Invalid salary '{parts[3]}' in key '{key_str}': Must be a number like 2.6.")
-    return prefix, salary, parts
-
-
-def find_matching_candidates_for_all_jobs(jobs_df, candidates_df):
-    """Find matching candidates for all jobs based on composite_key and salary."""
-    results = {}
-    candidates_by_prefix = {}
-
-    # Build prefix lookup for candidates
-    for _, row in candidates_df.iterrows():
-        cand_key = row[CANDIDATES_COLUMNS['composite_key_col']]
-        try:
-            prefix, cand_salary, _ = parse_composite_key(cand_key)
-            if prefix not in candidates_by_prefix:
-                candidates_by_prefix[prefix] = []
-            candidates_by_prefix[prefix].append({
-                'candidate_id': row[CANDIDATES_COLUMNS['candidate_id_col']],
-                'salary': cand_salary,
-                'full_row': row
-            })
-        except ValueError:
-            continue
-
-    # Process each job
-    for _, job_row in jobs_df.iterrows():
-        job_id = job_row[JOBS_COLUMNS['job_id_col']]
-        job_key = job_row[JOBS_COLUMNS['composite_key_col']]
-        try:
-            prefix, target_salary, _ = parse_composite_key(job_key)
-            if prefix in candidates_by_prefix:
-                matches = [cand['full_row'] for cand in candidates_by_prefix[prefix] if cand['salary'] <= target_salary]
-                match_df = pd.DataFrame(matches) if matches else pd.DataFrame()
-                results[job_id] = {
-                    'job_key': job_key,
-                    'target_salary': target_salary,
-                    'matches': match_df,
-                    'count': len(match_df),
-                    'job_row': job_row
-                }
-            else:
-                results[job_id] = {
-                    'job_key': job_key,
-                    'target_salary': target_salary,
-                    'matches': pd.DataFrame(),
-                    'count': 0,
-                    'job_row': job_row
-                }
-        except ValueError:
-            continue
-
-    return results
-
-
-def export_to_single_excel(results):
+def hike_column(pairs):
+    """Name of the Hike column to export (only when candidates carry clean_salary)."""
+    return 'Hike' if 'clean_salary' in pairs.candidates_df.columns else None
+
+
+def apply_ranking(pairs):
+    """Keep the best-ranked matches within the fan-out limits."""
+    ranked = rank_matches(pairs, MATCH_RULE['hike_pct'], top_per_candidate=TOP_JOBS_PER_CANDIDATE,
+                          top_per_job=TOP_CANDIDATES_PER_JOB, budget=MATCH_BUDGET)
+    if len(ranked) < len(pairs):
+        print(f"🏅 Ranked matches: kept {len(ranked)} of {len(pairs)}")
+    return ranked
+
+
+def export_to_single_excel(pairs):
     """Export all job-candidate matches to one Excel file."""
     if not os.path.exists(OUTPUT_DIR):
         os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-    all_matches_dfs = []
-    total_matches = 0
-
-    for job_id, data in results.items():
-        match_df = data['matches']
-        job_row = data['job_row']
-
-        if not match_df.empty:
-            match_df_with_job = match_df.copy()
-
-            # Add job info columns
-            match_df_with_job['job_id'] = job_id
-            match_df_with_job['Active /Inactive'] = job_row[JOBS_COLUMNS['status_col']]
-            match_df_with_job['job_date'] = job_row[JOBS_COLUMNS['date_col']]
-            match_df_with_job['job_composit_key'] = job_row[JOBS_COLUMNS['composite_key_col']]
-            match_df_with_job['job_company'] = job_row[JOBS_COLUMNS['company_col']]
-            match_df_with_job['job_designation'] = job_row[JOBS_COLUMNS['designation_col']]
-            match_df_with_job['job_location'] = job_row[JOBS_COLUMNS['location_col']]
-            match_df_with_job['job_hr_name'] = job_row[JOBS_COLUMNS['hr_name_col']]
-            match_df_with_job['company_code'] = job_row[JOBS_COLUMNS['company_code']]
-
-            # Job salary and hike%
-            try:
-                job_salary = float(str(job_row[JOBS_COLUMNS['composite_key_col']]).split('_')[-1])
-            except Exception:
-                job_salary = None
-
-            match_df_with_job['Job_salary'] = job_salary
-
-            if 'clean_salary' in match_df_with_job.columns:
-                match_df_with_job['Hike'] = (
-                    ((match_df_with_job['Job_salary'] - match_df_with_job['clean_salary'])
-                     / match_df_with_job['clean_salary']) * 100
-                ).round(1)
-                match_df_with_job = match_df_with_job[
-                    (match_df_with_job['Hike'] >= 10) & (match_df_with_job['Hike'] <= 90)
-                ]
-                match_df_with_job['Hike'] = match_df_with_job['Hike'].astype(str) + '%'
-
-            if not match_df_with_job.empty:
-                all_matches_dfs.append(match_df_with_job)
-                total_matches += len(match_df_with_job)
-
-    if all_matches_dfs:
-        combined_df = pd.concat(all_matches_dfs, ignore_index=True)
-
-        # ✅ Save single output file only
+    hike_col = hike_column(pairs)
+    pairs = apply_ranking(pairs)
+
+    total_matches = len(pairs)
+    if total_matches:
+        # ✅ Save single output file only (rows are gathered chunk by chunk)
         output_file = os.path.join(OUTPUT_DIR, 'all_job_matches_duplicate.xlsx')
-        combined_df.to_excel(output_file, index=False, engine='openpyxl')
+        pairs.to_excel(output_file, hike_col=hike_col)
 
         print(f"\n💾 Exported all matches to: {output_file}")
         print(f"📊 Total rows exported: {total_matches}")
+        export_segments(pairs, SEGMENT_DIR, 'all_job_matches.xlsx', hike_col=hike_col)
     else:
         print("\n⚠️ No matches found; no output file created.")
 
@@ -177,25 +136,59 @@ def main():
         return
 
     print("\n🔍 Finding matches for all jobs...")
-    results = find_matching_candidates_for_all_jobs(jobs_df, candidates_df)
-
-    if not results:
-        print("❌ No results to process.")
-        return
+    pairs = MatchStore(MATCH_STORE_FILE).match_pairs(jobs_df, candidates_df, SALARY_RULE, JOBS_COLUMNS,
+                                                     CANDIDATES_COLUMNS, workers=MATCH_WORKERS, hierarchy=HIERARCHY)
+    # Counters on why jobs did/didn't match, from the unranked pairs
+    write_match_stats(match_stats(pairs, SALARY_RULE, CANDIDATES_COLUMNS, HIERARCHY), OUTPUT_DIR)
 
     print("\n💾 Exporting results...")
-    total_exported = export_to_single_excel(results)
+    total_exported = export_to_single_excel(pairs)
+
+    added = CandidatePool(POOL_DIR, candidates_columns=CANDIDATES_COLUMNS).append(candidates_df)
+    print(f"🗃️ Added {added} candidates to the historical pool: {POOL_DIR}")
 
     print(f"\n🎯 Completed successfully. Total rows exported: {total_exported}")
 
 
+def run_job_delta():
+    """Match new/changed Mapping jobs against the historical candidate pool."""
+    print("🚀 Job-delta matcher: new/changed jobs vs. historical candidate pool")
+    print("=" * 70)
+
+    jobs_df = pd.read_excel(JOBS_FILE)
+    pool = CandidatePool(POOL_DIR, candidates_columns=CANDIDATES_COLUMNS)
+    new_pairs, dropped, stored = pool.match_job_delta(jobs_df, SALARY_RULE, jobs_columns=JOBS_COLUMNS,
+                                                      workers=MATCH_WORKERS, hierarchy=HIERARCHY)
+    print(f"🗑️ Dropped stored matches for {len(dropped)} changed/inactive jobs")
+
+    hike_col = hike_column(new_pairs)
+    new_pairs = apply_ranking(new_pairs)
+    if not len(new_pairs):
+        print("\n⚠️ No new pool matches; no output file created.")
+        return
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    output_file = os.path.join(OUTPUT_DIR, 'pool_delta_matches.xlsx')
+    new_pairs.to_excel(output_file, hike_col=hike_col)
+    print(f"\n💾 Exported {len(new_pairs)} new pool matches to: {output_file}")
+    print(f"📊 Pool matches now held for {stored['job_id'].nunique() if len(stored) else 0} active jobs")
+
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--job-delta', action='store_true',
+                        help='Only match new/changed jobs against the historical candidate pool')
+    args, _ = parser.parse_known_args()
+    if args.job_delta:
+        run_job_delta()
+        sys.exit(0)  # delta output is reviewed on its own; don't chain into main6.py
     main()
-import subprocess
-try:
-    import subprocess
-    print("▶️ Running main6.py ...")
-    subprocess.run(["python", r"D:\matching_harsh\Job_matching_Screened\main6.py"], check=True)
-    print("✅ main6.py executed successfully!")
-except Exception as e:
-    print(f"❌ Failed to run main6.py: {e}")
\ No newline at end of file
+
+    # Inside the __main__ guard: ProcessPoolExecutor workers re-import this
+    # file on Windows and must not chain into main6.py themselves.
+    try:
+        print("▶️ Running main6.py ...")
+        subprocess.run(["python", r"D:\matching_harsh\Job_matching_Screened\main6.py"], check=True)
+        print("✅ main6.py executed successfully!")
+    except Exception as e:
+        print(f"❌ Failed to run main6.py: {e}")
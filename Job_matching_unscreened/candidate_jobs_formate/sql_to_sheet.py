@@ -20,6 +20,8 @@ Rules:
      - Do NOT change candidate_id, Date, Manual/Computer, etc.
 """
 
+import os
+import sys
 import gspread
 import pandas as pd
 import mysql.connector
@@ -28,6 +30,9 @@ from datetime import datetime
 import gspread.utils
 import re
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from finploy_core.sheet_writes import WritePlanner
+
 
 def normalize_phone(s):
     if not s:
@@ -367,7 +372,7 @@ class FinployLineupSync:
 
         latest_by_phone = self.build_latest_sql_by_phone(df_sql)
 
-        update_requests = []
+        update_writes = WritePlanner()
         append_buffer = []
 
         updated_rows = 0
@@ -404,16 +409,13 @@ class FinployLineupSync:
                     continue
 
                 if latest_date:
-                    a1 = gspread.utils.rowcol_to_a1(r, idx_digit_instd_date + 1)
-                    update_requests.append({"range": a1, "values": [[latest_date]]})
+                    update_writes.set(r, idx_digit_instd_date + 1, latest_date)
 
                 if idx_digit_instd_time is not None and latest_time:
-                    a1 = gspread.utils.rowcol_to_a1(r, idx_digit_instd_time + 1)
-                    update_requests.append({"range": a1, "values": [[latest_time]]})
+                    update_writes.set(r, idx_digit_instd_time + 1, latest_time)
 
                 if idx_digital_instd is not None:
-                    a1 = gspread.utils.rowcol_to_a1(r, idx_digital_instd + 1)
-                    update_requests.append({"range": a1, "values": [["yes"]]})
+                    update_writes.set(r, idx_digital_instd + 1, "yes")
 
                 updated_rows += 1
 
@@ -473,8 +475,8 @@ class FinployLineupSync:
         else:
             print("ℹ️ No rows to append.")
 
-        if update_requests:
-            self.ws.batch_update(update_requests)
+        if update_writes:
+            update_writes.send(self.ws)
             print(f"🛠️ Updated {updated_rows} existing row(s) with latest click data.")
         else:
             print("ℹ️ No rows required update.")
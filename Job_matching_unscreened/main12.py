@@ -2,8 +2,23 @@
 import pandas as pd
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
+import argparse
+import json
 import os
-import string
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from finploy_core.enrich import map_distinct, map_distinct_rows
+from finploy_core.fuzzy_locations import FuzzyLocationFallback
+from finploy_core.matching import KEY_COLUMNS, typed_key_columns
+from finploy_core.pincodes import PincodeIndex
+from finploy_core.location_master import load_location_values, location_frame
+from finploy_core.locations import (
+    LOCATION_COLUMNS, LocationResolver, blank_locations, normalize_location, normalize_master_name,
+    unmatched_location_rows,
+)
+from finploy_core.segments import SEGMENT_COL, fan_out_segments
+from finploy_core.unmatched_store import STORE_FILENAME, UnmatchedLocationStore
 
 # -------------------------------
 # Phase 2.5 – Final Integration with Candidate ID and Composit Key
@@ -13,8 +28,15 @@ if not os.path.exists(OUTPUT_DIR):
     os.makedirs(OUTPUT_DIR)
 
 # Input and Output
-input_file = r"D:\matching_harsh\Job_matching_unscreened\output\output3.xlsx"
+input_file = r"D:\matching_harsh\Job_matching_unscreened\output\output2.xlsx"
 output_file = os.path.join(OUTPUT_DIR, "output4.xlsx")  # Updated main dataset
+# Unmatched locations, one row each (team workbook: python -m finploy_core.unmatched_store <store>)
+unmatched_store_file = os.path.join(OUTPUT_DIR, STORE_FILENAME)
+
+# Multi-segment runs: main9 passes its SEGMENTS as --segments <json>
+parser = argparse.ArgumentParser(add_help=False)
+parser.add_argument('--segments', type=json.loads, default=[])
+SEGMENTS = parser.parse_known_args()[0].segments
 
 # -------------------------------
 # Google Sheets setup
@@ -24,41 +46,35 @@ scope = ["https://spreadsheets.google.com/feeds",
 creds = ServiceAccountCredentials.from_json_keyfile_name("service_account.json", scope)
 client = gspread.authorize(creds)
 
-# Open Google Sheet by Sheet ID
-sheet_id = "11Yye2zMLOgb0J8wBjH0VJNuOV28AAERNPxr3RE2OO-E"
-sheet = client.open_by_key(sheet_id).sheet1
-
-# Read all data and handle duplicate headers
-headers = sheet.row_values(1)
-seen = {}
-unique_headers = []
-for h in headers:
-    h_clean = h.strip()
-    if h_clean in seen:
-        seen[h_clean] += 1
-        h_clean = f"{h_clean}_{seen[h_clean]}"
-    else:
-        seen[h_clean] = 0
-    unique_headers.append(h_clean)
-
-data_rows = sheet.get_all_values()[1:]  # skip header row
-df_location = pd.DataFrame(data_rows, columns=unique_headers)
-
-# Ensure required columns exist
-required_cols = ['area', 'city', 'state', 'city_wise_id', 'pincode', 'id']
-for col in required_cols:
-    if col not in df_location.columns:
-        df_location[col] = '0'
-
-# Strip spaces and punctuation
-for col in ['area', 'city', 'id', 'city_wise_id', 'pincode']:
-    df_location[col] = df_location[col].astype(str).str.strip().str.rstrip(string.punctuation)
+# Finploy Location Master (cached locally, re-downloaded only when the sheet's
+# Drive revision changes)
+df_location = location_frame(load_location_values(client))
 
 # -------------------------------
 # Load main candidate dataset
 # -------------------------------
 df_main = pd.read_excel(input_file, engine='openpyxl')
 
+# -------------------------------
+# Map finploy_id and location metadata
+# -------------------------------
+# City first, then area; each name resolves to the first master row carrying it.
+# Names neither knows fall back to a pincode written in the text (or the nearest one
+# in its district), then to a trigram-similarity guess remembered in location_aliases.json
+pincode_index = PincodeIndex(df_location)
+resolver = LocationResolver(df_location, ('city', 'area'), normalize_location, master_normalize=normalize_master_name,
+                            fallback=[pincode_index, FuzzyLocationFallback()])
+positions = resolver.positions(df_main['location'])
+positions[blank_locations(df_main['location'])] = -1
+if 'pincode' in df_main.columns:  # scrapes that carry the candidate's pincode (covers blank locations)
+    positions = pincode_index.fill(positions, df_main['pincode'])
+
+# Unmatched locations are upserted with a sample candidate and its full input row
+UnmatchedLocationStore(unmatched_store_file).record(unmatched_location_rows(df_main, positions))
+
+df_main[['finploy_id','area','city','state','city_id','candidate_pincode']] = \
+    resolver.take(positions, LOCATION_COLUMNS, fill='0').to_numpy()
+
 # Rename columns for consistency
 rename_map = {}
 if 'link' in df_main.columns:
@@ -71,35 +87,12 @@ if 'year' in df_main.columns:
     rename_map['year'] = 'graduation_year'
 df_main.rename(columns=rename_map, inplace=True)
 
-# Track unmatched locations
-unmatched = []
-
 # -------------------------------
-# Map finploy_id and location metadata
+# Multi-segment runs: one row per matching segment, each carrying its own
+# department/product (after location and enrichment, so those run once per candidate)
 # -------------------------------
-def map_location(loc):
-    loc_clean = str(loc).strip().lower().rstrip(string.punctuation)
-    
-    # Match city first
-    match_city = df_location[df_location['city'].str.lower().str.rstrip(string.punctuation) == loc_clean]
-    if not match_city.empty:
-        row = match_city.iloc[0]
-        return pd.Series([
-            row['id'], row['area'], row['city'], row['state'], row.get('city_wise_id', '0'), row.get('pincode', '0')
-        ])
-    
-    # Match area second
-    match_area = df_location[df_location['area'].str.lower().str.rstrip(string.punctuation) == loc_clean]
-    if not match_area.empty:
-        row = match_area.iloc[0]
-        return pd.Series([
-            row['id'], row['area'], row['city'], row['state'], row.get('city_wise_id', '0'), row.get('pincode', '0')
-        ])
-    
-    unmatched.append(loc)
-    return pd.Series(['0','0','0','0','0','0'])
-
-df_main[['finploy_id','area','city','state','city_id','candidate_pincode']] = df_main['location'].apply(map_location)
+if SEGMENTS:
+    df_main = fan_out_segments(df_main, SEGMENTS)
 
 # -------------------------------
 # Fix department and product from input file only
@@ -116,7 +109,8 @@ def fix_dept_prod(x):
         pass
     return pd.Series([dept, prod])
 
-df_main[['department', 'product']] = df_main.apply(fix_dept_prod, axis=1)
+# Once per distinct (department, product) pair
+df_main[['department', 'product']] = map_distinct_rows(df_main, ['department', 'product'], fix_dept_prod)
 
 # -------------------------------
 # Generate composit_key
@@ -128,8 +122,7 @@ df_main['city_id'] = df_main['city_id'].replace('', '0').fillna('0')
 
 # Format clean_salary so 5.0 → 5 AND 8.5 stays 8.5
 df_main['clean_salary_str'] = (
-    df_main['clean_salary']
-    .apply(lambda x: str(x).rstrip('0').rstrip('.') if '.' in str(x) else str(x))
+    map_distinct(df_main['clean_salary'], lambda x: str(x).rstrip('0').rstrip('.') if '.' in str(x) else str(x))
 )
 
 df_main['composit_key'] = (
@@ -139,6 +132,11 @@ df_main['composit_key'] = (
     df_main['clean_salary_str']
 )
 
+# Typed key parts (small-int codes, salary in hundredths, packed prefix) so the
+# matcher joins on integers instead of re-splitting composit_key
+key_cols = typed_key_columns(df_main['city_id'], df_main['department'], df_main['product'], df_main['clean_salary'])
+df_main = df_main.join(key_cols.set_axis(df_main.index))
+
 
 # -------------------------------
 # Insert candidate_id column at the beginning
@@ -152,7 +150,9 @@ final_columns = [
     'candidate_id', 'name of candidate', 'link href', 'experience', 'education 2','graduation_year','meta-data 2', 'location',
     'name_location', 'employment-detail', 'designation','company', 'clean_salary',  'Modification', 'Activity',
     'finploy_id', 'area', 'city', 'state', 'city_id', 'department', 'product', 'composit_key', 'candidate_pincode',
-]
+] + list(KEY_COLUMNS.values())
+if SEGMENT_COL in df_main.columns:
+    final_columns.append(SEGMENT_COL)  # multi-segment runs (main1/main9 SEGMENTS)
 df_final = df_main[final_columns]
 
 # -------------------------------
@@ -1,5 +1,17 @@
 import pandas as pd
+import argparse
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from finploy_core.matching import PrefixHierarchy
+from finploy_core.rules import compile_rule
+from finploy_core.geo import city_neighbours
+from finploy_core.match_store import MatchStore
+from finploy_core.candidate_pool import CandidatePool
+from finploy_core.ranking import rank_matches
+from finploy_core.segments import export_segments
+from finploy_core.diagnostics import match_stats, write_match_stats
 
 # =============================================================================
 # CONFIGURATION
@@ -8,6 +20,40 @@ JOBS_FILE = r'D:\matching_harsh\Job_matching_unscreened\final_input\MASTER FILE
 CANDIDATES_FILE = r'D:\matching_harsh\Job_matching_unscreened\output\output4.xlsx'
 OUTPUT_DIR = r'D:\matching_harsh\Job_matching_unscreened\output'
 SPLIT_DIR = os.path.join(OUTPUT_DIR, "split_candidate")  # ✅ new folder for split files
+SEGMENT_DIR = os.path.join(OUTPUT_DIR, "segments")  # multi-segment runs: one file per segment
+MATCH_STORE_FILE = os.path.join(OUTPUT_DIR, "match_state.sqlite")  # reruns reuse unchanged matches
+POOL_DIR = r'D:\matching_harsh\Job_matching_unscreened\candidate_pool'  # every day's output4, by city_id
+MATCH_WORKERS = os.cpu_count()  # processes for city_id-sharded matching (1 = in-process)
+
+# Related codes a job also accepts: job code -> candidate codes, e.g.
+# PRODUCT_HIERARCHY = {8: [9]} lets product 8 (mortgage) jobs see product 9 (home loan) candidates
+DEPARTMENT_HIERARCHY = {}
+PRODUCT_HIERARCHY = {}
+
+# Radius mode: jobs also take candidates from every city within MATCH_RADIUS_KM
+# (None = same city_id only). Coordinates CSV columns: city_id, latitude, longitude.
+CITY_COORDINATES_FILE = r'D:\matching_harsh\city_coordinates.csv'
+MATCH_RADIUS_KM = None
+
+HIERARCHY = PrefixHierarchy(
+    DEPARTMENT_HIERARCHY, PRODUCT_HIERARCHY,
+    cities=city_neighbours(CITY_COORDINATES_FILE, MATCH_RADIUS_KM) if MATCH_RADIUS_KM else None,
+)
+
+# Match rule (keys as in finploy_core.rules.RULE_DEFAULTS): job salary must
+# give a 5%–90% hike over the candidate salary (formerly 1.05×–1.90×)
+MATCH_RULE = {
+    'hike_pct': (5, 90),
+}
+SALARY_RULE = compile_rule(MATCH_RULE)
+
+# Fan-out limits on the exported matches (None = no limit, the full match list
+# as before). Set e.g. 10 jobs per candidate / 300 candidates per job to bound
+# the export; pairs are then ranked by hike closeness to the middle of the
+# hike band, job Date and candidate Activity/Modification.
+TOP_JOBS_PER_CANDIDATE = None
+TOP_CANDIDATES_PER_JOB = None
+MATCH_BUDGET = None
 
 # Column names
 JOBS_COLUMNS = {
@@ -41,184 +87,91 @@ def load_excel_data():
 
 
 # =============================================================================
-# PARSE COMPOSITE KEYS
-# =============================================================================
-def parse_composite_key(key_str):
-    if pd.isna(key_str) or '_' not in str(key_str) or str(key_str).count('_') != 3:
-        return None, None, None
-    parts = str(key_str).split('_')
-    prefix = '_'.join(parts[:3])
-    try:
-        salary = float(parts[3])
-    except:
-        salary = None
-    return prefix, salary, parts
-
-
-# =============================================================================
-# Hike Logic (10%–50%)
-# =============================================================================
-def is_salary_in_hike_range(candidate_salary, job_salary):
-    """Return True if job salary gives 10–90% hike over candidate salary."""
-    try:
-        candidate_salary = float(candidate_salary)
-        job_salary = float(job_salary)
-    except (ValueError, TypeError):
-        return False
-
-    if candidate_salary <= 0:
-        return False
-
-    min_expected = candidate_salary * 1.05   # 10% hike
-    max_expected = candidate_salary * 1.90   # 705 hike
-    return min_expected <= job_salary <= max_expected
-
-
-# =============================================================================
-# FIND MATCHES
+# EXPORT RESULTS
 # =============================================================================
-def find_matching_candidates_for_all_jobs(jobs_df, candidates_df):
-    results = {}
-    candidates_by_prefix = {}
-
-    for _, row in candidates_df.iterrows():
-        cand_key = row[CANDIDATES_COLUMNS['composite_key_col']]
-        prefix, cand_salary, _ = parse_composite_key(cand_key)
-        if prefix is None:
-            continue
-        candidates_by_prefix.setdefault(prefix, []).append({
-            'candidate_id': row[CANDIDATES_COLUMNS['candidate_id_col']],
-            'salary': cand_salary,
-            'full_row': row
-        })
-
-    for _, job_row in jobs_df.iterrows():
-        job_id = job_row[JOBS_COLUMNS['job_id_col']]
-        job_key = job_row[JOBS_COLUMNS['composite_key_col']]
-        prefix, target_salary, _ = parse_composite_key(job_key)
-        if prefix is None:
-            continue
-
-        matches = []
-        if prefix in candidates_by_prefix:
-            for cand in candidates_by_prefix[prefix]:
-                cand_salary = cand['salary']
-                if (
-                    cand_salary is not None
-                    and target_salary is not None
-                    and is_salary_in_hike_range(cand_salary, target_salary)
-                ):
-                    matches.append(cand['full_row'])
-
-        results[job_id] = {
-            'job_row': job_row,
-            'matches': pd.DataFrame(matches)
-        }
-
-    return results
+def new_composite_keys(jobs_df):
+    """company_code + '_' + composit_key for every job row."""
+    company_code = jobs_df.get(JOBS_COLUMNS['company_code'], pd.Series('NA', index=jobs_df.index))
+    return (
+        company_code.astype(str).str.strip() + '_' +
+        jobs_df[JOBS_COLUMNS['composite_key_col']].astype(str).str.strip()
+    ).to_numpy()
 
 
-# =============================================================================
-# EXPORT RESULTS
-# =============================================================================
-def export_to_single_excel(results):
+def export_to_single_excel(pairs):
     os.makedirs(OUTPUT_DIR, exist_ok=True)
-    all_matches_dfs = []
-
-    for job_id, data in results.items():
-        match_df = data['matches']
-        job_row = data['job_row']
-        if match_df.empty:
-            continue
-
-        match_df = match_df.copy()
-        match_df['job_id'] = job_id
-        match_df['Active /Inactive'] = job_row[JOBS_COLUMNS['status_col']]
-        match_df['job_date'] = job_row[JOBS_COLUMNS['date_col']]
-        match_df['job_composit_key'] = job_row[JOBS_COLUMNS['composite_key_col']]
-        match_df['job_company'] = job_row[JOBS_COLUMNS['company_col']]
-        match_df['job_designation'] = job_row[JOBS_COLUMNS['designation_col']]
-        match_df['job_location'] = job_row[JOBS_COLUMNS['location_col']]
-        match_df['job_hr_name'] = job_row[JOBS_COLUMNS['hr_name_col']]
-        match_df['company_code'] = job_row.get('company_code', 'NA')
-
-        all_matches_dfs.append(match_df)
-
-    if not all_matches_dfs:
+
+    if not len(pairs):
         print("⚠️ No matches found.")
         return 0
 
-    combined_df = pd.concat(all_matches_dfs, ignore_index=True)
-    print(f"💾 Total combined matches: {len(combined_df)}")
-
-    # ✅ Create new composite key
-    combined_df['new_composite_key'] = (
-        combined_df['company_code'].astype(str).str.strip() + '_' +
-        combined_df['job_composit_key'].astype(str).str.strip()
-    )
+    print(f"💾 Total combined matches: {len(pairs)}")
+    ranked = rank_matches(pairs, MATCH_RULE['hike_pct'], top_per_candidate=TOP_JOBS_PER_CANDIDATE,
+                          top_per_job=TOP_CANDIDATES_PER_JOB, budget=MATCH_BUDGET)
+    if len(ranked) < len(pairs):
+        print(f"🏅 Ranked matches: kept {len(ranked)} of {len(pairs)}")
+    pairs = ranked
 
-    # ✅ NEW LOGIC: Extract job_salary from job_composit_key (e.g., 518_3_3_4.2 → 4.2)
-    def extract_job_salary(key):
-        if pd.isna(key):
-            return None
-        parts = str(key).split('_')
-        try:
-            return float(parts[-1])
-        except:
-            return parts[-1] if len(parts) > 0 else None
+    # ✅ Create new composite key (one per job; gathered per row on export)
+    new_keys = new_composite_keys(pairs.jobs_df)
 
-    combined_df['job_salary'] = combined_df['job_composit_key'].apply(extract_job_salary)
+    # ✅ job_salary comes from job_composit_key (e.g., 518_3_3_4.2 → 4.2), parsed once by the matcher
+    export_cols = {'job_salary_col': 'job_salary', 'job_extras': {'new_composite_key': new_keys}}
 
     # =======================================================
     # 1️⃣ Save Full Job Match File
     # =======================================================
     file_all = os.path.join(OUTPUT_DIR, 'All_job_match.xlsx')
-    combined_df.to_excel(file_all, index=False)
+    pairs.to_excel(file_all, **export_cols)
     print(f"✅ Saved full match file: {file_all}")
+    export_segments(pairs, SEGMENT_DIR, 'All_job_match.xlsx', **export_cols)
 
     # =======================================================
     # 2️⃣ Unique File (remove duplicates by name_location)
     # =======================================================
-    if 'name_location' in combined_df.columns:
-        unique_df = combined_df.drop_duplicates(subset=['name_location'], keep='first')
+    if 'name_location' in pairs.candidates_df.columns:
+        unique_pairs = pairs.take(~pd.Series(pairs.candidate_column('name_location')).duplicated().to_numpy())
         file_unique = os.path.join(OUTPUT_DIR, 'All_job_match_unique.xlsx')
-        unique_df.to_excel(file_unique, index=False)
+        unique_pairs.to_excel(file_unique, **export_cols)
         print(f"✅ Saved unique file (by name_location): {file_unique}")
     else:
         print("⚠️ 'name_location' column missing; skipping unique file.")
-        unique_df = combined_df
+        unique_pairs = pairs
 
     # =======================================================
     # ✅ NEW SECTION — Split the UNIQUE candidates into chunks of 30
     # =======================================================
     os.makedirs(SPLIT_DIR, exist_ok=True)
     chunk_size = 30
-    total_rows = len(unique_df)
+    total_rows = len(unique_pairs)
     num_chunks = (total_rows // chunk_size) + (1 if total_rows % chunk_size != 0 else 0)
 
     for i in range(num_chunks):
         start_idx = i * chunk_size
         end_idx = start_idx + chunk_size
-        chunk_df = unique_df.iloc[start_idx:end_idx]
         chunk_file = os.path.join(SPLIT_DIR, f"unique_candidates_{i+1}.xlsx")
-        chunk_df.to_excel(chunk_file, index=False)
+        unique_pairs.take(slice(start_idx, end_idx)).to_excel(chunk_file, **export_cols)
         print(f"📄 Saved split file {i+1}/{num_chunks}: {chunk_file}")
 
     # =======================================================
     # 3️⃣ Strict Dedup (remove duplicates by new_composite_key per candidate)
     # =======================================================
-    before = len(combined_df)
-    dedup_df = combined_df.drop_duplicates(subset=['candidate_id', 'new_composite_key'], keep='first')
-    after = len(dedup_df)
+    before = len(pairs)
+    dedup_keys = pd.DataFrame({
+        'candidate_id': pairs.candidate_column(CANDIDATES_COLUMNS['candidate_id_col']),
+        'new_composite_key': new_keys[pairs.job_pos],
+    })
+    dedup_pairs = pairs.take(~dedup_keys.duplicated().to_numpy())
+    after = len(dedup_pairs)
     print(f"🧹 Strict dedup removed {before - after} duplicates (based on new_composite_key).")
 
     file_sumit = os.path.join(OUTPUT_DIR, 'All_job_match_sumit.xlsx')
-    dedup_df.to_excel(file_sumit, index=False)
+    dedup_pairs.to_excel(file_sumit, **export_cols)
     print(f"✅ Saved strict deduplicated file: {file_sumit}")
 
     print("\n📊 Summary:")
     print(f"   ➤ Total: {before}")
-    print(f"   ➤ Unique (name_location): {len(unique_df)}")
+    print(f"   ➤ Unique (name_location): {len(unique_pairs)}")
     print(f"   ➤ Sumit Strict Dedup: {after}")
     print(f"   ➤ Split files created: {num_chunks} (each 30 candidates)")
 
@@ -237,13 +190,56 @@ def main():
         return
 
     print("\n🔍 Matching candidates to jobs...")
-    results = find_matching_candidates_for_all_jobs(jobs_df, candidates_df)
+    pairs = MatchStore(MATCH_STORE_FILE).match_pairs(jobs_df, candidates_df, SALARY_RULE, JOBS_COLUMNS,
+                                                     CANDIDATES_COLUMNS, workers=MATCH_WORKERS, hierarchy=HIERARCHY)
+    # Counters on why jobs did/didn't match, from the unranked pairs
+    write_match_stats(match_stats(pairs, SALARY_RULE, CANDIDATES_COLUMNS, HIERARCHY), OUTPUT_DIR)
 
     print("\n💾 Exporting results...")
-    export_to_single_excel(results)
+    export_to_single_excel(pairs)
+
+    added = CandidatePool(POOL_DIR, candidates_columns=CANDIDATES_COLUMNS).append(candidates_df)
+    print(f"🗃️ Added {added} candidates to the historical pool: {POOL_DIR}")
 
     print("\n🎯 Process completed successfully.")
 
 
+# =============================================================================
+# JOB DELTA (new/changed jobs vs. historical candidate pool)
+# =============================================================================
+def run_job_delta():
+    print("🚀 Finploy Job-Delta Matcher - new/changed jobs vs. candidate pool")
+    print("=" * 80)
+
+    jobs_df = pd.read_excel(JOBS_FILE)
+    pool = CandidatePool(POOL_DIR, candidates_columns=CANDIDATES_COLUMNS)
+    new_pairs, dropped, stored = pool.match_job_delta(jobs_df, SALARY_RULE, job_salary_col='job_salary',
+                                                      jobs_columns=JOBS_COLUMNS, workers=MATCH_WORKERS,
+                                                      hierarchy=HIERARCHY)
+    print(f"🗑️ Dropped stored matches for {len(dropped)} changed/inactive jobs")
+
+    if not len(new_pairs):
+        print("⚠️ No new pool matches.")
+        return
+    ranked = rank_matches(new_pairs, MATCH_RULE['hike_pct'], top_per_candidate=TOP_JOBS_PER_CANDIDATE,
+                          top_per_job=TOP_CANDIDATES_PER_JOB, budget=MATCH_BUDGET)
+    if len(ranked) < len(new_pairs):
+        print(f"🏅 Ranked pool matches: kept {len(ranked)} of {len(new_pairs)}")
+    new_pairs = ranked
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    file_delta = os.path.join(OUTPUT_DIR, 'All_job_match_pool_delta.xlsx')
+    new_pairs.to_excel(file_delta, job_salary_col='job_salary')
+    print(f"✅ Saved {len(new_pairs)} new pool matches: {file_delta}")
+    print(f"   ➤ Pool matches held for {stored['job_id'].nunique()} active jobs")
+
+
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--job-delta', action='store_true',
+                        help='Only match new/changed jobs against the historical candidate pool')
+    args, _ = parser.parse_known_args()
+    if args.job_delta:
+        run_job_delta()
+    else:
+        main()
@@ -1,4 +1,5 @@
 import os
+import sys
 import time
 import pandas as pd
 import gspread
@@ -8,6 +9,10 @@ import tkinter as tk
 from tkinter import scrolledtext
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from finploy_core.sheet_writes import WritePlanner
+from finploy_core.tracker import TrackerIndex, normalize_contact
+
 # ======================================================
 # CONFIGURATION
 # ======================================================
@@ -125,26 +130,20 @@ ws_lineup = open_ws(gc, GS_WORKBOOK_NAME, TAB_LINEUP)
 # SCREENING PROCESSING
 # ======================================================
 screen_values = ws_screening.get_all_values()
-headers = screen_values[0]
-col_idx = {c: i + 1 for i, c in enumerate(headers)}
-screen_df = pd.DataFrame(screen_values[1:], columns=headers)
+screen_tracker = TrackerIndex(screen_values)
+headers = screen_tracker.headers
+col_idx = screen_tracker.columns
 
-batch_updates, new_rows = [], []
+screen_writes, new_rows = WritePlanner(), []
 updated_rows, appended_rows = [], []
 
-# ⭐ GET EXISTING CANDIDATE IDS FOR SCREENING
-existing_screen_ids = pd.to_numeric(
-    screen_df.get("candidate_id", pd.Series([])),
-    errors="coerce"
-).dropna()
-
-SCREENING_NEXT_ID = int(existing_screen_ids.max() or 0) + 1
-
 unique_candidates = merged_df.drop_duplicates('clean_phone', keep='last')
 
-for _, row in unique_candidates.iterrows():
-    
-    phone = str(row.get('clean_phone', '')).strip()
+# ⭐ Update-vs-append for every candidate in one lookup against the tracker index
+phones = normalize_contact(unique_candidates['clean_phone'])
+tracker_rows = screen_tracker.match(phones)
+
+for (_, row), phone, rownum in zip(unique_candidates.iterrows(), phones, tracker_rows):
     if not phone:
         continue
 
@@ -169,13 +168,9 @@ for _, row in unique_candidates.iterrows():
     Education = str(row.get('education 2', '') or '').strip()
     Graduation_year = str(row.get('graduation_year', '') or '').strip()
 
-    matches = screen_df.index[screen_df['Contact'].astype(str).str.strip() == phone].tolist()
-
     # ⭐ Existing number → keep SAME candidate_id
-    if matches:
-        idx = matches[-1]
-        rownum = idx + 2
-        current_id = screen_df.loc[idx, "candidate_id"]
+    if rownum:
+        current_id = screen_tracker.cell(rownum, "candidate_id")
 
         # UPDATE all fields normally, do NOT change candidate_id
         to_update = [
@@ -200,15 +195,13 @@ for _, row in unique_candidates.iterrows():
 
         for h, v in to_update:
             if h in col_idx and v != "":
-                a1 = gspread.utils.rowcol_to_a1(rownum, col_idx[h])
-                batch_updates.append({'range': a1, 'values': [[v]]})
+                screen_writes.set(rownum, col_idx[h], v)
 
         updated_rows.append(f"UPDATED | {phone} | ID={current_id}")
         continue
 
     # ⭐ Phone NOT FOUND → assign NEW candidate_id
-    new_id = SCREENING_NEXT_ID
-    SCREENING_NEXT_ID += 1
+    new_id = screen_tracker.next_candidate_id()
 
     new_row = ['' for _ in headers]
 
@@ -240,11 +233,11 @@ for _, row in unique_candidates.iterrows():
     put('Computer_Time', entry_time_str)
 
     new_rows.append(new_row)
+    screen_tracker.append(new_row)
     appended_rows.append(f"NEW | {phone} | ID={new_id}")
 
-# PUSH SCREENING UPDATES
-for i in range(0, len(batch_updates), 40):
-    safe_api_call(ws_screening.batch_update, batch_updates[i:i + 40])
+# PUSH SCREENING UPDATES (adjacent cells coalesced into ranges)
+screen_writes.send(ws_screening, call=safe_api_call)
 
 if new_rows:
     safe_api_call(ws_screening.append_rows, new_rows, value_input_option='USER_ENTERED')
@@ -253,18 +246,9 @@ if new_rows:
 # LINEUP PROCESSING  (ALWAYS NEW candidate_id)
 # ======================================================
 line_values = ws_lineup.get_all_values()
-line_headers = line_values[0]
-line_idx = {c: i + 1 for i, c in enumerate(line_headers)}
-
-# ⭐ Read existing candidate_ids from LINEUP
-line_df_existing = pd.DataFrame(line_values[1:], columns=line_headers)
-existing_line_ids = pd.to_numeric(line_df_existing.get("candidate_id", pd.Series([])),
-                                  errors="coerce").dropna()
-
-max_id = existing_line_ids.max()
-if pd.isna(max_id):
-    max_id = 0
-LINEUP_NEXT_ID = int(max_id) + 1
+line_tracker = TrackerIndex(line_values)
+line_headers = line_tracker.headers
+line_idx = line_tracker.columns
 
 line_new_rows, lineup_logs = [], []
 
@@ -289,8 +273,8 @@ for _, r in lineup_merge.iterrows():
             new_row[line_idx[h] - 1] = v
 
     # ⭐ Assign new candidate_id ALWAYS
-    put("candidate_id", str(LINEUP_NEXT_ID))
-    LINEUP_NEXT_ID += 1
+    line_id = line_tracker.next_candidate_id()
+    put("candidate_id", str(line_id))
 
     # Paste rest
     l_date_str, l_time_str = extract_date_time(r.get('entry_date'))
@@ -322,7 +306,8 @@ for _, r in lineup_merge.iterrows():
     put('Education', str(r.get('education 2', '')))
 
     line_new_rows.append(new_row)
-    lineup_logs.append(f"{r.get('clean_phone', '')} | ID={LINEUP_NEXT_ID-1}")
+    line_tracker.append(new_row)
+    lineup_logs.append(f"{r.get('clean_phone', '')} | ID={line_id}")
 
 if line_new_rows:
     safe_api_call(ws_lineup.append_rows, line_new_rows, value_input_option='USER_ENTERED')
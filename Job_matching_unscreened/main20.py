@@ -1,10 +1,14 @@
 import os
+import sys
 import pandas as pd
 from datetime import datetime
 from docx import Document
 from docx.shared import Pt, Cm
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from finploy_core.unmatched_store import STORE_FILENAME, UnmatchedLocationStore
+
 # =====================================================
 # CONFIGURATION
 # =====================================================
@@ -20,7 +24,7 @@ ALL_JOB_MATCH_UNIQUE = os.path.join(FINAL_OUTPUT, "all_job_matches_phone_unique.
 
 # output
 OUTPUT_DIR = os.path.join(BASE_DIR, "output")
-ADDITIONAL_NEW_LOCATION = os.path.join(OUTPUT_DIR, "additional_new_location.xlsx")
+UNMATCHED_LOCATIONS = os.path.join(OUTPUT_DIR, STORE_FILENAME)
 SCREENED = os.path.join(OUTPUT_DIR, "screened_candidates.xlsx")
 UNSCREENED = os.path.join(OUTPUT_DIR, "removed_designations.xlsx")
 OUTPUT5 = os.path.join(OUTPUT_DIR, "output5.xlsx")
@@ -43,7 +47,6 @@ def read_file(path):
 
 df_input1 = read_file(INPUT1)
 df_resdex = read_file(RESDEX_FILE)
-df_additional = read_file(ADDITIONAL_NEW_LOCATION)
 df_screened = read_file(SCREENED)
 df_unscreened = read_file(UNSCREENED)
 df_job_match = read_file(ALL_JOB_MATCH_UNIQUE)
@@ -56,7 +59,7 @@ df_output6 = read_file(OUTPUT6)
 total_candidates = len(df_input1) - 1 if len(df_input1) > 0 else 0
 screened_count = len(df_screened)
 unscreened_count = len(df_unscreened)
-new_locations = len(df_additional)
+new_locations = len(UnmatchedLocationStore(UNMATCHED_LOCATIONS)) if os.path.exists(UNMATCHED_LOCATIONS) else 0
 job_assigned = len(df_job_match)
 profiles_opened = len(df_resdex)
 unique_resume_numbers = len(df_output5)
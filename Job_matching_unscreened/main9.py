@@ -1,9 +1,15 @@
 import pandas as pd
+import json
 import os
+import sys
 import customtkinter as ctk
 from tkinter import messagebox
 import subprocess
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from finploy_core.enrich import map_distinct
+from finploy_core.segments import segment_name
+
 # -------------------------------
 # Phase 2.2 – Data Cleaning & Activity Tracking Script (Updated)
 # -------------------------------
@@ -13,6 +19,16 @@ input_file = r"D:\matching_harsh\Job_matching_unscreened\output\output1.xlsx"
 OUTPUT_DIR = r"D:\matching_harsh\Job_matching_unscreened\output"
 output_file = os.path.join(OUTPUT_DIR, "output2.xlsx")
 
+# Multi-segment mode: one run covers every (designation filter, department, product)
+# segment listed here instead of asking for a single department/product. The filter is a
+# case-insensitive regex on 'designation' (None = every row); a row is kept once per
+# segment it matches and tagged with a 'segment' column. [] = ask in the dialog.
+# The list is handed to the final stage, which fans rows out after enrichment.
+SEGMENTS = [
+    # ('home loan|housing|lap|mortgage', 3, 3),
+    # ('gold loan', 3, 5),
+]
+
 # Load the Excel file
 df = pd.read_excel(input_file)
 
@@ -42,14 +58,14 @@ def safe_float(s):
     except:
         return 0.0
 
-salary_series = salary_series.apply(safe_float)
+salary_series = map_distinct(salary_series, safe_float)  # once per distinct salary text
 
 def convert_to_lacs(value):
     if value > 1000:
         return round(value / 100000, 2)
     return round(value, 2)
 
-clean_salary = salary_series.apply(convert_to_lacs)
+clean_salary = map_distinct(salary_series, convert_to_lacs)
 
 if 'clean_salary' in df.columns:
     df['clean_salary'] = clean_salary
@@ -158,17 +174,24 @@ class InputApp(ctk.CTk):
         global DEPT_VALUE, PROD_VALUE
         DEPT_VALUE, PROD_VALUE = dept, prod
 
-app = InputApp()
-app.mainloop()
+if SEGMENTS:
+    # department/product are filled per segment by the final stage's fan-out
+    df['department'] = ''
+    df['product'] = ''
+    SUMMARY = f"Segments: {', '.join(dict.fromkeys(segment_name(d, p) for _, d, p in SEGMENTS))}"
+else:
+    app = InputApp()
+    app.mainloop()
 
-# -------------------------------
-# Apply Input to DF
-# -------------------------------
-df['department'] = DEPT_VALUE
-df['product'] = PROD_VALUE
+    # -------------------------------
+    # Apply Input to DF
+    # -------------------------------
+    df['department'] = DEPT_VALUE
+    df['product'] = PROD_VALUE
+    SUMMARY = f"Department: {DEPT_VALUE}\nProduct: {PROD_VALUE}"
 
-print(f"✅ Department set as: {DEPT_VALUE}")
-print(f"✅ Product set as: {PROD_VALUE}")
+    print(f"✅ Department set as: {DEPT_VALUE}")
+    print(f"✅ Product set as: {PROD_VALUE}")
 
 # -------------------------------
 # Task 7 – Reorder columns
@@ -188,9 +211,10 @@ df = df[final_order]
 # Save Output
 # -------------------------------
 df.to_excel(output_file, index=False)
+SEGMENT_ARGS = ["--segments", json.dumps(SEGMENTS)] if SEGMENTS else []
 messagebox.showinfo(
     "Success",
-    f"File saved successfully!\n\nDepartment: {DEPT_VALUE}\nProduct: {PROD_VALUE}\n\nSaved as:\n{output_file}"
+    f"File saved successfully!\n\n{SUMMARY}\n\nSaved as:\n{output_file}"
 )
 print(f"✅ File saved successfully at: {output_file}")
 
@@ -200,10 +224,10 @@ print(f"✅ File saved successfully at: {output_file}")
 
 print("\n🚀 Launching background processes...\n")
 
-# 1️⃣ UNSCREENED → main10.py
-unscreened_script = r"D:\matching_harsh\Job_matching_unscreened\main10.py"
-p1 = subprocess.Popen(["python", unscreened_script])
-print("▶️ Started main10.py (unscreened)")
+# 1️⃣ UNSCREENED → main12.py
+unscreened_script = r"D:\matching_harsh\Job_matching_unscreened\main12.py"
+p1 = subprocess.Popen(["python", unscreened_script] + SEGMENT_ARGS)
+print("▶️ Started main12.py (unscreened)")
 
 # 2️⃣ SCREENED → main.py
 screened_script = r"D:\matching_harsh\Job_matching_Screened\main.py"
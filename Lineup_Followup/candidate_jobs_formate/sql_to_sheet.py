@@ -22,6 +22,8 @@ Rules:
      - Do NOT change candidate_id, Date, etc.
 """
 
+import os
+import sys
 import gspread
 import pandas as pd
 import mysql.connector
@@ -30,6 +32,9 @@ from datetime import datetime
 import gspread.utils
 import re
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from finploy_core.sheet_writes import WritePlanner
+
 def normalize_phone(s):
     if not s:
         return ""
@@ -413,7 +418,7 @@ class FinployLineupSync:
         next_candidate_id = idx["next_candidate_id"]
 
         append_buffer = []
-        update_requests = []
+        update_writes = WritePlanner()
         update_count = 0
         append_count = 0
 
@@ -467,25 +472,18 @@ class FinployLineupSync:
                         should_update = True
 
                     if should_update:
-                        sub_updates = []
-
                         if sql_click_date:
-                            a1_digit_date = gspread.utils.rowcol_to_a1(r, idx_digit_instd_date + 1)
-                            sub_updates.append({"range": a1_digit_date, "values": [[sql_click_date]]})
+                            update_writes.set(r, idx_digit_instd_date + 1, sql_click_date)
 
                         if idx_digit_instd_time is not None and sql_click_time:
-                            a1_digit_time = gspread.utils.rowcol_to_a1(r, idx_digit_instd_time + 1)
-                            sub_updates.append({"range": a1_digit_time, "values": [[sql_click_time]]})
+                            update_writes.set(r, idx_digit_instd_time + 1, sql_click_time)
 
                         if idx_digital_instd is not None:
-                            a1_digital = gspread.utils.rowcol_to_a1(r, idx_digital_instd + 1)
-                            sub_updates.append({"range": a1_digital, "values": [["yes"]]})
+                            update_writes.set(r, idx_digital_instd + 1, "yes")
 
                         if idx_manual_computer is not None:
-                            a1_manual = gspread.utils.rowcol_to_a1(r, idx_manual_computer + 1)
-                            sub_updates.append({"range": a1_manual, "values": [["digital"]]})
+                            update_writes.set(r, idx_manual_computer + 1, "digital")
 
-                        update_requests.extend(sub_updates)
                         update_count += 1
 
                         print(f"✅ UPDATE: phone={phone_norm} row={r} | old={existing_date_str} → {sql_click_date}")
@@ -504,11 +502,11 @@ class FinployLineupSync:
             self.ws.append_rows(append_buffer, value_input_option="USER_ENTERED")
             print(f"✅ Appended {append_count} new row(s).")
 
-        if update_requests:
-            self.ws.batch_update(update_requests)
+        if update_writes:
+            update_writes.send(self.ws)
             print(f"🛠️ Updated {update_count} existing row(s).")
 
-        if not append_buffer and not update_requests:
+        if not append_buffer and not update_writes:
             print("ℹ️ No changes made (no new phones, no matching phones).")
 
         print(f"\n📊 SUMMARY → checked={len(df_sql)} | appended={append_count} | updated={update_count}")
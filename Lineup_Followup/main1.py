@@ -12,6 +12,9 @@ from PyQt6.QtCore import Qt
 from openpyxl import load_workbook
 from openpyxl.styles import PatternFill
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from finploy_core.enrich import map_distinct
+
 # =====================================================
 # CONFIGURATION
 # =====================================================
@@ -89,7 +92,7 @@ def parse_date(val):
     except:
         return None
 
-df["parsed_date"] = df[date_col].apply(parse_date)
+df["parsed_date"] = map_distinct(df[date_col], parse_date)  # once per distinct date
 filtered_df = df[df["parsed_date"].notna() & (df["parsed_date"] >= cutoff)].copy()
 
 if filtered_df.empty:
@@ -1,4 +1,5 @@
 import os
+import sys
 import time
 import pandas as pd
 import gspread
@@ -8,6 +9,10 @@ import tkinter as tk
 from tkinter import scrolledtext
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from finploy_core.sheet_writes import WritePlanner
+from finploy_core.tracker import TrackerIndex
+
 # ======================================================
 # CONFIG
 # ======================================================
@@ -18,9 +23,6 @@ GS_WORKBOOK_NAME = 'Tracker -Candidates'
 TAB_SCREENING = 'SCREENING'
 TAB_LINEUP = 'Lineup'
 
-SCREENING_LAST_COL = "AT"
-LINEUP_LAST_COL    = "BK"
-
 SERVICE_JSON = r'D:\matching_harsh\Lineup_Followup\screeningfollowup-4a463d7d64cb.json'
 
 
@@ -140,7 +142,8 @@ ws_scr = open_ws(gc, GS_WORKBOOK_NAME, TAB_SCREENING)
 ws_lin = open_ws(gc, GS_WORKBOOK_NAME, TAB_LINEUP)
 
 scr_values = ws_scr.get_all_values()
-scr_header = scr_values[0]
+scr_tracker = TrackerIndex(scr_values)
+scr_header = scr_tracker.headers
 
 lin_values = ws_lin.get_all_values()
 lin_header = lin_values[0]
@@ -150,31 +153,26 @@ lin_header = lin_values[0]
 # SCREENING WITH 30-DAY LOGIC
 # ======================================================
 screen_updates = []
+screen_writes = WritePlanner()
 screen_appends = []
 
-existing_df = pd.DataFrame(scr_values[1:], columns=scr_header)
-
 unique = merged_df.drop_duplicates("clean_phone", keep="last")
 
-for _, r in unique.iterrows():
-    phone = clean_val(r.get("contact"))
+# Update-vs-append for every candidate in one lookup against the tracker index
+phones = unique["contact"].map(clean_val) if "contact" in unique.columns else pd.Series("", index=unique.index)
+tracker_rows = scr_tracker.match(phones)
+
+for (_, r), phone, rownum in zip(unique.iterrows(), phones, tracker_rows):
     if phone == "":
         continue
 
-    matched = existing_df.index[
-        existing_df["Contact"].astype(str).str.strip() == phone
-    ].tolist()
-
     date_str, time_str = extract_date_time(r.get("entry_date"))
 
     do_update = False
     do_append = False
 
-    if matched:
-        latest_idx = matched[-1]
-        last_row_df = existing_df.iloc[latest_idx]
-
-        last_date_sheet = clean_val(last_row_df.get("Date"))
+    if rownum:
+        last_date_sheet = clean_val(scr_tracker.cell(rownum, "Date"))
 
         try:
             last_dt = datetime.strptime(last_date_sheet, "%d-%m-%Y")
@@ -195,12 +193,11 @@ for _, r in unique.iterrows():
     # PERFORM UPDATE
     # ---------------------------------------------------
     if do_update:
-        rownum = matched[-1] + 2
-        original_row = scr_values[rownum - 2].copy()
+        original_row = scr_tracker.row(rownum)
 
         def put(col, val):
-            if col in scr_header:
-                original_row[scr_header.index(col)] = clean_val(val)
+            if col in scr_tracker.columns:
+                original_row[scr_tracker.columns[col] - 1] = clean_val(val)
 
         put("Date", date_str)
         put("Rec", map_rec_screening(r.get("user")))
@@ -223,8 +220,9 @@ for _, r in unique.iterrows():
         put("Graduation_year", r.get("graduation_year"))
         put("Computer_Time", time_str)
 
-        rng = f"A{rownum}:{SCREENING_LAST_COL}{rownum}"
-        screen_updates.append({"range": rng, "values": [original_row]})
+        # Only the cells that differ from the fetched row are sent; unchanged rows cost nothing
+        if screen_writes.set_row_changes(rownum, original_row, scr_tracker.row(rownum)):
+            screen_updates.append(rownum)
 
     # ---------------------------------------------------
     # PERFORM APPEND
@@ -232,17 +230,14 @@ for _, r in unique.iterrows():
     if do_append:
         new_row = ["" for _ in scr_header]
 
-        next_id = int(pd.to_numeric(
-            existing_df.get('candidate_id', pd.Series([])),
-            errors='coerce'
-        ).max() or 0) + 1
+        next_id = scr_tracker.next_candidate_id()
 
-        if "candidate_id" in scr_header:
-            new_row[scr_header.index("candidate_id")] = str(next_id)
+        if "candidate_id" in scr_tracker.columns:
+            new_row[scr_tracker.columns["candidate_id"] - 1] = str(next_id)
 
         def put(col, val):
-            if col in scr_header:
-                new_row[scr_header.index(col)] = clean_val(val)
+            if col in scr_tracker.columns:
+                new_row[scr_tracker.columns[col] - 1] = clean_val(val)
 
         put("Date", date_str)
         put("Rec", map_rec_screening(r.get("user")))
@@ -266,14 +261,15 @@ for _, r in unique.iterrows():
         put("Computer_Time", time_str)
 
         screen_appends.append(new_row)
+        scr_tracker.append(new_row)
 
 
 
 # ======================================================
 # APPLY SCREENING UPDATES
 # ======================================================
-if screen_updates:
-    ws_scr.batch_update(screen_updates)
+if screen_writes:
+    screen_writes.send(ws_scr)
 
 if screen_appends:
     ws_scr.append_rows(screen_appends, value_input_option="USER_ENTERED")
@@ -1,8 +1,12 @@
 import pandas as pd
 import os
+import sys
 import customtkinter as ctk
 from tkinter import messagebox
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from finploy_core.enrich import map_distinct
+
 # =====================================================
 # Phase 2.2 – Data Cleaning (Final No Tasks 5–7)
 # =====================================================
@@ -79,8 +83,9 @@ def convert_to_lacs(v):
     return round(v, 2)
 
 
-salary_numeric = salary_series.apply(safe_float)
-df["clean_salary"] = salary_numeric.apply(convert_to_lacs)
+# Parsed once per distinct salary text and broadcast back to the rows
+salary_numeric = map_distinct(salary_series, safe_float)
+df["clean_salary"] = map_distinct(salary_numeric, convert_to_lacs)
 
 # =====================================================
 # 🟩 GUI – Department & Product Input
@@ -161,8 +166,8 @@ messagebox.showinfo(
 print(f"✅ File saved successfully at: {output_file}")
 try:
     import subprocess
-    print("▶️ Running main4.py ...")
-    subprocess.run(["python", r"D:\matching_harsh\Lineup_Followup\main4.py"], check=True)
-    print("✅ main4.py executed successfully!")
+    print("▶️ Running main5.py ...")
+    subprocess.run(["python", r"D:\matching_harsh\Lineup_Followup\main5.py"], check=True)
+    print("✅ main5.py executed successfully!")
 except Exception as e:
-    print(f"❌ Failed to run main4.py: {e}")
\ No newline at end of file
+    print(f"❌ Failed to run main5.py: {e}")
\ No newline at end of file
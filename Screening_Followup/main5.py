@@ -6,7 +6,19 @@ import pandas as pd
 import gspread
 from google.oauth2.service_account import Credentials
 import os
-import string
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from finploy_core.enrich import map_distinct, map_distinct_rows
+from finploy_core.fuzzy_locations import FuzzyLocationFallback
+from finploy_core.matching import KEY_COLUMNS, typed_key_columns
+from finploy_core.pincodes import PincodeIndex
+from finploy_core.location_master import load_location_values, location_frame
+from finploy_core.locations import (
+    LOCATION_COLUMNS, LocationResolver, blank_locations, normalize_location, normalize_master_name,
+    unmatched_location_rows,
+)
+from finploy_core.unmatched_store import STORE_FILENAME, UnmatchedLocationStore
 
 # ============================================================
 # CONFIGURATION
@@ -14,8 +26,10 @@ import string
 OUTPUT_DIR = r"D:\matching_harsh\Screening_Followup\output"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-input_file = os.path.join(OUTPUT_DIR, "output3.xlsx")
+input_file = os.path.join(OUTPUT_DIR, "output2.xlsx")
 output_file = os.path.join(OUTPUT_DIR, "output4.xlsx")
+# Unmatched locations, one row each (team workbook: python -m finploy_core.unmatched_store <store>)
+unmatched_store_file = os.path.join(OUTPUT_DIR, STORE_FILENAME)
 
 SERVICE_ACCOUNT_FILE = (
     r"D:\matching_harsh\Screening_Followup\screeningfollowup-4a463d7d64cb.json"
@@ -32,42 +46,38 @@ client = gspread.authorize(creds)
 # ============================================================
 # LOAD GOOGLE SHEET (Finploy Location Master)
 # ============================================================
-sheet_id = "11Yye2zMLOgb0J8wBjH0VJNuOV28AAERNPxr3RE2OO-E"
-sheet = client.open_by_key(sheet_id).sheet1
-
-headers = sheet.row_values(1)
-seen = {}
-unique_headers = []
-for h in headers:
-    h_clean = h.strip()
-    if h_clean in seen:
-        seen[h_clean] += 1
-        h_clean = f"{h_clean}_{seen[h_clean]}"
-    else:
-        seen[h_clean] = 0
-    unique_headers.append(h_clean)
-
-data_rows = sheet.get_all_values()[1:]  # skip header row
-df_location = pd.DataFrame(data_rows, columns=unique_headers)
+# (cached locally, re-downloaded only when the sheet's Drive revision changes)
+df_location = location_frame(load_location_values(client))
 print(f"✅ Loaded location master ({len(df_location)} rows)")
 
-# ============================================================
-# ENSURE REQUIRED COLUMNS EXIST
-# ============================================================
-required_cols = ["area", "city", "state", "city_wise_id", "pincode", "id"]
-for col in required_cols:
-    if col not in df_location.columns:
-        df_location[col] = "0"
-
-for col in ["area", "city", "id", "city_wise_id", "pincode"]:
-    df_location[col] = df_location[col].astype(str).str.strip().str.rstrip(string.punctuation)
-
 # ============================================================
 # LOAD MAIN DATASET
 # ============================================================
 df_main = pd.read_excel(input_file)
 print(f"✅ Loaded main dataset ({len(df_main)} rows)")
 
+# ============================================================
+# MAP LOCATION
+# ============================================================
+# City first, then area; each name resolves to the first master row carrying it.
+# Names neither knows fall back to a pincode written in the text (or the nearest one
+# in its district), then to a trigram-similarity guess remembered in location_aliases.json
+pincode_index = PincodeIndex(df_location)
+resolver = LocationResolver(df_location, ("city", "area"), normalize_location, master_normalize=normalize_master_name,
+                            fallback=[pincode_index, FuzzyLocationFallback()])
+positions = resolver.positions(df_main["location"])
+positions[blank_locations(df_main["location"])] = -1
+if "pincode" in df_main.columns:  # scrapes that carry the candidate's pincode (covers blank locations)
+    positions = pincode_index.fill(positions, df_main["pincode"])
+
+# Unmatched locations are upserted with a sample candidate and its full input row
+UnmatchedLocationStore(unmatched_store_file).record(unmatched_location_rows(df_main, positions))
+
+df_main[["finploy_id", "area", "city", "state", "city_id", "candidate_pincode"]] = (
+    resolver.take(positions, LOCATION_COLUMNS, fill="0").to_numpy()
+)
+print(f"✅ Location mapping complete. Unmatched locations: {int((positions < 0).sum())}")
+
 # ============================================================
 # RENAME LEGACY COLUMNS
 # ============================================================
@@ -78,33 +88,6 @@ if "meta-data" in df_main.columns:
     rename_map["meta-data"] = "experience"
 df_main.rename(columns=rename_map, inplace=True)
 
-# ============================================================
-# MAP LOCATION
-# ============================================================
-unmatched = []
-
-def map_location(loc):
-    loc_clean = str(loc).strip().lower().rstrip(string.punctuation)
-    if not loc_clean:
-        unmatched.append("blank")
-        return pd.Series(["0", "0", "0", "0", "0", "0"])
-
-    match_city = df_location[df_location["city"].str.lower().str.rstrip(string.punctuation) == loc_clean]
-    if not match_city.empty:
-        row = match_city.iloc[0]
-        return pd.Series([row["id"], row["area"], row["city"], row["state"], row.get("city_wise_id", "0"), row.get("pincode", "0")])
-
-    match_area = df_location[df_location["area"].str.lower().str.rstrip(string.punctuation) == loc_clean]
-    if not match_area.empty:
-        row = match_area.iloc[0]
-        return pd.Series([row["id"], row["area"], row["city"], row["state"], row.get("city_wise_id", "0"), row.get("pincode", "0")])
-
-    unmatched.append(loc)
-    return pd.Series(["0", "0", "0", "0", "0", "0"])
-
-df_main[["finploy_id", "area", "city", "state", "city_id", "candidate_pincode"]] = df_main["location"].apply(map_location)
-print(f"✅ Location mapping complete. Unmatched locations: {len(unmatched)}")
-
 # ============================================================
 # FIX DEPARTMENT & PRODUCT
 # ============================================================
@@ -130,7 +113,8 @@ def fix_dept_prod(x):
 
     return pd.Series([dept, prod])
 
-df_main[["department", "product"]] = df_main.apply(fix_dept_prod, axis=1)
+# Once per distinct (department, product) pair
+df_main[["department", "product"]] = map_distinct_rows(df_main, ["department", "product"], fix_dept_prod)
 
 # ============================================================
 # GENERATE COMPOSIT KEY
@@ -146,6 +130,11 @@ df_main["composit_key"] = (
     + df_main["clean_salary"].astype(str)
 )
 
+# Typed key parts (small-int codes, salary in hundredths, packed prefix) so the
+# matcher joins on integers instead of re-splitting composit_key
+key_cols = typed_key_columns(df_main["city_id"], df_main["department"], df_main["product"], df_main["clean_salary"])
+df_main = df_main.join(key_cols.set_axis(df_main.index))
+
 # ============================================================
 # ADD CANDIDATE ID
 # ============================================================
@@ -209,6 +198,7 @@ priority_cols = [
     "product",
     "composit_key",
     "candidate_pincode",
+    *KEY_COLUMNS.values(),
 ]
 
 # Only keep valid ones
@@ -1,4 +1,5 @@
 import os
+import sys
 import time
 import pandas as pd
 import gspread
@@ -8,6 +9,10 @@ import tkinter as tk
 from tkinter import scrolledtext
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from finploy_core.sheet_writes import WritePlanner
+from finploy_core.tracker import TrackerIndex, normalize_contact
+
 # ======================================================
 # CONFIGURATION
 # ======================================================
@@ -131,17 +136,19 @@ ws_lineup = open_ws(gc, GS_WORKBOOK_NAME, TAB_LINEUP)
 # SCREENING PROCESSING
 # ======================================================
 screen_values = ws_screening.get_all_values()
-headers = [h.strip() for h in screen_values[0]]
-col_idx = {c.strip(): i + 1 for i, c in enumerate(headers)}
-screen_df = pd.DataFrame(screen_values[1:], columns=headers)
+screen_tracker = TrackerIndex(screen_values)
+headers = screen_tracker.headers
 
-batch_updates, new_rows = [], []
+screen_writes, new_rows = WritePlanner(), []
 updated_rows, appended_rows = [], []
 
 unique_candidates = merged_df.drop_duplicates('contact', keep='last')
 
-for _, row in unique_candidates.iterrows():
-    phone = str(row.get('contact', '')).strip()
+# Update-vs-append for every candidate in one lookup against the tracker index
+phones = normalize_contact(unique_candidates['contact'])
+tracker_rows = screen_tracker.match(phones)
+
+for (_, row), phone, rownum in zip(unique_candidates.iterrows(), phones, tracker_rows):
     if not phone:
         continue
 
@@ -166,17 +173,11 @@ for _, row in unique_candidates.iterrows():
     Education = str(row.get('education 2', '') or '').strip()
     Graduation_year = str(row.get('graduation_year', '') or '').strip()
 
-    matches = (
-        screen_df.index[screen_df['Contact'].astype(str).str.strip() == phone].tolist()
-        if 'Contact' in screen_df.columns else []
-    )
-
     def fill_screening_row(row_buf):
         def safe_put(header_name, value):
-            for h in col_idx.keys():
-                if h.strip().casefold() == header_name.strip().casefold():
-                    row_buf[col_idx[h] - 1] = value
-                    break
+            col = screen_tracker.column(header_name)
+            if col is not None:
+                row_buf[col - 1] = value
 
         safe_put('Date', entry_date_str)
         safe_put('Rec', rec)
@@ -199,16 +200,17 @@ for _, row in unique_candidates.iterrows():
         safe_put('Graduation_year', Graduation_year)
         safe_put('Computer_Time', entry_time_str)
 
-    if not matches:
-        next_id = int(pd.to_numeric(screen_df.get('candidate_id', pd.Series([])), errors='coerce').max() or 0) + 1
+    if not rownum:
         new_row = ['' for _ in headers]
         fill_screening_row(new_row)
+        id_col = screen_tracker.column('candidate_id')
+        if id_col is not None:
+            new_row[id_col - 1] = str(screen_tracker.next_candidate_id())
         new_rows.append(new_row)
+        screen_tracker.append(new_row)
         appended_rows.append(f"NEW | {phone} | {name_val or 'N/A'} | {remark}")
         continue
 
-    idx = matches[-1]
-    rownum = idx + 2
     to_update = [
         ('Remark', remark), ('Comment', comment), ('Rec', rec),
         ('Date', entry_date_str), ('Location', loc_val), ('Name', name_val),
@@ -220,15 +222,12 @@ for _, row in unique_candidates.iterrows():
         ('Computer_Time', entry_time_str),
     ]
     for h, v in to_update:
-        for key in col_idx.keys():
-            if key.strip().casefold() == h.strip().casefold():
-                a1 = gspread.utils.rowcol_to_a1(rownum, col_idx[key])
-                batch_updates.append({'range': a1, 'values': [[v]]})
-                break
+        col = screen_tracker.column(h)
+        if col is not None:
+            screen_writes.set(rownum, col, v)
     updated_rows.append(f"UPDATED | {phone} | {remark}")
 
-for i in range(0, len(batch_updates), 40):
-    safe_api_call(ws_screening.batch_update, batch_updates[i:i + 40])
+screen_writes.send(ws_screening, call=safe_api_call)
 if new_rows:
     safe_api_call(ws_screening.append_rows, new_rows, value_input_option='USER_ENTERED')
 
@@ -0,0 +1,7 @@
+"""Shared building blocks for the Finploy matching pipelines.
+
+The four pipeline folders (Job_matching_Screened, Job_matching_unscreened,
+Lineup_Followup, Screening_Followup) run their mainN.py scripts directly, so
+each script puts the repository root on ``sys.path`` before importing from
+this package.
+"""
@@ -0,0 +1,238 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from finploy_core.matching import JOBS_COLUMNS, match_pairs, typed_key_columns
+from finploy_core.rules import compile_rule
+
+# =============================================================================
+# BENCHMARK CONFIGURATION
+# =============================================================================
+# Run from the repository root:
+#   python -m finploy_core.benchmark run --out benchmark_baseline.json
+#   python -m finploy_core.benchmark compare benchmark_baseline.json
+SIZES = (1000, 10000, 100000, 1000000)   # candidates per run
+JOBS_PER_CANDIDATE = 0.02                # Mapping sheet size relative to the scrape...
+MIN_JOBS, MAX_JOBS = 200, 20000          # ...clamped to this range
+N_CITIES = 600
+CITY_SKEW = 1.1                          # Zipf exponent: a few hot cities, a long cold tail
+DEPARTMENTS = (3, 4, 5)
+PRODUCTS = (1, 3, 5, 8, 9)
+BENCH_RULE = {'hike_pct': (10, 90), 'hike_decimals': 1}  # main5.py's rule
+REGRESSION_THRESHOLD = 0.25              # compare flags >25% more time or memory...
+MIN_SLOWDOWN_S = 0.05                    # ...ignoring timing noise below 50 ms
+SEED = 0
+
+
+# =============================================================================
+# SYNTHETIC DATA
+# =============================================================================
+def _city_weights(n_cities=N_CITIES, skew=CITY_SKEW):
+    weights = 1.0 / np.arange(1, n_cities + 1) ** skew
+    return weights / weights.sum()
+
+
+def _salary_text(salary):
+    """'4.0' -> '4', '4.5' -> '4.5', as main3.py writes it into composit_key."""
+    return pd.Series(salary).map('{:g}'.format)
+
+
+def synthetic_jobs(n_jobs, seed=SEED):
+    """A Mapping-sheet-like jobs frame with composit_key '<city>_<dept>_<product>_<salary>'."""
+    rng = np.random.default_rng(seed)
+    city = rng.choice(N_CITIES, n_jobs, p=_city_weights()) + 1
+    dept, prod = rng.choice(DEPARTMENTS, n_jobs), rng.choice(PRODUCTS, n_jobs)
+    salary = np.round(rng.lognormal(np.log(5.5), 0.45, n_jobs), 1)
+    keys = pd.Series(city).astype(str) + '_' + pd.Series(dept).astype(str) + '_' + pd.Series(prod).astype(str)
+    dates = pd.Timestamp('2026-01-01') - pd.to_timedelta(rng.integers(0, 90, n_jobs), unit='D')
+    return pd.DataFrame({
+        JOBS_COLUMNS['job_id_col']: np.arange(1, n_jobs + 1),
+        JOBS_COLUMNS['composite_key_col']: keys + '_' + _salary_text(salary),
+        JOBS_COLUMNS['date_col']: dates.strftime('%d-%m-%Y'),
+        JOBS_COLUMNS['company_col']: 'Company ' + pd.Series(rng.integers(0, 400, n_jobs)).astype(str),
+        JOBS_COLUMNS['designation_col']: 'Sales Officer',
+        JOBS_COLUMNS['location_col']: 'City ' + pd.Series(city).astype(str),
+        JOBS_COLUMNS['hr_name_col']: 'HR',
+        JOBS_COLUMNS['status_col']: 'Active',
+        JOBS_COLUMNS['company_code']: 'cc' + pd.Series(rng.integers(0, 400, n_jobs)).astype(str),
+    })
+
+
+def synthetic_candidates(n_candidates, seed=SEED + 1):
+    """An output4-style candidates frame, typed KEY_COLUMNS included.
+
+    Cities follow the same Zipf skew as the jobs; about 1% of rows carry an
+    unmatched location (city_id 0) like real scrapes.
+    """
+    rng = np.random.default_rng(seed)
+    city = rng.choice(N_CITIES, n_candidates, p=_city_weights()) + 1
+    city[rng.random(n_candidates) < 0.01] = 0
+    dept, prod = rng.choice(DEPARTMENTS, n_candidates), rng.choice(PRODUCTS, n_candidates)
+    salary = np.round(rng.lognormal(np.log(4.0), 0.5, n_candidates), 1)
+    df = pd.DataFrame({
+        'candidate_id': np.arange(1, n_candidates + 1),
+        'name_location': 'cand' + pd.Series(np.arange(n_candidates)).astype(str),
+        'clean_salary': salary,
+        'Activity': 'Active ' + pd.Series(rng.integers(0, 60, n_candidates)).astype(str) + 'd ago',
+        'city_id': city.astype(str),
+        'department': dept.astype(str),
+        'product': prod.astype(str),
+    })
+    df['composit_key'] = df['city_id'] + '_' + df['department'] + '_' + df['product'] + '_' + _salary_text(salary)
+    return df.join(typed_key_columns(df['city_id'], df['department'], df['product'], df['clean_salary']))
+
+
+def jobs_for(n_candidates):
+    return int(np.clip(n_candidates * JOBS_PER_CANDIDATE, MIN_JOBS, MAX_JOBS))
+
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+def peak_rss_mb():
+    """Peak resident memory of this process in MB (None if unavailable)."""
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class _Counters(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                        ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+        counters = _Counters(cb=ctypes.sizeof(_Counters))
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return None
+        return counters.PeakWorkingSetSize / 2 ** 20
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10  # bytes on macOS, KB on Linux
+
+
+def _bench_one(n_candidates, repeat, workers):
+    """Time match_pairs at one size; runs in its own process so peak RSS is per size."""
+    jobs_df = synthetic_jobs(jobs_for(n_candidates))
+    candidates_df = synthetic_candidates(n_candidates)
+    rule = compile_rule(BENCH_RULE)
+    data_rss = peak_rss_mb()
+
+    times, pairs = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pairs = len(match_pairs(jobs_df, candidates_df, rule, workers=workers))
+        times.append(time.perf_counter() - start)
+    wall, peak = min(times), peak_rss_mb()
+    return {
+        'candidates': n_candidates,
+        'jobs': len(jobs_df),
+        'pairs': pairs,
+        'wall_s': round(wall, 4),
+        'pairs_per_s': round(pairs / wall) if wall > 0 else None,
+        'peak_rss_mb': round(peak, 1) if peak is not None else None,
+        'data_rss_mb': round(data_rss, 1) if data_rss is not None else None,
+    }
+
+
+def run_benchmark(sizes=SIZES, repeat=3, workers=None):
+    """Benchmark every size in a fresh process; returns the JSON-ready result."""
+    results = []
+    for n in sizes:
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+            result = executor.submit(_bench_one, n, repeat, workers).result()
+        results.append(result)
+        print(f"⏱️ {n:>9} candidates × {result['jobs']:>6} jobs: {result['wall_s']:.3f}s, "
+              f"{result['pairs']} pairs ({result['pairs_per_s']}/s), peak RSS {result['peak_rss_mb']} MB")
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'machine': {'platform': platform.platform(), 'python': platform.python_version(),
+                    'cpus': os.cpu_count()},
+        'config': {'rule': BENCH_RULE, 'repeat': repeat, 'workers': workers, 'n_cities': N_CITIES,
+                   'city_skew': CITY_SKEW, 'seed': SEED},
+        'results': results,
+    }
+
+
+def compare_results(baseline, current, threshold=REGRESSION_THRESHOLD):
+    """Regression messages for sizes slower or heavier than ``baseline`` by more than ``threshold``."""
+    before = {r['candidates']: r for r in baseline['results']}
+    regressions = []
+    for now in current['results']:
+        old = before.get(now['candidates'])
+        if old is None:
+            continue
+        for metric in ('wall_s', 'peak_rss_mb'):
+            if not old.get(metric) or now.get(metric) is None:
+                continue
+            change = now[metric] / old[metric] - 1
+            worse = change > threshold and (metric != 'wall_s' or now[metric] - old[metric] > MIN_SLOWDOWN_S)
+            print(f"{'❌' if worse else '✅'} {now['candidates']:>9} candidates {metric}: "
+                  f"{old[metric]} → {now[metric]} ({change:+.0%})")
+            if worse:
+                regressions.append(f"{now['candidates']} candidates: {metric} {change:+.0%}")
+        if old['pairs'] != now['pairs']:
+            regressions.append(f"{now['candidates']} candidates: {now['pairs']} pairs, baseline had {old['pairs']}")
+            print(f"❌ {now['candidates']:>9} candidates pairs: {old['pairs']} → {now['pairs']} (results changed)")
+    return regressions
+
+
+def _load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _save(result, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=1)
+    print(f"💾 Saved benchmark results to: {path}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Scaling benchmark for the Finploy matcher')
+    sub = parser.add_subparsers(dest='command', required=True)
+    for name in ('run', 'compare'):
+        p = sub.add_parser(name)
+        if name == 'compare':
+            p.add_argument('baseline', help='JSON written by "run"')
+            p.add_argument('current', nargs='?', help='JSON to check (default: benchmark now)')
+            p.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD)
+        p.add_argument('--out', help='Where to save this run')
+        p.add_argument('--sizes', type=int, nargs='+', default=list(SIZES))
+        p.add_argument('--repeat', type=int, default=3)
+        p.add_argument('--workers', type=int, default=None, help='match_pairs workers (default in-process)')
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        result = run_benchmark(args.sizes, args.repeat, args.workers)
+        _save(result, args.out or 'benchmark_results.json')
+        sys.exit(0)
+
+    baseline = _load(args.baseline)
+    if args.current:
+        current = _load(args.current)
+    else:
+        sizes = [r['candidates'] for r in baseline['results'] if r['candidates'] in set(args.sizes)]
+        current = run_benchmark(sizes, args.repeat, args.workers)
+        if args.out:
+            _save(current, args.out)
+    regressions = compare_results(baseline, current, args.threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"   ➤ {line}")
+        sys.exit(1)
+    print(f"\n✅ No regressions beyond {args.threshold:.0%}")
@@ -0,0 +1,158 @@
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from finploy_core.matching import CANDIDATES_COLUMNS, JOBS_COLUMNS, match_pairs, parse_composite_keys
+from finploy_core.segments import SEGMENT_COL
+
+SNAPSHOT_FILE = 'jobs_snapshot.parquet'
+POOL_MATCHES_FILE = 'pool_matches.parquet'
+
+
+def _to_parquet_safe(df):
+    """Store text-like columns as strings so every day's file has the same schema.
+
+    Excel gives mixed-type object columns, and a column that is empty for the
+    whole day (Activity, year) arrives as all-NaN float64; both are written as
+    strings so they line up with days where the column holds text.
+    """
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object or (df[col].isna().all() and df[col].dtype.kind == 'f'):
+            df[col] = df[col].astype('string')
+    return df
+
+
+def _key_city_ids(keys):
+    """city_id part of each composit_key ('0' when the key is unusable)."""
+    prefix = parse_composite_keys(keys)['prefix']
+    return prefix.str.split('_').str[0].fillna('0')
+
+
+# =============================================================================
+# HISTORICAL CANDIDATE POOL
+# =============================================================================
+class CandidatePool:
+    """Enriched candidates from every run, one Parquet partition per city_id.
+
+    ``append`` adds the day's output4 rows as new files under
+    ``city_id=<id>/`` so history is never rewritten. ``match_job_delta``
+    diffs the current Mapping sheet against the job set the pool was last
+    matched with, matches only new or changed jobs against the pool, and
+    drops stored matches for jobs that changed or went Inactive.
+    """
+
+    def __init__(self, pool_dir, key_col='name_location', candidates_columns=CANDIDATES_COLUMNS):
+        self.pool_dir = str(pool_dir)
+        self.key_col = key_col
+        self.candidates_columns = candidates_columns
+        os.makedirs(self.pool_dir, exist_ok=True)
+
+    def _partition_dir(self, city_id):
+        return os.path.join(self.pool_dir, f'city_id={city_id}')
+
+    def append(self, candidates_df):
+        """Add one run's enriched candidates; returns the number of rows written.
+
+        Rows are partitioned by the city_id inside their composit_key, which
+        is the value jobs are matched on.
+        """
+        stamp = datetime.now()
+        df = _to_parquet_safe(candidates_df.assign(pooled_at=stamp))
+        cities = _key_city_ids(candidates_df[self.candidates_columns['composite_key_col']]).to_numpy()
+        file_name = f"{stamp.strftime('%Y%m%d-%H%M%S-%f')}.parquet"
+        for city_id, part in df.groupby(cities, sort=False):
+            os.makedirs(self._partition_dir(city_id), exist_ok=True)
+            part.to_parquet(os.path.join(self._partition_dir(city_id), file_name), index=False)
+        return len(df)
+
+    def load(self, city_ids=None):
+        """Latest row per candidate (per candidate and segment in multi-segment runs), optionally limited to some city_ids."""
+        if city_ids is None:
+            city_ids = [d.split('=', 1)[1] for d in os.listdir(self.pool_dir) if d.startswith('city_id=')]
+        parts = []
+        for city_id in sorted(city_ids):
+            path = self._partition_dir(city_id)
+            if os.path.isdir(path):
+                # One file at a time: days written before a column's type settled
+                # may disagree, which a single dataset read refuses to merge
+                parts.extend(pd.read_parquet(os.path.join(path, name))
+                             for name in sorted(os.listdir(path)) if name.endswith('.parquet'))
+        if not parts:
+            return pd.DataFrame()
+        pool = pd.concat(parts, ignore_index=True).sort_values('pooled_at', kind='stable')
+        if self.key_col in pool.columns:
+            # Segment fan-out gives a candidate one row per segment under the same key
+            subset = [self.key_col] + [c for c in (SEGMENT_COL,) if c in pool.columns]
+            pool = pool.drop_duplicates(subset=subset, keep='last')
+        return pool.reset_index(drop=True)
+
+    # -------------------------------------------------------------------------
+    # Job delta
+    # -------------------------------------------------------------------------
+    def _read_side_file(self, name, columns):
+        path = os.path.join(self.pool_dir, name)
+        if os.path.exists(path):
+            return pd.read_parquet(path)
+        return pd.DataFrame({c: pd.Series(dtype='string') for c in columns})
+
+    def diff_jobs(self, jobs_df, jobs_columns=JOBS_COLUMNS):
+        """Compare the Mapping sheet with the snapshot of the last delta run.
+
+        Returns (active jobs that are new or changed, job_ids whose stored
+        matches must go, snapshot of the active job set). A job_id is compared
+        by the set of composit_keys it carries, so a job_id repeated on the
+        sheet is rematched (and its old matches dropped) as a whole; a blank
+        job_id counts as ''.
+        """
+        id_col, key_col = jobs_columns['job_id_col'], jobs_columns['composite_key_col']
+        current = pd.DataFrame({
+            'job_id': jobs_df[id_col].fillna('').astype(str).str.strip(),
+            'composit_key': jobs_df[key_col].fillna('').astype(str).str.strip(),
+        })
+        status_col = jobs_columns['status_col']
+        if status_col in jobs_df.columns:
+            active = (jobs_df[status_col].astype(str).str.strip().str.lower() == 'active').to_numpy()
+        else:
+            active = np.ones(len(jobs_df), dtype=bool)
+
+        previous = self._read_side_file(SNAPSHOT_FILE, ['job_id', 'composit_key'])
+        previous = previous[['job_id', 'composit_key']].fillna('').astype(str)
+        last_keys = previous.groupby('job_id')['composit_key'].agg(frozenset)
+        keys = current[active].groupby('job_id')['composit_key'].agg(frozenset)
+        dirty = {job_id for job_id, job_keys in keys.items() if last_keys.get(job_id) != job_keys}
+        changed = active & current['job_id'].isin(dirty).to_numpy()
+
+        dropped = set(last_keys.index) - set(keys.index)
+        dropped |= dirty & set(last_keys.index)
+        return jobs_df[changed], dropped, current[active]
+
+    def match_job_delta(self, jobs_df, salary_rule, job_salary_col='Job_salary', jobs_columns=JOBS_COLUMNS,
+                        workers=None, hierarchy=None):
+        """Match new/changed jobs against the pool and update stored matches.
+
+        Returns (MatchPairs of the new matches, dropped job_ids, all stored
+        matches as a frame).
+        """
+        delta_jobs, dropped, snapshot = self.diff_jobs(jobs_df, jobs_columns)
+        city_ids = set(_key_city_ids(delta_jobs[jobs_columns['composite_key_col']]))
+        if hierarchy:
+            city_ids = {c for city in city_ids for c in hierarchy.related_cities(city)}
+        pool = self.load(city_ids) if city_ids else pd.DataFrame()
+        if pool.empty:
+            pool = pd.DataFrame({self.candidates_columns['composite_key_col']: pd.Series(dtype=object)})
+        new_pairs = match_pairs(delta_jobs, pool, salary_rule, jobs_columns, self.candidates_columns,
+                                workers=workers, hierarchy=hierarchy)
+
+        stored = self._read_side_file(POOL_MATCHES_FILE, ['job_id'])
+        if len(stored):
+            stored = stored[~stored['job_id'].fillna('').astype(str).isin(dropped)]
+        if len(new_pairs):
+            new_matches = new_pairs.frame(job_salary_col=job_salary_col)
+            new_matches['job_id'] = new_matches['job_id'].fillna('').astype(str).str.strip()
+            stored = pd.concat([stored, _to_parquet_safe(new_matches)], ignore_index=True)
+        stored.to_parquet(os.path.join(self.pool_dir, POOL_MATCHES_FILE), index=False)
+        snapshot.to_parquet(os.path.join(self.pool_dir, SNAPSHOT_FILE), index=False)
+        return new_pairs, dropped, stored
@@ -0,0 +1,145 @@
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from finploy_core.matching import (
+    CANDIDATES_COLUMNS, PrefixSalaryIndex, job_probes, prefix_codes, composite_key_arrays, prefix_strings,
+)
+
+# File written next to the match export
+STATS_FILENAME = 'match_stats.json'
+
+# Why a job ended up with no matches, checked in this order
+ZERO_MATCH_REASONS = (
+    'unusable_key',             # job composit_key missing or unparsable
+    'no_candidates_in_prefix',  # no candidate shares its city_department_product
+    'excluded_by_rule',         # candidates exist but fail the rule's experience/education filters
+    'salary_band',              # every candidate salary is below the floor or above the ceiling
+    'rule',                     # inside the salary window but rejected by the exact rule (rounding, caps)
+)
+
+
+def _key_quality(df, key_col, prefix):
+    """(missing, unparsable) counts for rows whose packed prefix is unusable."""
+    text = df[key_col] if key_col in df.columns else pd.Series(np.nan, index=df.index)
+    missing = (text.isna() | text.astype(str).str.strip().eq('')).to_numpy()
+    bad = prefix < 0
+    return int((bad & missing).sum()), int((bad & ~missing).sum())
+
+
+def match_stats(pairs, salary_rule, candidates_columns=CANDIDATES_COLUMNS, hierarchy=None):
+    """Counters explaining a match run, computed as array reductions.
+
+    ``pairs`` is the unranked MatchPairs of the run; its jobs/candidates are
+    re-keyed and every probe is split by bucket and salary window with the
+    same PrefixSalaryIndex lookups the matcher uses, so no pair is built
+    twice. Per job prefix it counts jobs, candidates, candidates in the
+    probed buckets below the salary floor / above the ceiling / inside the
+    window but rejected by the rule, and matches. Also lists every job
+    without a match with the first ZERO_MATCH_REASONS entry that explains it.
+    """
+    jobs_df, candidates_df, jobs_columns = pairs.jobs_df, pairs.candidates_df, pairs.jobs_columns
+    job_key_col, cand_key_col = jobs_columns['composite_key_col'], candidates_columns['composite_key_col']
+    job_prefix, job_salary = composite_key_arrays(jobs_df, job_key_col)
+    cand_prefix, cand_salary = composite_key_arrays(candidates_df, cand_key_col)
+    excluded = np.zeros(len(cand_prefix), dtype=bool)
+    if hasattr(salary_rule, 'candidate_mask'):
+        excluded = ~salary_rule.candidate_mask(candidates_df) & (cand_prefix >= 0)
+
+    job_codes, cand_codes, prefixes = prefix_codes(job_prefix, cand_prefix)
+    n_codes, n_jobs = len(prefixes), len(jobs_df)
+    eligible = (cand_codes >= 0) & ~excluded
+    cands_per_code = np.bincount(cand_codes[eligible], minlength=n_codes)
+    excluded_per_code = np.bincount(cand_codes[excluded], minlength=n_codes)
+
+    # Every (job, bucket) probe split into below floor / in window / above ceiling
+    adjacency = hierarchy.adjacency(prefix_strings(prefixes)) if hierarchy else None
+    jobs, probes = job_probes(job_codes, adjacency)
+    index = PrefixSalaryIndex(np.where(eligible, cand_codes, -1), np.where(eligible, cand_salary, np.nan))
+    bucket = index.code_of(probes)
+    has = bucket >= 0
+    starts = np.append(index.bucket_starts, len(index))  # padded so an empty index still gathers
+    b_start = np.where(has, starts[np.maximum(bucket, 0)], 0)
+    b_end = np.where(has, starts[np.maximum(bucket, 0) + 1], 0)
+    lo, hi = salary_rule.candidate_bounds(job_salary[jobs])
+    start, end = index.slices(bucket, lo, hi)
+
+    def per_job(values):
+        return np.bincount(jobs, weights=values, minlength=n_jobs).astype(np.int64)
+
+    in_prefix = per_job(b_end - b_start)
+    below = per_job(np.where(has, start - b_start, 0))
+    above = per_job(np.where(has, b_end - end, 0))
+    in_window = per_job(end - start)
+    excluded_seen = per_job(excluded_per_code[probes])
+    matched = np.bincount(pairs.job_pos, minlength=n_jobs).astype(np.int64)
+    rejected = np.maximum(in_window - matched, 0)
+
+    reasons = np.select(
+        [job_codes < 0, (in_prefix == 0) & (excluded_seen == 0), in_prefix == 0, in_window == 0],
+        list(ZERO_MATCH_REASONS[:4]), ZERO_MATCH_REASONS[4],
+    )
+    zero = matched == 0
+
+    # Per job prefix: sum the per-job counters over the jobs carrying it
+    job_ok = job_codes >= 0
+    by_prefix = {
+        'jobs': np.bincount(job_codes[job_ok], minlength=n_codes),
+        'candidates': cands_per_code,
+        'candidates_excluded_by_rule': excluded_per_code,
+    }
+    for name, values in (('pairs_in_prefix', in_prefix), ('below_salary_floor', below),
+                         ('above_salary_ceiling', above), ('rejected_by_rule', rejected),
+                         ('matched', matched), ('jobs_without_match', zero)):
+        by_prefix[name] = np.bincount(job_codes[job_ok], weights=values[job_ok], minlength=n_codes)
+    prefix_table = pd.DataFrame({k: np.asarray(v, dtype=np.int64) for k, v in by_prefix.items()})
+    prefix_table.insert(0, 'prefix', prefix_strings(prefixes))
+    prefix_table = prefix_table.sort_values(['jobs_without_match', 'jobs', 'prefix'], ascending=[False, False, True])
+
+    job_missing, job_bad = _key_quality(jobs_df, job_key_col, job_prefix)
+    cand_missing, cand_bad = _key_quality(candidates_df, cand_key_col, cand_prefix)
+    job_id_col = jobs_columns['job_id_col']
+    zero_jobs = pd.DataFrame({
+        'job_id': jobs_df[job_id_col].to_numpy()[zero] if job_id_col in jobs_df.columns else np.flatnonzero(zero),
+        'composit_key': jobs_df[job_key_col].to_numpy()[zero] if job_key_col in jobs_df.columns else None,
+        'reason': reasons[zero],
+    })
+
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'rule': repr(salary_rule),
+        'totals': {
+            'jobs': n_jobs,
+            'jobs_missing_key': job_missing,
+            'jobs_unparsable_key': job_bad,
+            'candidates': len(candidates_df),
+            'candidates_missing_key': cand_missing,
+            'candidates_unparsable_key': cand_bad,
+            'candidates_excluded_by_rule': int(excluded.sum()),
+            'prefixes': n_codes,
+            'pairs_in_prefix': int(in_prefix.sum()),
+            'below_salary_floor': int(below.sum()),
+            'above_salary_ceiling': int(above.sum()),
+            'rejected_by_rule': int(rejected.sum()),
+            'matched': len(pairs),
+            'jobs_without_match': int(zero.sum()),
+        },
+        'zero_match_reasons': {r: int((reasons[zero] == r).sum()) for r in ZERO_MATCH_REASONS},
+        'prefixes': prefix_table.to_dict('records'),
+        'jobs_without_match': zero_jobs.astype(object).where(zero_jobs.notna(), None).to_dict('records'),
+    }
+
+
+def write_match_stats(stats, output_dir, filename=STATS_FILENAME):
+    """Write ``stats`` as JSON under ``output_dir`` and return the path."""
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, filename)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(stats, f, indent=1, default=lambda v: v.item() if hasattr(v, 'item') else str(v))
+    totals = stats['totals']
+    print(f"📈 Match stats: {totals['matched']} matches, {totals['jobs_without_match']} jobs without a match "
+          f"({', '.join(f'{k}={v}' for k, v in stats['zero_match_reasons'].items() if v)}) → {path}")
+    return path
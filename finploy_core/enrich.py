@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+
+def factorize_values(values):
+    """(codes, first) for ``values``: an integer code per row and the row of each code's first occurrence.
+
+    Unlike a bare ``pd.factorize``, NaN is a value of its own and values that
+    compare equal across types (1, 1.0, True) get different codes, so a
+    function of the value sees exactly what it would have seen row by row.
+    """
+    values = pd.Series(values)
+    codes, _ = pd.factorize(values, use_na_sentinel=False)
+    if values.dtype == object and len(values):
+        type_codes, types = pd.factorize(values.map(type))
+        if len(types) > 1:
+            codes, _ = pd.factorize(codes.astype(np.int64) * len(types) + type_codes)
+    _, first = np.unique(codes, return_index=True)
+    return codes, first
+
+
+def map_distinct(values, func):
+    """``values.map(func)``, calling ``func`` once per distinct value.
+
+    Scraped columns (location, designation, salary text, dates) repeat a few
+    hundred values across thousands of rows, so the cost follows the number
+    of distinct values; the results are broadcast back through the codes.
+    """
+    values = pd.Series(values)
+    codes, first = factorize_values(values)
+    results = values.iloc[first].reset_index(drop=True).map(func)
+    return results.take(codes).set_axis(values.index)
+
+
+def map_distinct_rows(df, columns, func):
+    """``df[columns].apply(func, axis=1)``, calling ``func`` once per distinct combination of ``columns``."""
+    columns = list(columns)
+    if df.empty:
+        return df[columns].apply(func, axis=1)
+    codes = np.zeros(len(df), dtype=np.int64)
+    for col in columns:
+        col_codes, col_first = factorize_values(df[col])
+        codes, _ = pd.factorize(codes * len(col_first) + col_codes)  # re-packed so it never overflows
+    _, first = np.unique(codes, return_index=True)
+    results = df[columns].iloc[first].reset_index(drop=True).apply(func, axis=1)
+    return results.take(codes).set_axis(df.index)
@@ -0,0 +1,153 @@
+import json
+import os
+import re
+from datetime import datetime
+
+import numpy as np
+
+# Accepted fuzzy resolutions, reused by every later run as exact hits
+ALIAS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'location_aliases.json')
+FUZZY_THRESHOLD = 0.7    # minimum trigram Dice similarity to accept a master name
+MIN_QUERY_LENGTH = 3     # shorter names/parts ("ncr", "up") are too ambiguous to guess
+PART_SEPARATORS = r',|/|&|\||-|\(|\)| and '
+
+
+def trigrams(name):
+    """Character trigrams of ``name`` padded so word starts and ends count."""
+    padded = f'  {name} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Inverted index from character trigram to the names containing it."""
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.vocab = {}
+        gram_ids, name_ids, sizes = [], [], []
+        for i, name in enumerate(self.names):
+            grams = trigrams(name)
+            sizes.append(len(grams))
+            for gram in grams:
+                gram_ids.append(self.vocab.setdefault(gram, len(self.vocab)))
+                name_ids.append(i)
+        gram_ids = np.asarray(gram_ids, dtype=np.int64)
+        order = np.argsort(gram_ids, kind='stable')
+        self.postings = np.asarray(name_ids, dtype=np.int64)[order]
+        self.offsets = np.searchsorted(gram_ids[order], np.arange(len(self.vocab) + 1))
+        self.sizes = np.asarray(sizes, dtype=np.int64)
+
+    def best(self, query):
+        """(name index, Dice similarity) of the closest name, (-1, 0.0) when none shares a trigram.
+
+        Ties go to the earliest name.
+        """
+        grams = trigrams(query)
+        ids = [self.vocab[g] for g in grams if g in self.vocab]
+        if not ids:
+            return -1, 0.0
+        hits = np.concatenate([self.postings[self.offsets[g]:self.offsets[g + 1]] for g in ids])
+        candidates, shared = np.unique(hits, return_counts=True)
+        scores = 2 * shared / (len(grams) + self.sizes[candidates])
+        best = int(np.argmax(scores))  # candidates are sorted, so the first maximum is the earliest name
+        return int(candidates[best]), float(scores[best])
+
+
+def _variants(names):
+    """The names themselves, then every delimiter-separated part, in order and deduplicated."""
+    out = list(names)
+    for name in names:
+        out.extend(part.strip() for part in re.split(PART_SEPARATORS, name))
+    return [v for v in dict.fromkeys(out) if len(v) >= MIN_QUERY_LENGTH]
+
+
+class FuzzyLocationFallback:
+    """Second chance for locations the exact LocationResolver lookup misses.
+
+    A remembered alias is tried first (a dict hit); otherwise the location's
+    names and their comma/slash/dash-separated parts are scored against every
+    master name of the resolver's ``match_order`` columns by trigram Dice
+    similarity, and the best one at or above ``threshold`` is accepted and
+    saved to ``alias_file`` so the next run skips the scoring. Aliases store
+    the master column and name rather than a row, so they survive master
+    revisions; one whose name has left the master is ignored. Synonyms that
+    share no spelling (bangalore/bengaluru) can be added to the file by hand
+    as ``{"bangalore": {"column": "city", "name": "bengaluru"}}``.
+    """
+
+    def __init__(self, alias_file=ALIAS_FILE, threshold=FUZZY_THRESHOLD):
+        self.alias_file = alias_file
+        self.threshold = threshold
+        self.aliases = self._load()
+        self._index = None
+        self._index_resolver = None
+
+    def _load(self):
+        if not self.alias_file or not os.path.exists(self.alias_file):
+            return {}
+        try:
+            with open(self.alias_file, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not read location aliases {self.alias_file}: {e}")
+            return {}
+
+    def _save(self, new_aliases):
+        """Merge ``new_aliases`` into the file (re-read first: the pipelines can run in parallel)."""
+        if not self.alias_file:
+            return
+        stored = self._load()
+        stored.update(new_aliases)
+        os.makedirs(os.path.dirname(self.alias_file) or '.', exist_ok=True)
+        with open(self.alias_file + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(stored, f, indent=1, ensure_ascii=False, sort_keys=True)
+        os.replace(self.alias_file + '.tmp', self.alias_file)
+        self.aliases = stored
+
+    def _names(self, resolver):
+        if self._index_resolver is not resolver:
+            entries = {}
+            for col in resolver.match_order:
+                for name in resolver.index[col]:
+                    if len(name) >= MIN_QUERY_LENGTH:
+                        entries.setdefault(name, col)  # a name in both columns counts for the first
+            self._entries = list(entries.items())
+            self._index = TrigramIndex(name for name, _ in self._entries)
+            self._index_resolver = resolver
+        return self._index
+
+    def resolve(self, resolver, values):
+        """Master row position for each of the distinct unresolved ``values`` (-1 when still unknown)."""
+        positions = np.full(len(values), -1, dtype=np.int64)
+        new_aliases, alias_hits = {}, 0
+        for i, value in enumerate(values):
+            names = [n for n in resolver.split(value) if n]
+            if not names:
+                continue
+            key = ' | '.join(names)
+            alias = self.aliases.get(key)
+            if alias is not None:
+                position = resolver.index.get(alias['column'], {}).get(alias['name'])
+                if position is not None:
+                    positions[i] = position
+                    alias_hits += 1
+                    continue
+
+            index = self._names(resolver)
+            best, best_score = -1, 0.0
+            for variant in _variants(names):
+                found, score = index.best(variant)
+                if score > best_score:
+                    best, best_score = found, score
+            if best >= 0 and best_score >= self.threshold:
+                name, column = self._entries[best]
+                positions[i] = resolver.index[column][name]
+                new_aliases[key] = {'column': column, 'name': name, 'score': round(best_score, 3),
+                                    'location': str(value), 'added': datetime.now().strftime('%Y-%m-%d')}
+
+        if new_aliases:
+            self._save(new_aliases)
+        if alias_hits or new_aliases:
+            print(f"🔎 Fuzzy location fallback: {alias_hits} known aliases, {len(new_aliases)} new "
+                  f"(saved to {self.alias_file}), {int((positions < 0).sum())} still unmatched")
+        return positions
@@ -0,0 +1,95 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LAT = 111.2
+
+# Accepted headers in the coordinates CSV (first one present wins)
+CITY_ID_COLS = ('city_id', 'city_wise_id')
+LATITUDE_COLS = ('latitude', 'lat')
+LONGITUDE_COLS = ('longitude', 'long', 'lng', 'lon')
+
+
+def _pick_column(df, names, path):
+    for name in names:
+        if name in df.columns:
+            return df[name]
+    raise ValueError(f"{path} needs one of the columns {', '.join(names)}")
+
+
+def load_city_coordinates(path):
+    """One (city_id, latitude, longitude) row per city from a local CSV.
+
+    The CSV may hold several area rows per city (like the location master);
+    their coordinates are averaged. Rows without usable coordinates are
+    dropped.
+    """
+    raw = pd.read_csv(path, dtype=str)
+    raw.columns = raw.columns.str.strip().str.lower()
+    df = pd.DataFrame({
+        'city_id': _pick_column(raw, CITY_ID_COLS, path).astype(str).str.strip().str.replace(r'\.0$', '', regex=True),
+        'latitude': pd.to_numeric(_pick_column(raw, LATITUDE_COLS, path), errors='coerce'),
+        'longitude': pd.to_numeric(_pick_column(raw, LONGITUDE_COLS, path), errors='coerce'),
+    }).dropna()
+    df = df[df['city_id'].ne('') & df['city_id'].ne('0')]
+    return df.groupby('city_id', as_index=False, sort=True)[['latitude', 'longitude']].mean()
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km (broadcasts over arrays)."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+# =============================================================================
+# GRID INDEX
+# =============================================================================
+class CityGrid:
+    """Cities bucketed into lat/long cells at least ``radius_km`` wide.
+
+    Everything within ``radius_km`` of a city lies in its own or one of the
+    eight surrounding cells, so a neighbour query checks nine cells instead
+    of every city.
+    """
+
+    def __init__(self, coords, radius_km):
+        self.city_ids = coords['city_id'].to_numpy()
+        self.lat = coords['latitude'].to_numpy(dtype=float)
+        self.lon = coords['longitude'].to_numpy(dtype=float)
+        self.radius_km = float(radius_km)
+
+        max_lat = float(np.abs(self.lat).max()) if len(self.lat) else 0.0
+        self.cell_lat = self.radius_km / KM_PER_DEGREE_LAT
+        self.cell_lon = self.cell_lat / max(math.cos(math.radians(min(max_lat, 89.0))), 1e-6)
+        rows = np.floor(self.lat / self.cell_lat).astype(np.int64)
+        cols = np.floor(self.lon / self.cell_lon).astype(np.int64)
+        self.cell_of = list(zip(rows.tolist(), cols.tolist()))
+        self.cells = {}
+        for i, cell in enumerate(self.cell_of):
+            self.cells.setdefault(cell, []).append(i)
+
+    def neighbours(self, i):
+        """Indices of cities within radius of city ``i`` (itself excluded), nearest first."""
+        row, col = self.cell_of[i]
+        near = np.array([j for dr in (-1, 0, 1) for dc in (-1, 0, 1)
+                         for j in self.cells.get((row + dr, col + dc), ())], dtype=np.int64)
+        near = near[near != i]
+        dist = haversine_km(self.lat[i], self.lon[i], self.lat[near], self.lon[near])
+        keep = dist <= self.radius_km
+        return near[keep][np.argsort(dist[keep], kind='stable')]
+
+
+def city_neighbours(path, radius_km):
+    """{city_id: [city_ids within radius_km, nearest first]} from the coordinates CSV.
+
+    Computed once per run; PrefixHierarchy(cities=...) turns it into extra
+    buckets for every job.
+    """
+    grid = CityGrid(load_city_coordinates(path), radius_km)
+    return {
+        grid.city_ids[i]: grid.city_ids[grid.neighbours(i)].tolist()
+        for i in range(len(grid.city_ids))
+    }
@@ -0,0 +1,118 @@
+import json
+import os
+import string
+from datetime import datetime
+
+import pandas as pd
+
+# Finploy Location Master, read by every pipeline's location stages
+LOCATION_SHEET_ID = "11Yye2zMLOgb0J8wBjH0VJNuOV28AAERNPxr3RE2OO-E"
+
+# Shared by all four pipelines so one download serves every stage until the sheet changes
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'location_master')
+CACHE_VALUES_FILE = 'values.parquet'
+CACHE_META_FILE = 'meta.json'
+API_TIMEOUT_S = 30  # slower than this counts as a failed call and the cached copy is used
+
+# Columns the location stage reads from the master ('0' when the sheet lacks one)
+REQUIRED_COLUMNS = ['area', 'city', 'state', 'city_wise_id', 'pincode', 'id']
+STRIPPED_COLUMNS = ['area', 'city', 'id', 'city_wise_id', 'pincode']
+
+
+def _modified_time(spreadsheet):
+    """Drive modifiedTime of the spreadsheet (gspread 6 method, gspread 5 property)."""
+    getter = getattr(spreadsheet, 'get_lastUpdateTime', None)
+    return getter() if getter else spreadsheet.lastUpdateTime
+
+
+def _paths(cache_dir, sheet_id):
+    folder = os.path.join(cache_dir, sheet_id)
+    return os.path.join(folder, CACHE_VALUES_FILE), os.path.join(folder, CACHE_META_FILE)
+
+
+def _read_cache(cache_dir, sheet_id):
+    """(values, meta) from the cache, or (None, None) when there is no usable copy."""
+    values_path, meta_path = _paths(cache_dir, sheet_id)
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        rows = pd.read_parquet(values_path).to_numpy().tolist()
+        values = [meta['header']] + rows
+    except (OSError, ValueError, KeyError, TypeError):
+        return None, None
+    return values, meta
+
+
+def _write_cache(cache_dir, sheet_id, values, modified_time):
+    values_path, meta_path = _paths(cache_dir, sheet_id)
+    os.makedirs(os.path.dirname(values_path), exist_ok=True)
+    header, rows = values[0], values[1:]
+    frame = pd.DataFrame(rows, columns=[str(i) for i in range(len(header))], dtype=str)
+    frame.to_parquet(values_path + '.tmp', index=False)
+    os.replace(values_path + '.tmp', values_path)
+    meta = {'sheet_id': sheet_id, 'modified_time': modified_time, 'header': header,
+            'rows': len(rows), 'fetched_at': datetime.now().isoformat(timespec='seconds')}
+    with open(meta_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=1)
+    os.replace(meta_path + '.tmp', meta_path)
+
+
+def load_location_values(client, sheet_id=LOCATION_SHEET_ID, cache_dir=CACHE_DIR, timeout=API_TIMEOUT_S):
+    """The location master's first worksheet as ``get_all_values`` returns it.
+
+    Only the spreadsheet's Drive ``modifiedTime`` is fetched when a cached copy
+    exists; the values are downloaded again only when it changed. If the API
+    errors or times out, the cached copy is returned (however old) and the
+    error is raised only when there is none.
+    """
+    cached, meta = _read_cache(cache_dir, sheet_id)
+    set_timeout = getattr(client, 'set_timeout', None)
+    if set_timeout:
+        set_timeout(timeout)
+    try:
+        spreadsheet = client.open_by_key(sheet_id)
+        modified_time = _modified_time(spreadsheet)
+        if cached is not None and meta.get('modified_time') == modified_time:
+            print(f"✅ Location master unchanged since {modified_time}: using cached copy ({len(cached) - 1} rows)")
+            return cached
+        values = spreadsheet.sheet1.get_all_values()
+    except Exception as e:
+        if cached is None:
+            raise
+        print(f"⚠️ Location master fetch failed ({type(e).__name__}: {e}); "
+              f"using cached copy from {meta.get('fetched_at')} ({len(cached) - 1} rows)")
+        return cached
+    finally:
+        if set_timeout:
+            set_timeout(None)
+
+    if values:
+        _write_cache(cache_dir, sheet_id, values, modified_time)
+    print(f"⬇️ Downloaded location master revision {modified_time} ({max(len(values) - 1, 0)} rows)")
+    return values
+
+
+def location_frame(values):
+    """DataFrame of the location master ``values`` as the location stage compares it.
+
+    Duplicate headers get a ``_1``, ``_2``... suffix, missing REQUIRED_COLUMNS
+    are filled with '0' and STRIPPED_COLUMNS are trimmed of spaces and
+    trailing punctuation.
+    """
+    seen, headers = {}, []
+    for header in (values[0] if values else []):
+        header = header.strip()
+        if header in seen:
+            seen[header] += 1
+            header = f"{header}_{seen[header]}"
+        else:
+            seen[header] = 0
+        headers.append(header)
+
+    df_location = pd.DataFrame(values[1:], columns=headers)
+    for col in REQUIRED_COLUMNS:
+        if col not in df_location.columns:
+            df_location[col] = '0'
+    for col in STRIPPED_COLUMNS:
+        df_location[col] = df_location[col].astype(str).str.strip().str.rstrip(string.punctuation)
+    return df_location
@@ -0,0 +1,106 @@
+import string
+
+import numpy as np
+import pandas as pd
+
+from finploy_core.enrich import factorize_values
+
+# Location master columns returned for every candidate by the enrichment scripts
+LOCATION_COLUMNS = ['id', 'area', 'city', 'state', 'city_wise_id', 'pincode']
+UNMATCHED_STATUS = 'new_location_needed'
+
+
+def normalize_location(value):
+    """Candidate location as compared by main3/main12: trimmed, lower case, no trailing punctuation."""
+    return str(value).strip().lower().rstrip(string.punctuation)
+
+
+def normalize_master_name(value):
+    """Location master city/area (already trimmed on load) as compared by main3/main12."""
+    return str(value).lower().rstrip(string.punctuation)
+
+
+class LocationResolver:
+    """Location master indexed by normalized name, built once per run.
+
+    Each column in ``match_order`` becomes a dict from normalized name to the
+    first master row carrying it, so a lookup returns the same row the old
+    per-row ``df_location[df_location[col] == loc]`` scan picked. Lookups
+    normalize every distinct candidate location once and ``map`` it through
+    the dicts; the first column in ``match_order`` that knows a name wins.
+    ``split`` turns one location into several names to try in order (all
+    names against the first column, then all against the next); by default
+    the location is ``normalize``-d into a single name. ``master_normalize``
+    is applied to the master columns (default: compare them as they are).
+    Distinct locations no column knows are handed to ``fallback`` (one object
+    or a list tried in order, e.g. a PincodeIndex then a
+    FuzzyLocationFallback), each seeing only what the earlier ones missed.
+    """
+
+    def __init__(self, df_location, match_order=('city', 'area'), normalize=normalize_location,
+                 master_normalize=None, split=None, fallback=None):
+        self.df = df_location.reset_index(drop=True)
+        self.fallbacks = list(fallback) if isinstance(fallback, (list, tuple)) else [fallback] if fallback else []
+        self.match_order = [col for col in match_order if col in self.df.columns]
+        self.split = split or (lambda value: [normalize(value)])
+        self.index = {}
+        for col in self.match_order:
+            keys = self.df[col].astype(str)
+            if master_normalize is not None:
+                keys = keys.map(master_normalize)
+            first = ~keys.duplicated()
+            self.index[col] = dict(zip(keys[first], np.flatnonzero(first.to_numpy())))
+
+    def __len__(self):
+        return len(self.df)
+
+    def positions(self, values):
+        """Master row position for each value, -1 when no name matches."""
+        values = pd.Series(values, dtype=object)
+        codes, first = factorize_values(values)
+        if not len(first):
+            return np.empty(0, dtype=np.int64)
+        uniques = values.iloc[first].reset_index(drop=True)
+        names = uniques.map(self.split).explode()
+        found = pd.Series(np.nan, index=np.arange(len(uniques)))
+        for col in self.match_order:
+            hits = names.map(self.index[col]).dropna()
+            found = found.fillna(hits[~hits.index.duplicated()])
+        found = found.fillna(-1).to_numpy(dtype=np.int64)
+        for fallback in self.fallbacks:
+            missing = np.flatnonzero(found < 0)
+            if not len(missing):
+                break
+            found[missing] = fallback.resolve(self, uniques.iloc[missing].tolist())
+        return found[codes]
+
+    def take(self, positions, columns=LOCATION_COLUMNS, fill='0'):
+        """Master ``columns`` at ``positions`` (``fill`` where -1), one row per position."""
+        positions = np.asarray(positions, dtype=np.int64)
+        matched = positions >= 0
+        out = np.full((len(positions), len(columns)), fill, dtype=object)
+        if matched.any():
+            out[matched] = self.df[list(columns)].astype(object).to_numpy()[positions[matched]]
+        return pd.DataFrame(out, columns=list(columns))
+
+    def lookup(self, values, columns=LOCATION_COLUMNS, fill='0'):
+        """Master ``columns`` for each value (``fill`` where unmatched), aligned with ``values``."""
+        return self.take(self.positions(values), columns, fill)
+
+
+def blank_locations(values, normalize=normalize_location):
+    """Mask of values that are missing or normalize to an empty name."""
+    values = pd.Series(values, dtype=object)
+    return (values.isna() | values.map(normalize).eq('')).to_numpy()
+
+
+def unmatched_location_rows(df, positions):
+    """Rows of ``df`` whose location resolved to no master row (position -1).
+
+    Each keeps all its columns plus ``unmatched_location``: the raw location,
+    or 'blank' when there was none.
+    """
+    missing = np.asarray(positions) < 0
+    locations = df['location'] if 'location' in df.columns else pd.Series(np.nan, index=df.index)
+    blank = blank_locations(locations[missing])
+    return df[missing].assign(unmatched_location=np.where(blank, 'blank', locations[missing].astype(object)))
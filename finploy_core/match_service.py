@@ -0,0 +1,179 @@
+import argparse
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from finploy_core.matching import (
+    CANDIDATES_COLUMNS, JOB_OUTPUT_COLUMNS, JOBS_COLUMNS, MatchPairs, composite_key_arrays, match_pairs,
+)
+from finploy_core.rules import compile_rule
+
+# =============================================================================
+# SERVICE CONFIGURATION
+# =============================================================================
+# Start from the repository root:
+#   python -m finploy_core.match_service --jobs "D:\...\MASTER FILE LOCATIONS - Mapping.xlsx"
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_URL = f'http://{DEFAULT_HOST}:{DEFAULT_PORT}'
+SERVICE_TIMEOUT = 30  # seconds a client waits before matching locally
+
+
+class JobsCache:
+    """Mapping sheet jobs and their parsed keys, reloaded when the file changes."""
+
+    def __init__(self, jobs_file, jobs_columns=JOBS_COLUMNS):
+        self.jobs_file = jobs_file
+        self.jobs_columns = jobs_columns
+        self.jobs_df = None
+        self.job_keys = None
+        self.mtime = None
+        self._lock = threading.Lock()
+
+    def current(self):
+        """(jobs_df, job_keys, version) after reloading if the file's mtime moved."""
+        mtime = os.path.getmtime(self.jobs_file)
+        with self._lock:
+            if mtime != self.mtime:
+                jobs_df = pd.read_excel(self.jobs_file)
+                self.job_keys = composite_key_arrays(jobs_df, self.jobs_columns['composite_key_col'])
+                self.jobs_df, self.mtime = jobs_df, mtime
+                print(f"🔄 Loaded {len(jobs_df)} jobs from {self.jobs_file}")
+            return self.jobs_df, self.job_keys, self.mtime
+
+
+class MatchService:
+    """Matches candidate key batches against the cached jobs."""
+
+    def __init__(self, jobs_file, jobs_columns=JOBS_COLUMNS):
+        self.jobs = JobsCache(jobs_file, jobs_columns)
+        self.jobs_columns = jobs_columns
+        self._rules = {}
+
+    def _rule(self, spec):
+        text = json.dumps(spec or {}, sort_keys=True)
+        if text not in self._rules:
+            self._rules[text] = compile_rule(spec)
+        return self._rules[text]
+
+    def health(self):
+        jobs_df, _, version = self.jobs.current()
+        return {'jobs': len(jobs_df), 'jobs_file': self.jobs.jobs_file, 'jobs_version': version}
+
+    def match(self, keys, rule_spec=None):
+        """Pairs for ``keys`` (composit_key text, None to skip) as a JSON-ready dict.
+
+        Only the matched jobs' output columns are returned; ``pairs.job``
+        indexes those rows and ``pairs.candidate`` indexes ``keys``.
+        """
+        jobs_df, job_keys, version = self.jobs.current()
+        key_col = self.jobs_columns['composite_key_col']
+        candidates_df = pd.DataFrame({key_col: pd.Series(keys, dtype=object)})
+        pairs = match_pairs(jobs_df, candidates_df, self._rule(rule_spec), self.jobs_columns,
+                            {'composite_key_col': key_col}, job_keys=job_keys)
+
+        used, job_idx = np.unique(pairs.job_pos, return_inverse=True)
+        out_cols = [c for c in dict.fromkeys(self.jobs_columns[k] for _, k in JOB_OUTPUT_COLUMNS)
+                    if c in jobs_df.columns]
+        jobs_out = jobs_df.iloc[used][out_cols]
+        return {
+            'jobs_version': version,
+            'jobs': json.loads(jobs_out.to_json(orient='split', index=False, date_format='iso')),
+            'date_columns': list(jobs_out.select_dtypes('datetime').columns),
+            'job_salaries': pairs.job_salaries[used].tolist(),
+            'pairs': {'job': job_idx.tolist(), 'candidate': pairs.cand_pos.tolist(), 'hike': pairs.hike.tolist()},
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = 'FinployMatch/1'
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip('/') != '/health':
+            return self._reply(404, {'error': f'unknown path {self.path}'})
+        try:
+            self._reply(200, self.server.service.health())
+        except Exception as e:
+            self._reply(500, {'error': str(e)})
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/match':
+            return self._reply(404, {'error': f'unknown path {self.path}'})
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            keys = request['keys']
+        except (ValueError, KeyError) as e:
+            return self._reply(400, {'error': f'expected JSON with a "keys" list: {e}'})
+        try:
+            self._reply(200, self.server.service.match(keys, request.get('rule')))
+        except Exception as e:
+            self._reply(500, {'error': str(e)})
+
+
+def serve(jobs_file, host=DEFAULT_HOST, port=DEFAULT_PORT, jobs_columns=JOBS_COLUMNS):
+    """Run the service until interrupted (GET /health, POST /match)."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.service = MatchService(jobs_file, jobs_columns)
+    server.service.jobs.current()
+    print(f"🚀 Match service listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("🛑 Match service stopped")
+    finally:
+        server.server_close()
+
+
+# =============================================================================
+# CLIENT
+# =============================================================================
+def match_pairs_remote(candidates_df, rule_spec, url=DEFAULT_URL, jobs_columns=JOBS_COLUMNS,
+                       candidates_columns=CANDIDATES_COLUMNS, timeout=SERVICE_TIMEOUT):
+    """MatchPairs for ``candidates_df`` from a running service, or None if it is unreachable.
+
+    Candidate-only rule constraints are applied here, so only keys travel.
+    The returned pairs hold just the matched jobs and export like local ones.
+    """
+    rule = compile_rule(rule_spec)
+    keys = candidates_df[candidates_columns['composite_key_col']].astype(object)
+    keys = keys.where(keys.notna() & rule.candidate_mask(candidates_df), None)
+    body = json.dumps({'keys': [None if k is None else str(k) for k in keys], 'rule': rule.spec}).encode('utf-8')
+    request = urllib.request.Request(url.rstrip('/') + '/match', data=body,
+                                     headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            payload = json.load(response)
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        print(f"⚠️ Match service unavailable at {url} ({e})")
+        return None
+
+    jobs_df = pd.DataFrame(payload['jobs']['data'], columns=payload['jobs']['columns'])
+    for col in payload['date_columns']:
+        jobs_df[col] = pd.to_datetime(jobs_df[col])
+    found = payload['pairs']
+    print(f"⚡ Match service returned {len(found['job'])} matches")
+    return MatchPairs(jobs_df, candidates_df, found['job'], found['candidate'], found['hike'],
+                      payload['job_salaries'], jobs_columns)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Resident Finploy job matching service')
+    parser.add_argument('--jobs', required=True, help='Path to MASTER FILE LOCATIONS - Mapping.xlsx')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    serve(args.jobs, args.host, args.port)
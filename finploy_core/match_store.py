@@ -0,0 +1,144 @@
+import hashlib
+import sqlite3
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+
+from finploy_core.matching import (
+    CANDIDATES_COLUMNS, JOBS_COLUMNS, MatchPairs, composite_key_arrays, hike_percent, match_pairs,
+)
+
+
+# =============================================================================
+# PERSISTED MATCH STATE
+# =============================================================================
+class MatchStore:
+    """SQLite record of the jobs each candidate composit_key matched.
+
+    For a fixed job set and salary rule a candidate's matches depend only on
+    its composit_key, so the store keeps (composit_key, job_id, job_key) rows
+    plus the set of keys already matched, stamped with a version of the job
+    set. Jobs are referred to by job_id together with their own composit_key,
+    so a hand-edited sheet that repeats a job_id under two keys does not mix
+    their matches up. A rerun against the same jobs only matches keys it has
+    not seen before; any change to the jobs (or the rule or hierarchy)
+    resets the store.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(matches)")}
+            if columns and 'job_key' not in columns:
+                # Store written before matches carried the job key: start over
+                conn.executescript("DROP TABLE matches; DELETE FROM matched_keys;")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+                CREATE TABLE IF NOT EXISTS matched_keys (composit_key TEXT PRIMARY KEY);
+                CREATE TABLE IF NOT EXISTS matches (
+                    composit_key TEXT NOT NULL,
+                    job_id TEXT NOT NULL,
+                    job_key TEXT NOT NULL,
+                    PRIMARY KEY (composit_key, job_id, job_key)
+                );
+            """)
+
+    @staticmethod
+    def _job_refs(jobs_df, jobs_columns=JOBS_COLUMNS):
+        """(job_id, job_key) text per job, '' for blanks."""
+        return pd.DataFrame({
+            'job_pos': np.arange(len(jobs_df)),
+            'job_id': jobs_df[jobs_columns['job_id_col']].fillna('').astype(str).to_numpy(),
+            'job_key': jobs_df[jobs_columns['composite_key_col']].fillna('').astype(str).to_numpy(),
+        })
+
+    @staticmethod
+    def jobs_version(jobs_df, salary_rule, jobs_columns=JOBS_COLUMNS, hierarchy=None):
+        """Stable hash of the rule, the hierarchy and the (job_id, composit_key) pair of every usable job.
+
+        Jobs whose composit_key the matcher cannot use never match, so they
+        do not count (and a blank job_id hashes as '').
+        """
+        prefix = composite_key_arrays(jobs_df, jobs_columns['composite_key_col'])[0]
+        refs = MatchStore._job_refs(jobs_df, jobs_columns)[prefix >= 0]
+        rows = sorted(refs['job_id'] + '\t' + refs['job_key'])
+        digest = hashlib.sha1(repr(salary_rule).encode('utf-8'))
+        if hierarchy:
+            digest.update(repr(hierarchy).encode('utf-8'))
+        digest.update('\n'.join(rows).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _load(self, version):
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            row = conn.execute("SELECT value FROM meta WHERE name = 'jobs_version'").fetchone()
+            if row is None or row[0] != version:
+                conn.execute("DELETE FROM matched_keys")
+                conn.execute("DELETE FROM matches")
+                conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('jobs_version', ?)", (version,))
+                return set(), pd.DataFrame({'composit_key': [], 'job_id': [], 'job_key': []}, dtype=str)
+            keys = {k for (k,) in conn.execute("SELECT composit_key FROM matched_keys")}
+            stored = pd.read_sql_query("SELECT composit_key, job_id, job_key FROM matches", conn)
+        return keys, stored
+
+    def _save(self, new_keys, new_matches):
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.executemany("INSERT OR IGNORE INTO matched_keys (composit_key) VALUES (?)",
+                             ((k,) for k in new_keys))
+            conn.executemany("INSERT OR IGNORE INTO matches (composit_key, job_id, job_key) VALUES (?, ?, ?)",
+                             new_matches.itertuples(index=False, name=None))
+
+    def match_pairs(self, jobs_df, candidates_df, salary_rule,
+                    jobs_columns=JOBS_COLUMNS, candidates_columns=CANDIDATES_COLUMNS, workers=None,
+                    hierarchy=None):
+        """Same result as matching.match_pairs, reusing stored matches.
+
+        Only candidates whose composit_key is new since the last run against
+        this job set go through the matcher; the rest are expanded from the
+        stored (composit_key, job_id, job_key) rows.
+        """
+        seen_keys, stored = self._load(self.jobs_version(jobs_df, salary_rule, jobs_columns, hierarchy))
+
+        cand_key_col = candidates_df[candidates_columns['composite_key_col']].reset_index(drop=True)
+        cand_keys = cand_key_col.astype(str)
+        # Candidates a rule rejects outright never match, so they neither reuse
+        # nor register keys; a key's stored jobs stay valid for any candidate.
+        if hasattr(salary_rule, 'candidate_mask'):
+            eligible = salary_rule.candidate_mask(candidates_df)
+        else:
+            eligible = np.ones(len(candidates_df), dtype=bool)
+        known = eligible & (cand_key_col.notna() & cand_keys.isin(seen_keys)).to_numpy()
+        fresh_pos = np.flatnonzero(eligible & ~known)
+
+        fresh = match_pairs(jobs_df, candidates_df.iloc[fresh_pos], salary_rule, jobs_columns, candidates_columns,
+                            workers=workers, hierarchy=hierarchy)
+        fresh_cand_pos = fresh_pos[fresh.cand_pos]
+
+        jobs = self._job_refs(jobs_df, jobs_columns)
+        reused = (
+            pd.DataFrame({'cand_pos': np.flatnonzero(known), 'composit_key': cand_keys[known].to_numpy()})
+            .merge(stored, on='composit_key')
+            .merge(jobs, on=['job_id', 'job_key'])
+        )
+        reused_job_pos = reused['job_pos'].to_numpy()
+        reused_cand_pos = reused['cand_pos'].to_numpy()
+        cand_salaries = composite_key_arrays(candidates_df, candidates_columns['composite_key_col'])[1]
+        reused_hike = hike_percent(cand_salaries[reused_cand_pos], fresh.job_salaries[reused_job_pos])
+
+        new_keys = cand_keys[eligible & ~known & cand_key_col.notna().to_numpy()].unique()
+        new_matches = pd.DataFrame({
+            'composit_key': cand_keys.to_numpy()[fresh_cand_pos],
+            'job_id': jobs['job_id'].to_numpy()[fresh.job_pos],
+            'job_key': jobs['job_key'].to_numpy()[fresh.job_pos],
+        }).drop_duplicates()
+        self._save(new_keys, new_matches)
+
+        print(f"♻️ Match store: reused {int(known.sum())} candidates, matched {len(fresh_pos)} new/changed")
+        pairs = MatchPairs(
+            jobs_df, candidates_df,
+            np.concatenate([fresh.job_pos, reused_job_pos]),
+            np.concatenate([fresh_cand_pos, reused_cand_pos]),
+            np.concatenate([fresh.hike, reused_hike]),
+            fresh.job_salaries, jobs_columns,
+        )
+        return pairs.sorted()
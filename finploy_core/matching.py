@@ -0,0 +1,604 @@
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# =============================================================================
+# COLUMN CONFIGURATION (same names in every pipeline)
+# =============================================================================
+JOBS_COLUMNS = {
+    'job_id_col': 'job_id',
+    'composite_key_col': 'composit_key',
+    'date_col': 'Date',
+    'company_col': 'Company',
+    'designation_col': 'Designation',
+    'location_col': 'Client location',
+    'hr_name_col': 'HR Name',
+    'status_col': 'Active /Inactive',
+    'company_code': 'company_code'
+}
+
+CANDIDATES_COLUMNS = {
+    'candidate_id_col': 'candidate_id',
+    'composite_key_col': 'composit_key'
+}
+
+# Typed key columns the enrichment step writes next to composit_key
+KEY_COLUMNS = {
+    'city_col': 'key_city_id',
+    'department_col': 'key_department',
+    'product_col': 'key_product',
+    'salary_col': 'key_salary_hundredths',  # salary in hundredths of a lakh (2.6 -> 260)
+    'prefix_col': 'key_prefix',             # packed city_dept_product, see pack_prefix
+}
+
+# Output column -> JOBS_COLUMNS key, stamped onto every matched candidate row
+JOB_OUTPUT_COLUMNS = [
+    ('job_id', 'job_id_col'),
+    ('Active /Inactive', 'status_col'),
+    ('job_date', 'date_col'),
+    ('job_composit_key', 'composite_key_col'),
+    ('job_company', 'company_col'),
+    ('job_designation', 'designation_col'),
+    ('job_location', 'location_col'),
+    ('job_hr_name', 'hr_name_col'),
+    ('company_code', 'company_code'),
+]
+
+
+# =============================================================================
+# SALARY RULES
+# =============================================================================
+# Each rule is an exact pair mask plus the candidate-salary interval it implies
+# for a given job salary; the index uses the interval to slice sorted buckets
+# and the mask then settles float rounding at the edges.
+BOUND_SLACK = 1e-9
+
+
+class SalaryAtMost:
+    """Candidate salary must not exceed the job salary."""
+
+    def __call__(self, cand_salary, job_salary):
+        return cand_salary <= job_salary
+
+    def __repr__(self):
+        return 'SalaryAtMost()'
+
+    def candidate_bounds(self, job_salary):
+        job_salary = np.asarray(job_salary, dtype=float)
+        return np.full(job_salary.shape, -np.inf), job_salary * (1 + BOUND_SLACK)
+
+
+class HikeRatioBand:
+    """Job salary must fall between lo × and hi × the candidate salary."""
+
+    def __init__(self, lo, hi):
+        self.lo = lo
+        self.hi = hi
+
+    def __repr__(self):
+        return f'HikeRatioBand({self.lo!r}, {self.hi!r})'
+
+    def __call__(self, cand_salary, job_salary):
+        return (
+            (cand_salary > 0)
+            & (cand_salary * self.lo <= job_salary)
+            & (job_salary <= cand_salary * self.hi)
+        )
+
+    def candidate_bounds(self, job_salary):
+        job_salary = np.asarray(job_salary, dtype=float)
+        lo = np.maximum(job_salary / self.hi * (1 - BOUND_SLACK), 0.0)
+        hi = job_salary / self.lo * (1 + BOUND_SLACK)
+        return lo, hi
+
+
+# =============================================================================
+# COMPOSITE KEYS
+# =============================================================================
+def parse_composite_keys(keys):
+    """Vectorized split of a composit_key column ('126_5_8_2.6').
+
+    Returns a DataFrame aligned with ``keys`` holding ``prefix`` (the
+    city_dept_product part) and ``salary``; both are NaN for keys that do not
+    have exactly four parts or whose salary is not a number.
+    """
+    keys = pd.Series(keys)
+    if keys.empty:
+        return pd.DataFrame({'prefix': pd.Series(dtype=object), 'salary': pd.Series(dtype=float)}, index=keys.index)
+    text = keys.fillna('').astype(str)
+    valid = keys.notna() & (text.str.count('_') == 3)
+    parts = text.str.rsplit('_', n=1)
+    prefix = parts.str[0].where(valid)
+    salary = pd.to_numeric(parts.str[1].where(valid), errors='coerce')
+    prefix = prefix.where(salary.notna())
+    return pd.DataFrame({'prefix': prefix, 'salary': salary}, index=keys.index)
+
+
+# Packed prefix layout: city_id << 32 | department << 16 | product. city_id
+# stays below 2**21 so the packed value survives Excel's float64 cells.
+_CITY_LIMIT = 1 << 21
+_CODE_LIMIT = 1 << 16
+
+
+def _whole_numbers(values):
+    """Float array of the values that are whole numbers, NaN elsewhere."""
+    num = pd.to_numeric(pd.Series(values).reset_index(drop=True), errors='coerce').to_numpy(dtype=float)
+    return np.where(num == np.floor(num), num, np.nan)
+
+
+def _codes(values, limit):
+    """Whole-number codes in [0, limit) as floats, NaN elsewhere (the values pack_prefix accepts)."""
+    codes = _whole_numbers(values)
+    return np.where((codes >= 0) & (codes < limit), codes, np.nan)
+
+
+def pack_prefix(city_ids, departments, products):
+    """city_dept_product as one int64 per row; -1 when a part is not a usable code."""
+    city, dept, product = (_whole_numbers(v) for v in (city_ids, departments, products))
+    ok = ((city >= 0) & (city < _CITY_LIMIT) & (dept >= 0) & (dept < _CODE_LIMIT)
+          & (product >= 0) & (product < _CODE_LIMIT))
+    packed = np.full(len(city), -1, dtype=np.int64)
+    packed[ok] = (city[ok].astype(np.int64) << 32) | (dept[ok].astype(np.int64) << 16) | product[ok].astype(np.int64)
+    return packed
+
+
+def unpack_prefix(packed):
+    """(city_id, department, product) int arrays from packed prefixes."""
+    packed = np.asarray(packed, dtype=np.int64)
+    return packed >> 32, (packed >> 16) & (_CODE_LIMIT - 1), packed & (_CODE_LIMIT - 1)
+
+
+def prefix_strings(packed):
+    """'city_dept_product' text for packed prefixes."""
+    return [f'{c}_{d}_{p}' for c, d, p in zip(*(part.tolist() for part in unpack_prefix(packed)))]
+
+
+def typed_key_columns(city_ids, departments, products, salaries):
+    """The KEY_COLUMNS frame for one enriched dataset, aligned with the inputs.
+
+    Codes become nullable small ints (NA when not a whole number in the
+    range pack_prefix accepts) and the salary an int in hundredths of a
+    lakh; key_prefix is NA when any code is unusable.
+    """
+    salary = pd.to_numeric(pd.Series(salaries).reset_index(drop=True), errors='coerce')
+    prefix = pack_prefix(city_ids, departments, products)
+    return pd.DataFrame({
+        KEY_COLUMNS['city_col']: pd.array(_codes(city_ids, _CITY_LIMIT), dtype='Int32'),
+        KEY_COLUMNS['department_col']: pd.array(_codes(departments, _CODE_LIMIT), dtype='Int32'),
+        KEY_COLUMNS['product_col']: pd.array(_codes(products, _CODE_LIMIT), dtype='Int32'),
+        KEY_COLUMNS['salary_col']: (salary * 100).round().astype('Int64'),
+        KEY_COLUMNS['prefix_col']: pd.array(np.where(prefix >= 0, prefix, np.nan), dtype='Int64'),
+    })
+
+
+def composite_key_arrays(df, key_col):
+    """(packed prefix, salary) per row of ``df``; -1 / NaN when unusable.
+
+    Reads the typed KEY_COLUMNS when the enrichment step wrote them and only
+    parses ``key_col`` text otherwise (e.g. the Mapping sheet's jobs).
+    """
+    prefix_col, salary_col = KEY_COLUMNS['prefix_col'], KEY_COLUMNS['salary_col']
+    if prefix_col in df.columns and salary_col in df.columns:
+        prefix = pd.to_numeric(df[prefix_col], errors='coerce').fillna(-1).to_numpy(dtype=np.int64)
+        salary = pd.to_numeric(df[salary_col], errors='coerce').to_numpy(dtype=float) / 100
+    else:
+        keys = parse_composite_keys(df[key_col].reset_index(drop=True))
+        prefix = np.full(len(keys), -1, dtype=np.int64)
+        valid = keys['prefix'].notna().to_numpy()
+        if valid.any():
+            parts = keys['prefix'][valid].str.split('_', expand=True)
+            prefix[valid] = pack_prefix(parts[0], parts[1], parts[2])
+        salary = keys['salary'].to_numpy(dtype=float)
+    unusable = (prefix < 0) | np.isnan(salary)
+    prefix[unusable] = -1
+    salary = np.where(unusable, np.nan, salary)
+    return prefix, salary
+
+
+# =============================================================================
+# DEPARTMENT / PRODUCT HIERARCHY
+# =============================================================================
+def _code_str(code):
+    """'8', 8 and 8.0 all name product 8 inside a composit_key."""
+    try:
+        return str(int(float(code)))
+    except (TypeError, ValueError):
+        return str(code).strip()
+
+
+class PrefixHierarchy:
+    """Related department/product codes (and nearby cities) a job also accepts.
+
+    ``departments`` and ``products`` map a job's code to the candidate codes
+    it takes besides its own, e.g. ``products={8: [9]}`` lets a product 8
+    job (mortgage) see product 9 candidates (home loan). ``cities`` does the
+    same for city_ids, typically geo.city_neighbours() for radius matching.
+    ``adjacency`` turns this into an int-keyed map from each prefix code to
+    the prefix codes a job with that prefix probes.
+    """
+
+    def __init__(self, departments=None, products=None, cities=None):
+        self.departments = self._normalize(departments)
+        self.products = self._normalize(products)
+        self.cities = self._normalize(cities)
+
+    @staticmethod
+    def _normalize(mapping):
+        return {_code_str(k): sorted({_code_str(v) for v in vs}) for k, vs in (mapping or {}).items()}
+
+    def __repr__(self):
+        return (f'PrefixHierarchy(departments={self.departments!r}, products={self.products!r}, '
+                f'cities={self.cities!r})')
+
+    def __bool__(self):
+        return bool(self.departments or self.products or self.cities)
+
+    def related_cities(self, city):
+        """``city`` followed by the other city_ids its jobs accept."""
+        return [city] + [c for c in self.cities.get(city, []) if c != city]
+
+    def related(self, prefix):
+        """Every city_dept_product prefix a job with ``prefix`` accepts, own first."""
+        city, dept, product = prefix.split('_')
+        depts = [dept] + [d for d in self.departments.get(dept, []) if d != dept]
+        products = [product] + [p for p in self.products.get(product, []) if p != product]
+        return [f'{c}_{d}_{p}' for c in self.related_cities(city) for d in depts for p in products]
+
+    def adjacency(self, prefixes):
+        """CSR (indptr, indices) over the codes of ``prefixes``.
+
+        Row ``c`` lists the codes job prefix ``prefixes[c]`` probes; related
+        prefixes that nobody carries are left out.
+        """
+        code_of = {p: i for i, p in enumerate(prefixes)}
+        rows = [[code_of[r] for r in self.related(p) if r in code_of] for p in prefixes]
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(r) for r in rows])
+        indices = np.fromiter((c for r in rows for c in r), dtype=np.int64, count=int(indptr[-1]))
+        return indptr, indices
+
+
+# =============================================================================
+# PREFIX / SALARY INDEX
+# =============================================================================
+def _expand_ranges(starts, ends):
+    """Concatenate arange(start, end) for every (start, end) pair."""
+    counts = ends - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64), counts
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return np.arange(total, dtype=np.int64) + offsets, counts
+
+
+class PrefixSalaryIndex:
+    """Candidates grouped by composite-key prefix, salaries sorted per bucket.
+
+    All buckets live in one array ordered by (prefix, salary), so a bucket is
+    a contiguous slice and a salary interval inside it is found with two
+    ``searchsorted`` calls. Salaries are replaced by their rank among the
+    distinct candidate salaries, which lets one int64 key (bucket, rank)
+    answer the lookups for every job at once.
+    """
+
+    def __init__(self, prefixes, salaries):
+        prefixes = pd.Series(prefixes).reset_index(drop=True)
+        salaries = pd.Series(salaries, dtype=float).reset_index(drop=True)
+        valid = (prefixes.notna() & salaries.notna()).to_numpy()
+
+        positions = np.flatnonzero(valid)
+        codes, self.prefixes = pd.factorize(prefixes[valid], sort=True)
+        self.prefix_codes = {p: i for i, p in enumerate(self.prefixes)}
+        salary = salaries.to_numpy()[valid]
+
+        order = np.lexsort((salary, codes))
+        self.positions = positions[order]
+        self.salaries = salary[order]
+        self.codes = codes[order].astype(np.int64)
+        self.salary_values = np.unique(self.salaries)
+        self._stride = len(self.salary_values) + 1
+        self.keys = self.codes * self._stride + np.searchsorted(self.salary_values, self.salaries)
+        self.bucket_starts = np.searchsorted(self.codes, np.arange(len(self.prefixes) + 1))
+
+    def __len__(self):
+        return len(self.positions)
+
+    def bucket(self, prefix):
+        """Return (positions, sorted salaries) for one prefix."""
+        code = self.prefix_codes.get(prefix)
+        if code is None:
+            return self.positions[:0], self.salaries[:0]
+        start, end = self.bucket_starts[code], self.bucket_starts[code + 1]
+        return self.positions[start:end], self.salaries[start:end]
+
+    def code_of(self, prefixes):
+        """Bucket code for each prefix, -1 when no candidate has it."""
+        return pd.Series(prefixes).map(self.prefix_codes).fillna(-1).to_numpy(dtype=np.int64)
+
+    def slices(self, codes, lo, hi):
+        """Slice [start, end) of candidates with salary in [lo, hi] per query."""
+        codes = np.asarray(codes, dtype=np.int64)
+        base = codes * self._stride
+        start = np.searchsorted(self.keys, base + np.searchsorted(self.salary_values, lo, side='left'), side='left')
+        end = np.searchsorted(self.keys, base + np.searchsorted(self.salary_values, hi, side='right'), side='left')
+        missing = codes < 0
+        start[missing] = 0
+        end[missing] = 0
+        return start, np.maximum(end, start)
+
+    def query(self, prefix, job_salary, salary_rule):
+        """Candidate positions for a single job, in candidate order."""
+        code = self.code_of([prefix])
+        lo, hi = salary_rule.candidate_bounds([job_salary])
+        start, end = self.slices(code, lo, hi)
+        idx = np.arange(start[0], end[0])
+        keep = salary_rule(self.salaries[idx], job_salary)
+        return np.sort(self.positions[idx[keep]])
+
+
+# =============================================================================
+# MATCH PAIRS
+# =============================================================================
+EXPORT_CHUNK_ROWS = 50000
+
+# Below this many candidates a process pool costs more than it saves
+PARALLEL_MIN_CANDIDATES = 20000
+
+
+class MatchPairs:
+    """Matches held as row positions instead of copied rows.
+
+    ``job_pos``/``cand_pos`` are int32 positions into ``jobs_df`` and
+    ``candidates_df`` and ``hike`` is the % hike of the job salary over the
+    candidate salary (both from composit_key). Candidate and job columns are
+    only gathered with ``take`` when a frame is materialized, so memory grows
+    with the number of pairs, not pairs × columns.
+    """
+
+    def __init__(self, jobs_df, candidates_df, job_pos, cand_pos, hike, job_salaries, jobs_columns=JOBS_COLUMNS):
+        self.jobs_df = jobs_df
+        self.candidates_df = candidates_df
+        self.job_pos = np.asarray(job_pos, dtype=np.int32)
+        self.cand_pos = np.asarray(cand_pos, dtype=np.int32)
+        self.hike = np.asarray(hike, dtype=float)
+        self.job_salaries = np.asarray(job_salaries, dtype=float)
+        self.jobs_columns = jobs_columns
+
+    def __len__(self):
+        return len(self.job_pos)
+
+    def take(self, selection):
+        """Subset of the pairs by boolean mask, positions or slice."""
+        return MatchPairs(self.jobs_df, self.candidates_df, self.job_pos[selection], self.cand_pos[selection],
+                          self.hike[selection], self.job_salaries, self.jobs_columns)
+
+    def sorted(self):
+        """Pairs ordered by job position, then candidate position."""
+        return self.take(np.lexsort((self.cand_pos, self.job_pos)))
+
+    def candidate_column(self, col):
+        """One candidate column aligned with the pairs."""
+        return self.candidates_df[col].to_numpy()[self.cand_pos]
+
+    def job_column(self, col):
+        """One job column aligned with the pairs."""
+        return self.jobs_df[col].to_numpy()[self.job_pos]
+
+    def frame(self, job_salary_col='Job_salary', hike_col=None, job_extras=None):
+        """Materialize candidate row + job columns for every pair.
+
+        ``job_extras`` maps extra output columns to arrays with one value per
+        job row; they follow the JOB_OUTPUT_COLUMNS. ``hike_col`` adds the
+        hike formatted like '25.0%'.
+        """
+        matches = (
+            self.candidates_df.take(self.cand_pos)
+            .drop(columns=list(KEY_COLUMNS.values()), errors='ignore')  # typed keys stay internal
+            .reset_index(drop=True)
+        )
+        job_rows = self.jobs_df.take(self.job_pos).reset_index(drop=True)
+
+        job_info = {}
+        for out_col, key in JOB_OUTPUT_COLUMNS:
+            src = self.jobs_columns[key]
+            job_info[out_col] = job_rows[src] if src in job_rows.columns else 'NA'
+        for out_col, values in (job_extras or {}).items():
+            job_info[out_col] = np.asarray(values)[self.job_pos]
+        if job_salary_col:
+            job_info[job_salary_col] = self.job_salaries[self.job_pos]
+        if hike_col:
+            job_info[hike_col] = pd.Series(self.hike).round(1).astype(str) + '%'
+        job_info = pd.DataFrame(job_info, index=matches.index)
+
+        matches = matches.drop(columns=[c for c in job_info.columns if c in matches.columns])
+        return pd.concat([matches, job_info], axis=1)
+
+    def iter_frames(self, chunk_size=EXPORT_CHUNK_ROWS, **frame_kwargs):
+        for start in range(0, len(self), chunk_size):
+            yield self.take(slice(start, start + chunk_size)).frame(**frame_kwargs)
+
+    def to_excel(self, path, chunk_size=EXPORT_CHUNK_ROWS, **frame_kwargs):
+        """Stream the materialized matches to one sheet, chunk by chunk."""
+        from openpyxl import Workbook
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet('Sheet1')
+        if not len(self):
+            ws.append(list(self.frame(**frame_kwargs).columns))
+        for i, chunk in enumerate(self.iter_frames(chunk_size, **frame_kwargs)):
+            if i == 0:
+                ws.append(list(chunk.columns))
+            chunk = chunk.astype(object).where(chunk.notna(), None)
+            for row in chunk.itertuples(index=False, name=None):
+                ws.append(row)
+        wb.save(path)
+        return len(self)
+
+
+# =============================================================================
+# MATCHING
+# =============================================================================
+def hike_percent(cand_salary, job_salary):
+    """% hike of the job salary over the candidate salary."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (job_salary - cand_salary) / cand_salary * 100
+
+
+def job_probes(job_codes, adjacency=None):
+    """(job index, prefix code) for every bucket each usable job probes."""
+    jobs = np.flatnonzero(job_codes >= 0)
+    probes = job_codes[jobs]
+    if adjacency is not None:
+        indptr, indices = adjacency
+        slots, n_probes = _expand_ranges(indptr[probes], indptr[probes + 1])
+        jobs, probes = np.repeat(jobs, n_probes), indices[slots]
+    return jobs, probes
+
+
+def _match_arrays(job_codes, job_salary, cand_codes, cand_salary, salary_rule, adjacency=None):
+    """Core lookup on integer prefix codes (-1 = unusable key).
+
+    ``adjacency`` is a PrefixHierarchy.adjacency CSR; each job then probes
+    every bucket its prefix code points to. Returns (job index, candidate
+    index, hike) arrays indexing the inputs.
+    """
+    index = PrefixSalaryIndex(cand_codes, cand_salary)
+    jobs, probes = job_probes(job_codes, adjacency)
+    lo, hi = salary_rule.candidate_bounds(job_salary[jobs])
+    start, end = index.slices(index.code_of(probes), lo, hi)
+
+    slots, counts = _expand_ranges(start, end)
+    pair_job = np.repeat(jobs, counts)
+    pair_salary = index.salaries[slots]
+    keep = salary_rule(pair_salary, job_salary[pair_job])
+    pair_job = pair_job[keep]
+    return pair_job, index.positions[slots[keep]], hike_percent(pair_salary[keep], job_salary[pair_job])
+
+
+def _match_shard(job_pos, job_codes, job_salary, cand_pos, cand_codes, cand_salary, salary_rule, adjacency):
+    """Worker entry point: match one shard and return global positions."""
+    job_idx, cand_idx, hike = _match_arrays(job_codes, job_salary, cand_codes, cand_salary, salary_rule, adjacency)
+    return job_pos[job_idx], cand_pos[cand_idx], hike
+
+
+def _city_shards(job_city, cand_city, n_shards):
+    """Assign each city with jobs to a shard, balancing jobs × candidates per shard."""
+    n_cities = max(job_city.max(initial=-1), cand_city.max(initial=-1)) + 1
+    n_jobs = np.bincount(job_city[job_city >= 0], minlength=n_cities)
+    work = n_jobs * np.bincount(cand_city[cand_city >= 0], minlength=n_cities)
+    shard_of_city = np.full(n_cities, -1)
+    loads = [(0, s) for s in range(n_shards)]
+    for city in np.argsort(-work, kind='stable'):
+        if n_jobs[city] == 0:
+            continue
+        load, shard = heapq.heappop(loads)
+        shard_of_city[city] = shard
+        heapq.heappush(loads, (load + int(work[city]), shard))
+    return shard_of_city
+
+
+def _match_sharded(job_codes, job_salary, cand_codes, cand_salary, prefixes, salary_rule, workers,
+                   adjacency=None):
+    """Run _match_shard per city shard in a ProcessPoolExecutor.
+
+    Jobs are split by city_id (the first part of the prefix). Each shard
+    gets its jobs plus only the candidates whose prefix those jobs probe
+    (their own, or the adjacency rows under a PrefixHierarchy), all as plain
+    NumPy arrays.
+    """
+    city_of_prefix = pd.factorize(unpack_prefix(prefixes)[0])[0]
+    job_city = np.where(job_codes >= 0, city_of_prefix[job_codes], -1)
+    cand_city = np.where(cand_codes >= 0, city_of_prefix[cand_codes], -1)
+    shard_of_city = _city_shards(job_city, cand_city, workers)
+    job_shard = np.where(job_city >= 0, shard_of_city[job_city], -1)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for shard in range(workers):
+            job_pos = np.flatnonzero(job_shard == shard)
+            shard_codes = job_codes[job_pos]
+            if adjacency is not None:
+                indptr, indices = adjacency
+                shard_codes = indices[_expand_ranges(indptr[shard_codes], indptr[shard_codes + 1])[0]]
+            probed = np.zeros(len(prefixes), dtype=bool)
+            probed[shard_codes] = True
+            cand_pos = np.flatnonzero((cand_codes >= 0) & probed[np.maximum(cand_codes, 0)])
+            if len(job_pos) and len(cand_pos):
+                futures.append(executor.submit(
+                    _match_shard, job_pos, job_codes[job_pos], job_salary[job_pos],
+                    cand_pos, cand_codes[cand_pos], cand_salary[cand_pos], salary_rule, adjacency))
+        # Collected in submission order, then sorted by the caller, so the
+        # result does not depend on which worker finishes first.
+        results = [f.result() for f in futures]
+
+    if not results:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
+    return tuple(np.concatenate(parts) for parts in zip(*results))
+
+
+def prefix_codes(job_prefix, cand_prefix):
+    """One int code per packed prefix present on either side (-1 = unusable).
+
+    Returns (job codes, candidate codes, packed prefix of each code).
+    """
+    packed = np.concatenate([job_prefix, cand_prefix])
+    codes = np.full(len(packed), -1, dtype=np.int64)
+    usable = packed >= 0
+    codes[usable], prefixes = pd.factorize(packed[usable])
+    return codes[:len(job_prefix)], codes[len(job_prefix):], prefixes
+
+
+def match_pairs(jobs_df, candidates_df, salary_rule,
+                jobs_columns=JOBS_COLUMNS, candidates_columns=CANDIDATES_COLUMNS, workers=None, hierarchy=None,
+                job_keys=None):
+    """Look every job up in a PrefixSalaryIndex built over the candidates.
+
+    Returns MatchPairs for every pair that passes ``salary_rule``, ordered by
+    job then candidate position. Keys are joined as packed int64 prefixes,
+    read from the typed KEY_COLUMNS when present; ``job_keys`` takes a
+    precomputed composite_key_arrays(jobs_df) for callers that match many
+    batches against one job set. A rule with a ``candidate_mask`` (see
+    rules.MatchRule) drops failing candidates before indexing. A
+    PrefixHierarchy as ``hierarchy`` lets each job also take candidates
+    under related department/product codes or nearby cities. With
+    ``workers`` > 1 and at least PARALLEL_MIN_CANDIDATES candidates, jobs
+    are split by city_id and matched in a process pool; the result is
+    identical.
+    """
+    if job_keys is None:
+        job_keys = composite_key_arrays(jobs_df, jobs_columns['composite_key_col'])
+    job_prefix, job_salary = job_keys
+    cand_prefix, cand_salary = composite_key_arrays(candidates_df, candidates_columns['composite_key_col'])
+    if hasattr(salary_rule, 'candidate_mask'):
+        excluded = ~salary_rule.candidate_mask(candidates_df)
+        cand_prefix[excluded], cand_salary[excluded] = -1, np.nan
+    job_codes, cand_codes, prefixes = prefix_codes(job_prefix, cand_prefix)
+    adjacency = hierarchy.adjacency(prefix_strings(prefixes)) if hierarchy else None
+
+    if workers and workers > 1 and len(cand_prefix) >= PARALLEL_MIN_CANDIDATES:
+        job_idx, cand_idx, hike = _match_sharded(job_codes, job_salary, cand_codes, cand_salary,
+                                                 prefixes, salary_rule, workers, adjacency)
+    else:
+        job_idx, cand_idx, hike = _match_arrays(job_codes, job_salary, cand_codes, cand_salary, salary_rule,
+                                                adjacency)
+
+    return MatchPairs(jobs_df, candidates_df, job_idx, cand_idx, hike, job_salary, jobs_columns).sorted()
+
+
+def match_jobs(jobs_df, candidates_df, salary_rule, job_salary_col='Job_salary',
+               jobs_columns=JOBS_COLUMNS, candidates_columns=CANDIDATES_COLUMNS, store=None, workers=None,
+               hierarchy=None):
+    """Match every job against every candidate and return one flat frame.
+
+    Each row is the full candidate row followed by the job columns in
+    JOB_OUTPUT_COLUMNS and, when ``job_salary_col`` is set, the salary parsed
+    from the job's composit_key. Missing job columns are filled with 'NA'.
+    Pass a match_store.MatchStore as ``store`` to reuse the previous run's
+    matches for unchanged candidate keys. Prefer match_pairs for large runs.
+    """
+    matcher = store.match_pairs if store is not None else match_pairs
+    pairs = matcher(jobs_df, candidates_df, salary_rule, jobs_columns, candidates_columns, workers=workers,
+                    hierarchy=hierarchy)
+    return pairs.frame(job_salary_col=job_salary_col)
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+# A nearest pincode is only trusted inside the same sorting district (first
+# three digits) and at most this far away numerically
+NEAREST_MAX_GAP = 20
+PINCODE_PATTERN = r'(?<!\d)([1-9]\d{5})(?!\d)'
+
+
+def parse_pincodes(values):
+    """Six-digit pincodes of ``values`` as int64, 0 where a value is not one ('400001.0' counts)."""
+    text = pd.Series(values, dtype=object).astype(str).str.strip().str.replace(r'\.0$', '', regex=True)
+    numbers = pd.to_numeric(text.where(text.str.fullmatch(r'[1-9]\d{5}')), errors='coerce')
+    return numbers.fillna(0).to_numpy(dtype=np.int64)
+
+
+def extract_pincodes(values):
+    """First six-digit pincode written inside each text ('new delhi - 110001'), 0 when there is none."""
+    found = pd.Series(values, dtype=object).astype(str).str.extract(PINCODE_PATTERN, expand=False)
+    return pd.to_numeric(found, errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+
+
+class PincodeIndex:
+    """Location master rows keyed by numeric pincode, as one sorted array.
+
+    Each pincode maps to its first master row. A lookup takes the exact
+    pincode when the master has it, else the numerically nearest one in the
+    same sorting district within ``max_gap`` (ties go to the lower
+    pincode); both are a single ``searchsorted`` over the batch.
+    """
+
+    def __init__(self, df_location, pincode_col='pincode', max_gap=NEAREST_MAX_GAP):
+        df = df_location.reset_index(drop=True)
+        pins = parse_pincodes(df[pincode_col]) if pincode_col in df.columns else np.zeros(len(df), dtype=np.int64)
+        valid = np.flatnonzero(pins > 0)
+        self.pincodes, first = np.unique(pins[valid], return_index=True)
+        self.rows = valid[first]
+        self.max_gap = max_gap
+
+    def __len__(self):
+        return len(self.pincodes)
+
+    def lookup(self, pincodes):
+        """Master row position for each pincode (-1 when none is close enough)."""
+        pincodes = np.asarray(pincodes, dtype=np.int64)
+        out = np.full(len(pincodes), -1, dtype=np.int64)
+        if not len(self.pincodes):
+            return out
+        right = np.clip(np.searchsorted(self.pincodes, pincodes), 0, len(self.pincodes) - 1)
+        left = np.clip(right - 1, 0, len(self.pincodes) - 1)
+        # Each neighbour must pass the district and gap checks on its own, so
+        # a closer pincode across a district boundary does not hide one inside it
+        gaps = []
+        for side in (left, right):
+            gap = np.abs(self.pincodes[side] - pincodes).astype(float)
+            gap[(self.pincodes[side] // 1000 != pincodes // 1000) | (gap > self.max_gap)] = np.inf
+            gaps.append(gap)
+        nearest = np.where(gaps[0] <= gaps[1], left, right)
+        ok = (pincodes > 0) & np.isfinite(np.minimum(gaps[0], gaps[1]))
+        out[ok] = self.rows[nearest[ok]]
+        return out
+
+    def resolve(self, resolver, values):
+        """LocationResolver fallback: pincodes written inside the unresolved location texts."""
+        positions = self.lookup(extract_pincodes(values))
+        if (positions >= 0).any():
+            print(f"📮 Pincode fallback resolved {int((positions >= 0).sum())} of {len(values)} unmatched locations")
+        return positions
+
+    def fill(self, positions, pincodes):
+        """``positions`` with every -1 replaced by the lookup of that row's pincode, where it finds one."""
+        positions = np.asarray(positions, dtype=np.int64).copy()
+        missing = np.flatnonzero(positions < 0)
+        if len(missing):
+            found = self.lookup(parse_pincodes(pd.Series(pincodes).iloc[missing]))
+            positions[missing] = np.where(found >= 0, found, positions[missing])
+        return positions
@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+
+# =============================================================================
+# RANKING CONFIGURATION
+# =============================================================================
+# Share of the score given to each signal (all signals are in [0, 1])
+RANK_WEIGHTS = {
+    'hike': 0.5,               # hike close to the middle of the band
+    'job_recency': 0.3,        # job Date
+    'candidate_recency': 0.2,  # candidate Activity / Modification
+}
+
+# A job or candidate this many days old scores 0.5 on recency
+RECENCY_HALF_DAYS = 30
+
+CANDIDATE_RECENCY_COLS = ('Activity', 'Modification')
+
+_UNIT_DAYS = {'h': 0, 'hr': 0, 'hour': 0, 'd': 1, 'day': 1, 'w': 7, 'wk': 7, 'week': 7,
+              'm': 30, 'mo': 30, 'mon': 30, 'month': 30, 'y': 365, 'yr': 365, 'year': 365}
+
+
+# =============================================================================
+# SIGNALS
+# =============================================================================
+def days_since(values, now=None):
+    """Age in days of each value; NaN when it cannot be read.
+
+    Handles dates and Naukri-style text such as 'Active 3d ago',
+    'Modified 2 weeks ago', 'Currently active' or 'Modified on 12 Oct 24'.
+    Work is done once per distinct value.
+    """
+    now = pd.Timestamp.now().normalize() if now is None else pd.Timestamp(now)
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=True)
+    if not len(uniques):
+        return np.full(len(codes), np.nan)
+
+    dates = pd.to_datetime(pd.Series(uniques), errors='coerce', format='mixed')
+    text = pd.Series(uniques).astype(str).str.strip().str.lower()
+    days = pd.Series(np.nan, index=text.index)
+    days[text.str.contains(r'today|currently|just now|online', regex=True)] = 0
+
+    rel = text.str.extract(r'(\d+)\s*(hour|hr|h|day|d|week|wk|w|month|mon|mo|m|year|yr|y)s?\b')
+    rel_days = pd.to_numeric(rel[0], errors='coerce') * rel[1].map(_UNIT_DAYS)
+    days = days.fillna(rel_days)
+
+    if dates.isna().any():
+        stripped = text.str.replace(r'^(modified|active)\s*(on)?\s*', '', regex=True)
+        dates = dates.fillna(pd.to_datetime(stripped, errors='coerce', format='mixed'))
+    days = days.fillna((now - dates).dt.days.astype(float).clip(lower=0))
+
+    out = days.to_numpy()[codes]
+    out[codes < 0] = np.nan
+    return out
+
+
+def recency_score(days):
+    """1.0 for today, 0.5 at RECENCY_HALF_DAYS, 0 when unknown."""
+    score = 1.0 / (1.0 + np.asarray(days, dtype=float) / RECENCY_HALF_DAYS)
+    return np.nan_to_num(score, nan=0.0)
+
+
+def hike_score(hike, hike_band):
+    """1.0 at the middle of ``hike_band`` (lo %, hi %), 0 at or beyond its edges.
+
+    A band with lo == hi has no width: only a hike on it scores 1.0.
+    """
+    lo, hi = hike_band
+    hike = np.asarray(hike, dtype=float)
+    mid, half = (lo + hi) / 2.0, (hi - lo) / 2.0
+    if half <= 0:
+        return np.isclose(hike, mid).astype(float)
+    score = 1.0 - np.abs(hike - mid) / half
+    return np.nan_to_num(np.clip(score, 0.0, 1.0), nan=0.0)
+
+
+def pair_scores(pairs, hike_band, weights=RANK_WEIGHTS, now=None):
+    """Weighted score in [0, 1] for every pair of a MatchPairs."""
+    score = weights['hike'] * hike_score(pairs.hike, hike_band)
+
+    date_col = pairs.jobs_columns['date_col']
+    if date_col in pairs.jobs_df.columns:
+        job_days = days_since(pairs.jobs_df[date_col].to_numpy(), now)
+        score = score + weights['job_recency'] * recency_score(job_days)[pairs.job_pos]
+
+    cand_cols = [c for c in CANDIDATE_RECENCY_COLS if c in pairs.candidates_df.columns]
+    if cand_cols:
+        cand_days = np.fmin.reduce([days_since(pairs.candidates_df[c].to_numpy(), now) for c in cand_cols])
+        score = score + weights['candidate_recency'] * recency_score(cand_days)[pairs.cand_pos]
+    return score
+
+
+# =============================================================================
+# SELECTION
+# =============================================================================
+def _top_per_group(groups, scores, limit):
+    """Mask keeping the ``limit`` best-scored rows of every group.
+
+    Ties keep the earlier row, so the result is reproducible.
+    """
+    order = np.lexsort((-scores, groups))
+    grouped = groups[order]
+    first = np.r_[True, grouped[1:] != grouped[:-1]] if len(grouped) else np.zeros(0, dtype=bool)
+    group_start = np.maximum.accumulate(np.where(first, np.arange(len(grouped)), 0))
+    keep = np.zeros(len(groups), dtype=bool)
+    keep[order[np.arange(len(grouped)) - group_start < limit]] = True
+    return keep
+
+
+def _top_n(scores, n):
+    """Positions of the ``n`` best scores via partial selection (argpartition)."""
+    if len(scores) <= n:
+        return np.arange(len(scores))
+    kth = np.partition(-scores, n - 1)[n - 1]
+    above = np.flatnonzero(-scores < kth)
+    ties = np.flatnonzero(-scores == kth)[:n - len(above)]
+    return np.sort(np.concatenate([above, ties]))
+
+
+def rank_matches(pairs, hike_band, top_per_candidate=None, top_per_job=None, budget=None,
+                 weights=RANK_WEIGHTS, now=None):
+    """Bound the fan-out of a MatchPairs to its best-scored pairs.
+
+    Keeps at most ``top_per_candidate`` jobs per candidate row, then at most
+    ``top_per_job`` candidates per job, then the ``budget`` best pairs
+    overall. Any limit left as None is not applied. The kept pairs stay in
+    job/candidate order.
+    """
+    if not len(pairs) or (top_per_candidate is None and top_per_job is None and budget is None):
+        return pairs
+
+    scores = pair_scores(pairs, hike_band, weights, now)
+    keep = np.arange(len(pairs))
+    if top_per_candidate is not None:
+        keep = keep[_top_per_group(pairs.cand_pos[keep], scores[keep], top_per_candidate)]
+    if top_per_job is not None:
+        keep = keep[_top_per_group(pairs.job_pos[keep], scores[keep], top_per_job)]
+    if budget is not None:
+        keep = keep[_top_n(scores[keep], budget)]
+    return pairs.take(keep)
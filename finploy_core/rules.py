@@ -0,0 +1,132 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from finploy_core.matching import BOUND_SLACK, hike_percent
+
+# =============================================================================
+# RULE SPEC
+# =============================================================================
+# Every pipeline describes its match rule as a dict with these keys; anything
+# left out takes the default (no constraint).
+RULE_DEFAULTS = {
+    'hike_pct': None,           # (lo, hi): job salary hike over candidate salary, % inclusive
+    'hike_decimals': None,      # compare the hike rounded like the exported Hike column
+    'max_salary': None,         # candidate salary cap, lakh
+    'min_experience': None,     # years, from the candidate 'experience' column
+    'max_experience': None,
+    'education': None,          # list of words; 'education 2' must contain one of them
+}
+
+CANDIDATE_COLUMNS = {
+    'experience_col': 'experience',
+    'education_col': 'education 2',
+}
+
+# Float noise allowance on the hike band edges when the hike is not rounded
+HIKE_TOLERANCE = 1e-9
+
+
+def experience_years(values):
+    """Years of experience from Naukri text ('3y 6m', '2 Years', '8 Months', '4.5 yrs').
+
+    NaN when no figure can be read; parsed once per distinct value.
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    text = pd.Series(uniques, dtype=object).astype(str).str.lower()
+    years = pd.to_numeric(text.str.extract(r'(\d+(?:\.\d+)?)\s*(?:y|yr|yrs|year|years)\b')[0], errors='coerce')
+    months = pd.to_numeric(text.str.extract(r'(\d+)\s*(?:m|mo|mos|month|months)\b')[0], errors='coerce')
+    total = years.fillna(0) + months.fillna(0) / 12
+    total = total.where(years.notna() | months.notna())
+    out = total.to_numpy(dtype=float)[codes] if len(uniques) else np.full(len(codes), np.nan)
+    out[codes < 0] = np.nan
+    return out
+
+
+# =============================================================================
+# COMPILED RULE
+# =============================================================================
+class MatchRule:
+    """A rule spec compiled to vectorized predicates.
+
+    Works as the matcher's salary rule: ``rule(cand_salary, job_salary)`` is
+    one NumPy expression over the pair arrays and ``candidate_bounds`` gives
+    the salary window the prefix index slices. Experience and education
+    depend only on the candidate, so ``candidate_mask`` evaluates them once
+    per candidate row before any pairs exist.
+    """
+
+    def __init__(self, spec=None):
+        unknown = set(spec or {}) - set(RULE_DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown match rule keys: {', '.join(sorted(unknown))}")
+        self.spec = {**RULE_DEFAULTS, **(spec or {})}
+        if self.spec['education']:
+            self.spec['education'] = [str(e).strip().lower() for e in self.spec['education']]
+
+    def __repr__(self):
+        return f'MatchRule({self.spec!r})'
+
+    def _band(self):
+        lo, hi = self.spec['hike_pct'] or (-np.inf, np.inf)
+        if self.spec['hike_decimals'] is None:
+            return lo - HIKE_TOLERANCE, hi + HIKE_TOLERANCE
+        half_step = 0.5 * 10.0 ** -self.spec['hike_decimals']
+        return lo - half_step, hi + half_step
+
+    def __call__(self, cand_salary, job_salary):
+        keep = np.ones(np.broadcast(cand_salary, job_salary).shape, dtype=bool)
+        if self.spec['hike_pct'] is not None:
+            hike = hike_percent(cand_salary, job_salary)
+            if self.spec['hike_decimals'] is None:
+                lo, hi = self._band()
+            else:
+                hike = np.round(hike, self.spec['hike_decimals'])
+                lo, hi = self.spec['hike_pct']
+            keep &= (cand_salary > 0) & (hike >= lo) & (hike <= hi)
+        if self.spec['max_salary'] is not None:
+            keep &= cand_salary <= self.spec['max_salary']
+        return keep
+
+    def candidate_bounds(self, job_salary):
+        job_salary = np.asarray(job_salary, dtype=float)
+        lo = np.full(job_salary.shape, -np.inf)
+        hi = np.full(job_salary.shape, np.inf)
+        if self.spec['hike_pct'] is not None:
+            # hike in [a, b] <=> job / (1 + b/100) <= cand <= job / (1 + a/100) for cand > 0
+            band_lo, band_hi = self._band()
+            lo = np.zeros(job_salary.shape)
+            if band_hi > -100:
+                lo = np.maximum(job_salary / (1 + band_hi / 100) * (1 - BOUND_SLACK), 0.0)
+            if band_lo > -100:
+                hi = job_salary / (1 + band_lo / 100) * (1 + BOUND_SLACK)
+        if self.spec['max_salary'] is not None:
+            hi = np.minimum(hi, self.spec['max_salary'])
+        return lo, hi
+
+    def candidate_mask(self, candidates_df):
+        """Rows of ``candidates_df`` that pass the candidate-only constraints."""
+        keep = np.ones(len(candidates_df), dtype=bool)
+        min_exp, max_exp = self.spec['min_experience'], self.spec['max_experience']
+        if min_exp is not None or max_exp is not None:
+            col = CANDIDATE_COLUMNS['experience_col']
+            years = experience_years(candidates_df[col]) if col in candidates_df.columns else np.full(len(keep), np.nan)
+            if min_exp is not None:
+                keep &= years >= min_exp
+            if max_exp is not None:
+                keep &= years <= max_exp
+        if self.spec['education']:
+            col = CANDIDATE_COLUMNS['education_col']
+            if col in candidates_df.columns:
+                text = candidates_df[col].fillna('').astype(str).str.lower()
+                pattern = '|'.join(map(re.escape, self.spec['education']))
+                keep &= text.str.contains(pattern, regex=True).to_numpy()
+            else:
+                keep[:] = False
+        return keep
+
+
+def compile_rule(spec):
+    """Compile a RULE_DEFAULTS-style dict into a MatchRule."""
+    return MatchRule(spec)
@@ -0,0 +1,89 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+# Candidate column naming the segment a row was fanned out for
+SEGMENT_COL = 'segment'
+
+
+def segment_name(department, product):
+    """Segment label used in the column and in file names, e.g. '3_3'."""
+    name = f'{str(department).strip()}_{str(product).strip()}'
+    return re.sub(r'[\\/:*?"<>|\s]+', '-', name)
+
+
+def fan_out_segments(df, segments, designation_col='designation'):
+    """One row per (candidate row, segment whose designation filter it matches).
+
+    ``segments`` is a list of (designation filter, department, product); the
+    filter is a case-insensitive regex on ``designation_col`` and None/'' takes
+    every row. The copies get the segment's department/product and a
+    SEGMENT_COL label; rows matching no segment are dropped. Each filter is
+    evaluated once per distinct designation.
+    """
+    codes, uniques = pd.factorize(df[designation_col].fillna('').astype(str)) if designation_col in df.columns \
+        else (np.zeros(len(df), dtype=np.int64), pd.Index(['']))
+    designations = pd.Series(uniques, dtype=object)
+
+    rows, seg_idx, seen = [], [], {}
+    for i, (pattern, department, product) in enumerate(segments):
+        name = segment_name(department, product)
+        first = seen.setdefault(name, i)
+        if pattern:
+            hit = designations.str.contains(pattern, flags=re.IGNORECASE, regex=True).to_numpy()
+            matched = np.flatnonzero(hit[codes])
+        else:
+            matched = np.arange(len(df))
+        rows.append(matched)
+        seg_idx.append(np.full(len(matched), first))
+
+    rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+    seg_idx = np.concatenate(seg_idx) if seg_idx else np.zeros(0, dtype=np.int64)
+    # Same-named segments may overlap: keep each (row, segment) once, in scrape order
+    keys = pd.DataFrame({'row': rows, 'seg': seg_idx}).drop_duplicates().sort_values(['row', 'seg'], kind='stable')
+    rows, seg_idx = keys['row'].to_numpy(), keys['seg'].to_numpy()
+
+    out = df.take(rows).reset_index(drop=True)
+    out['department'] = np.array([str(s[1]) for s in segments], dtype=object)[seg_idx]
+    out['product'] = np.array([str(s[2]) for s in segments], dtype=object)[seg_idx]
+    out[SEGMENT_COL] = np.array([segment_name(s[1], s[2]) for s in segments], dtype=object)[seg_idx]
+
+    for name, count in out[SEGMENT_COL].value_counts(sort=False).items():
+        print(f"🧩 Segment {name}: {count} rows")
+    unmatched = len(df) - len(np.unique(rows))
+    if unmatched:
+        print(f"⚠️ {unmatched} rows matched no segment designation filter and were dropped")
+    return out
+
+
+def split_segments(pairs):
+    """[(segment, MatchPairs)] partitioned by the candidates' SEGMENT_COL.
+
+    Empty when the candidates were not fanned out into segments.
+    """
+    if SEGMENT_COL not in pairs.candidates_df.columns or not len(pairs):
+        return []
+    labels = pd.Series(pairs.candidate_column(SEGMENT_COL)).astype(str)
+    codes, names = pd.factorize(labels, sort=True)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+    return [(name, pairs.take(order[bounds[i]:bounds[i + 1]])) for i, name in enumerate(names)]
+
+
+def export_segments(pairs, output_dir, filename, **frame_kwargs):
+    """Write one ``<stem>_<segment>.xlsx`` per segment under ``output_dir``.
+
+    Returns the number of files written (0 for single-segment runs).
+    """
+    parts = split_segments(pairs)
+    if not parts:
+        return 0
+    os.makedirs(output_dir, exist_ok=True)
+    stem, ext = os.path.splitext(filename)
+    for name, part in parts:
+        path = os.path.join(output_dir, f'{stem}_{name}{ext}')
+        part.to_excel(path, **frame_kwargs)
+        print(f"🧩 Saved {len(part)} matches for segment {name}: {path}")
+    return len(parts)
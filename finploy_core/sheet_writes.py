@@ -0,0 +1,120 @@
+import json
+
+# Sheets values.batchUpdate limits: Google recommends request bodies under 2 MB;
+# the range cap keeps a single failed/retried call small
+MAX_REQUEST_BYTES = 2_000_000
+MAX_RANGES_PER_REQUEST = 1000
+
+
+def column_letter(col):
+    """Column letter of 1-based column ``col`` (1 → A, 27 → AA)."""
+    label = ''
+    while col > 0:
+        col, rem = divmod(col - 1, 26)
+        label = chr(65 + rem) + label
+    return label
+
+
+def a1_range(top, left, bottom, right):
+    start = f'{column_letter(left)}{top}'
+    return start if (top, left) == (bottom, right) else f'{start}:{column_letter(right)}{bottom}'
+
+
+class WritePlanner:
+    """Cell writes for one worksheet, sent as few coalesced ranges as possible.
+
+    ``set`` records the intended value of a cell (the last one wins). ``ranges``
+    merges horizontally adjacent cells of a row into one run, then stacks runs
+    covering the same columns on consecutive rows into a rectangular block;
+    cells that are not written are never part of a range, so nothing else in
+    the sheet is overwritten. ``send`` packs the blocks into as few
+    ``batch_update`` (values.batchUpdate) calls as the request limits allow.
+    """
+
+    def __init__(self, max_bytes=MAX_REQUEST_BYTES, max_ranges=MAX_RANGES_PER_REQUEST):
+        self.cells = {}
+        self.max_bytes = max_bytes
+        self.max_ranges = max_ranges
+
+    def __len__(self):
+        return len(self.cells)
+
+    def set(self, row, col, value):
+        """Write ``value`` to 1-based ``row``/``col``."""
+        self.cells[(int(row), int(col))] = value
+
+    def set_row(self, row, values, start_col=1):
+        for offset, value in enumerate(values):
+            self.set(row, start_col + offset, value)
+
+    def set_row_changes(self, row, values, current, start_col=1):
+        """Plan only the cells of ``values`` that differ from ``current`` (the row as fetched); returns how many.
+
+        Both sides are compared as the text ``get_all_values`` returns, so an
+        unchanged row costs nothing to send.
+        """
+        changed = 0
+        for offset, value in enumerate(values):
+            pos = start_col - 1 + offset
+            old = current[pos] if pos < len(current) else ''
+            if ('' if value is None else str(value)) != old:
+                self.set(row, start_col + offset, value)
+                changed += 1
+        return changed
+
+    def _runs(self):
+        """(row, first col, last col, values) for every horizontal run of written cells."""
+        runs = []
+        for row, col in sorted(self.cells):
+            if runs and runs[-1][0] == row and runs[-1][2] == col - 1:
+                runs[-1][2] = col
+                runs[-1][3].append(self.cells[(row, col)])
+            else:
+                runs.append([row, col, col, [self.cells[(row, col)]]])
+        return runs
+
+    def ranges(self):
+        """``batch_update`` data: one {'range', 'values'} entry per rectangular block."""
+        blocks, open_blocks = [], {}
+        for row, left, right, values in self._runs():
+            block = open_blocks.get((left, right))
+            if block is not None and block['bottom'] == row - 1:
+                block['bottom'] = row
+                block['values'].append(values)
+            else:
+                block = {'top': row, 'bottom': row, 'left': left, 'right': right, 'values': [values]}
+                open_blocks[(left, right)] = block
+                blocks.append(block)
+        return [{'range': a1_range(b['top'], b['left'], b['bottom'], b['right']), 'values': b['values']}
+                for b in blocks]
+
+    def batches(self):
+        """``ranges`` split into request-sized lists."""
+        batches, batch, size = [], [], 0
+        for entry in self.ranges():
+            entry_size = len(json.dumps(entry, default=str)) + 2
+            if batch and (len(batch) >= self.max_ranges or size + entry_size > self.max_bytes):
+                batches.append(batch)
+                batch, size = [], 0
+            batch.append(entry)
+            size += entry_size
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def send(self, worksheet, call=None, **kwargs):
+        """Send every planned write through ``worksheet.batch_update``; returns the number of API calls.
+
+        ``call`` wraps each request (e.g. a script's retrying ``safe_api_call``);
+        ``kwargs`` are passed on to ``batch_update``.
+        """
+        batches = self.batches()
+        for batch in batches:
+            if call is None:
+                worksheet.batch_update(batch, **kwargs)
+            else:
+                call(worksheet.batch_update, batch, **kwargs)
+        if batches:
+            print(f"📝 Wrote {len(self.cells)} cells as {sum(len(b) for b in batches)} ranges "
+                  f"in {len(batches)} batch_update call(s)")
+        return len(batches)
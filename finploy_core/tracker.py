@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+# Tracker -Candidates columns the dialer-result sync keys on
+CONTACT_COLUMN = 'Contact'
+NAME_LOCATION_COLUMN = 'name_location'
+CANDIDATE_ID_COLUMN = 'candidate_id'
+
+
+def normalize_contact(values):
+    """Contacts as the tracker compares them: text with surrounding spaces removed, '' when blank."""
+    return pd.Series(values, dtype=object).fillna('').astype(str).str.strip()
+
+
+class TrackerIndex:
+    """In-memory indexes over one tracker tab's ``get_all_values`` payload.
+
+    Built once per run: header → column, normalized contact and name_location
+    → sheet row numbers (header is row 1, so the first candidate is row 2),
+    and the next free candidate_id. ``match`` answers update-vs-append for a
+    whole batch of contacts with one dict merge instead of a column scan per
+    candidate, and ``append`` registers a planned row so the indexes and the
+    id counter stay in step with what the sheet will hold after the write.
+    """
+
+    def __init__(self, values, contact_col=CONTACT_COLUMN, name_location_col=NAME_LOCATION_COLUMN,
+                 id_col=CANDIDATE_ID_COLUMN):
+        values = values or [[]]
+        self.headers = [str(h).strip() for h in values[0]]
+        self.rows = [list(r) for r in values[1:]]
+        self.columns = {h: i + 1 for i, h in enumerate(self.headers)}
+        self._folded = {}
+        for h, col in self.columns.items():
+            self._folded.setdefault(h.casefold(), col)
+
+        self.contact_col = self.column(contact_col)
+        self.name_location_col = self.column(name_location_col)
+        self.id_col = self.column(id_col)
+        self.by_contact = self._index(self.contact_col)
+        self.by_name_location = self._index(self.name_location_col)
+
+        ids = pd.to_numeric(pd.Series(self._column_values(self.id_col), dtype=object), errors='coerce')
+        self._next_id = int(ids.max()) + 1 if ids.notna().any() else 1
+
+    def __len__(self):
+        return len(self.rows)
+
+    def column(self, name):
+        """1-based column of header ``name`` (exact, then case-insensitive), None when absent."""
+        name = str(name).strip()
+        return self.columns.get(name) or self._folded.get(name.casefold())
+
+    def _column_values(self, col):
+        if col is None:
+            return [''] * len(self.rows)
+        return [r[col - 1] if len(r) >= col else '' for r in self.rows]
+
+    def _index(self, col):
+        index = {}
+        for rownum, key in enumerate(normalize_contact(self._column_values(col)), start=2):
+            if key:
+                index.setdefault(key, []).append(rownum)
+        return index
+
+    def row(self, rownum):
+        """Copy of sheet row ``rownum`` padded to the header width."""
+        row = list(self.rows[rownum - 2])
+        return row + [''] * (len(self.headers) - len(row))
+
+    def cell(self, rownum, name, default=''):
+        col = self.column(name)
+        row = self.rows[rownum - 2]
+        return row[col - 1] if col is not None and len(row) >= col else default
+
+    def match(self, values, by='contact'):
+        """Last sheet row holding each of ``values`` (contacts or name_locations), 0 where none does."""
+        index = self.by_contact if by == 'contact' else self.by_name_location
+        last = {key: rownums[-1] for key, rownums in index.items()}
+        keys = normalize_contact(values)
+        return keys.map(last).fillna(0).to_numpy(dtype=np.int64)
+
+    def next_candidate_id(self):
+        """Reserve and return the next candidate_id."""
+        new_id = self._next_id
+        self._next_id += 1
+        return new_id
+
+    def append(self, row):
+        """Register ``row`` (header-aligned values) as planned for append; returns its sheet row number."""
+        self.rows.append(list(row))
+        rownum = len(self.rows) + 1
+        for col, index in ((self.contact_col, self.by_contact), (self.name_location_col, self.by_name_location)):
+            key = normalize_contact([row[col - 1]])[0] if col is not None and len(row) >= col else ''
+            if key:
+                index.setdefault(key, []).append(rownum)
+        if self.id_col is not None and len(row) >= self.id_col:
+            planned_id = pd.to_numeric(row[self.id_col - 1], errors='coerce')
+            if pd.notna(planned_id) and planned_id >= self._next_id:
+                self._next_id = int(planned_id) + 1
+        return rownum
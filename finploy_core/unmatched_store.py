@@ -0,0 +1,115 @@
+import argparse
+import json
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+
+import pandas as pd
+
+from finploy_core.locations import UNMATCHED_STATUS, normalize_location
+
+STORE_FILENAME = 'unmatched_locations.sqlite'
+EXPORT_FILENAME = 'additional_new_location.xlsx'
+
+# First column present names the sample candidate of a location
+CANDIDATE_REF_COLUMNS = ('name_location', 'link href', 'name of candidate', 'link', 'candidate_id')
+
+
+# =============================================================================
+# UNMATCHED LOCATION STORE
+# =============================================================================
+class UnmatchedLocationStore:
+    """SQLite table of locations the resolver could not place, one row per normalized location.
+
+    ``record`` upserts only the run's distinct unmatched locations: a new one
+    is inserted with its first-seen time, a sample candidate reference and
+    that candidate's full row; a known one only gets its last-seen time and
+    occurrence count bumped. Nothing already stored is read or rewritten, so
+    a run costs O(its own unmatched rows) however long the history. The
+    team's workbook comes from ``export``.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.executescript(f"""
+                CREATE TABLE IF NOT EXISTS unmatched_locations (
+                    location_key TEXT PRIMARY KEY,
+                    location TEXT NOT NULL,
+                    first_seen TEXT NOT NULL,
+                    last_seen TEXT NOT NULL,
+                    occurrences INTEGER NOT NULL,
+                    sample_candidate TEXT,
+                    sample_row TEXT,
+                    status TEXT NOT NULL DEFAULT '{UNMATCHED_STATUS}'
+                );
+            """)
+
+    def record(self, df_unmatched, seen_at=None):
+        """Upsert the rows of ``df_unmatched`` (unmatched_location_rows output); returns (new, known) counts."""
+        if df_unmatched.empty:
+            print("✅ All locations matched successfully — no unmatched candidates found.")
+            return 0, 0
+        seen_at = (seen_at or datetime.now()).isoformat(timespec='seconds')
+        raw = df_unmatched['unmatched_location'].astype(str)
+        keys = raw.where(raw.eq('blank'), raw.map(normalize_location))
+        ref_col = next((c for c in CANDIDATE_REF_COLUMNS if c in df_unmatched.columns), None)
+
+        first = ~keys.duplicated()
+        counts = keys.value_counts(sort=False)
+        samples = df_unmatched[first.to_numpy()]
+        rows = [
+            (key, location, seen_at, seen_at, int(counts[key]),
+             None if ref_col is None else str(sample[ref_col]),
+             sample.to_json(force_ascii=False, date_format='iso', default_handler=str))
+            for key, location, (_, sample) in zip(keys[first], raw[first], samples.iterrows())
+        ]
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            before = conn.execute("SELECT COUNT(*) FROM unmatched_locations").fetchone()[0]
+            conn.executemany("""
+                INSERT INTO unmatched_locations
+                    (location_key, location, first_seen, last_seen, occurrences, sample_candidate, sample_row)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (location_key) DO UPDATE SET
+                    last_seen = excluded.last_seen,
+                    occurrences = occurrences + excluded.occurrences
+            """, rows)
+            added = conn.execute("SELECT COUNT(*) FROM unmatched_locations").fetchone()[0] - before
+        print(f"⚠️ {len(df_unmatched)} unmatched location candidates: {added} new locations, "
+              f"{len(rows) - added} already known → {self.path}")
+        return added, len(rows) - added
+
+    def to_frame(self, status=None):
+        """Stored locations, most frequent first; the sample row's columns are expanded alongside."""
+        query = "SELECT * FROM unmatched_locations"
+        params = ()
+        if status is not None:
+            query, params = query + " WHERE status = ?", (status,)
+        with closing(sqlite3.connect(self.path)) as conn:
+            df = pd.read_sql_query(query + " ORDER BY occurrences DESC, location_key", conn, params=params)
+        samples = pd.DataFrame([json.loads(r) if r else {} for r in df.pop('sample_row')], index=df.index)
+        samples = samples.drop(columns=[c for c in samples.columns if c in df.columns])
+        return pd.concat([df, samples], axis=1)
+
+    def __len__(self):
+        with closing(sqlite3.connect(self.path)) as conn:
+            return conn.execute("SELECT COUNT(*) FROM unmatched_locations").fetchone()[0]
+
+    def export(self, path, status=UNMATCHED_STATUS):
+        """Write the stored locations (default: still needing a master entry) to an Excel workbook."""
+        df = self.to_frame(status)
+        df.to_excel(path, index=False)
+        print(f"💾 Exported {len(df)} unmatched locations to: {path}")
+        return path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Export the unmatched location store for the team')
+    parser.add_argument('store', help=f'Path to {STORE_FILENAME}')
+    parser.add_argument('out', nargs='?', help=f'Workbook to write (default: {EXPORT_FILENAME} next to the store)')
+    parser.add_argument('--all', action='store_true', help='Include locations whose status was changed')
+    args = parser.parse_args()
+
+    out = args.out or os.path.join(os.path.dirname(os.path.abspath(args.store)), EXPORT_FILENAME)
+    UnmatchedLocationStore(args.store).export(out, status=None if args.all else UNMATCHED_STATUS)
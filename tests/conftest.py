@@ -0,0 +1,5 @@
+import os
+import sys
+
+# finploy_core is imported from the repository root, as the pipeline scripts do
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
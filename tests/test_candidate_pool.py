@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from finploy_core.candidate_pool import CandidatePool
+from finploy_core.matching import SalaryAtMost
+from finploy_core.segments import SEGMENT_COL
+
+
+def _jobs(ids, keys):
+    return pd.DataFrame({'job_id': ids, 'composit_key': keys, 'Active /Inactive': 'Active'})
+
+
+def test_load_reads_days_with_different_column_types(tmp_path):
+    pool = CandidatePool(tmp_path)
+    pool.append(pd.DataFrame({'name_location': ['a'], 'composit_key': ['1_1_1_5'], 'Activity': [np.nan]}))
+    pool.append(pd.DataFrame({'name_location': ['b'], 'composit_key': ['1_1_1_6'], 'Activity': ['called']}))
+    loaded = pool.load()
+    assert sorted(loaded['name_location']) == ['a', 'b']
+
+
+def test_load_keeps_one_row_per_candidate_and_segment(tmp_path):
+    pool = CandidatePool(tmp_path)
+    day = pd.DataFrame({'name_location': ['a', 'a'], 'composit_key': ['1_1_1_5', '1_2_1_5'],
+                        SEGMENT_COL: ['sales', 'credit']})
+    pool.append(day)
+    pool.append(day.iloc[:1])
+    loaded = pool.load()
+    assert sorted(loaded[SEGMENT_COL]) == ['credit', 'sales']
+
+
+def test_job_delta_with_repeated_and_blank_job_ids(tmp_path):
+    pool = CandidatePool(tmp_path)
+    pool.append(pd.DataFrame({'name_location': ['a', 'b'], 'composit_key': ['1_3_3_4', '2_3_3_4']}))
+    jobs = _jobs(['7', '7', np.nan], ['1_3_3_5', '2_3_3_5', '1_3_3_5'])
+
+    new_pairs, dropped, stored = pool.match_job_delta(jobs, SalaryAtMost())
+    assert len(new_pairs) == 3 and not dropped
+
+    # an unchanged sheet is a no-op, duplicates included
+    new_pairs, dropped, stored = pool.match_job_delta(jobs, SalaryAtMost())
+    assert len(new_pairs) == 0 and not dropped and len(stored) == 3
+
+    # one of the repeated rows changes: the whole job_id is rematched
+    jobs.loc[1, 'composit_key'] = '2_3_3_3'
+    new_pairs, dropped, stored = pool.match_job_delta(jobs, SalaryAtMost())
+    assert dropped == {'7'}
+    assert len(new_pairs) == 1
+    assert sorted(stored['job_id']) == ['', '7']
@@ -0,0 +1,19 @@
+import json
+
+from finploy_core.location_master import _paths, _read_cache, _write_cache
+
+
+def test_cache_round_trip(tmp_path):
+    values = [['area', 'city'], ['Andheri', 'Mumbai']]
+    _write_cache(tmp_path, 'sheet', values, '2024-01-01T00:00:00Z')
+    cached, meta = _read_cache(tmp_path, 'sheet')
+    assert cached == values
+    assert meta['modified_time'] == '2024-01-01T00:00:00Z'
+
+
+def test_cache_without_header_is_ignored(tmp_path):
+    _write_cache(tmp_path, 'sheet', [['area'], ['Andheri']], 'v1')
+    meta_path = _paths(tmp_path, 'sheet')[1]
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump({'sheet_id': 'sheet', 'modified_time': 'v1'}, f)
+    assert _read_cache(tmp_path, 'sheet') == (None, None)
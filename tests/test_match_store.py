@@ -0,0 +1,59 @@
+import sqlite3
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+
+from finploy_core.match_store import MatchStore
+from finploy_core.matching import SalaryAtMost
+
+
+def _pairs(pairs):
+    return sorted(zip(pairs.job_pos.tolist(), pairs.cand_pos.tolist()))
+
+
+def test_rerun_reuses_stored_matches(tmp_path):
+    jobs = pd.DataFrame({'job_id': ['J1', 'J2'], 'composit_key': ['1_3_3_5', '2_3_3_5']})
+    cands = pd.DataFrame({'candidate_id': [1, 2, 3], 'composit_key': ['1_3_3_4', '2_3_3_6', '2_3_3_5']})
+    store = MatchStore(tmp_path / 'matches.db')
+    first = store.match_pairs(jobs, cands, SalaryAtMost())
+    second = store.match_pairs(jobs, cands, SalaryAtMost())
+    assert _pairs(first) == [(0, 0), (1, 2)]
+    assert _pairs(second) == _pairs(first)
+    assert np.allclose(second.hike, first.hike)
+
+
+def test_blank_job_rows_do_not_break_the_version(tmp_path):
+    jobs = pd.DataFrame({'job_id': ['J1', np.nan, 'J3'], 'composit_key': ['1_3_3_5', '1_3_3_5', np.nan]})
+    cands = pd.DataFrame({'candidate_id': [1], 'composit_key': ['1_3_3_4']})
+    store = MatchStore(tmp_path / 'matches.db')
+    first = store.match_pairs(jobs, cands, SalaryAtMost())
+    second = store.match_pairs(jobs, cands, SalaryAtMost())
+    assert _pairs(first) == _pairs(second) == [(0, 0), (1, 0)]
+    # a job the matcher cannot use does not change the version
+    usable = jobs.iloc[:2]
+    assert MatchStore.jobs_version(usable, SalaryAtMost()) == MatchStore.jobs_version(jobs, SalaryAtMost())
+
+
+def test_duplicate_job_ids_keep_their_own_keys(tmp_path):
+    jobs = pd.DataFrame({'job_id': [7, 7], 'composit_key': ['1_3_3_5', '2_3_3_5']})
+    cands = pd.DataFrame({'candidate_id': [1, 2], 'composit_key': ['1_3_3_4', '2_3_3_4']})
+    store = MatchStore(tmp_path / 'matches.db')
+    first = store.match_pairs(jobs, cands, SalaryAtMost())
+    second = store.match_pairs(jobs, cands, SalaryAtMost())
+    assert _pairs(first) == _pairs(second) == [(0, 0), (1, 1)]
+
+
+def test_store_without_job_key_is_reset(tmp_path):
+    path = tmp_path / 'matches.db'
+    with closing(sqlite3.connect(path)) as conn, conn:
+        conn.executescript("""
+            CREATE TABLE matched_keys (composit_key TEXT PRIMARY KEY);
+            CREATE TABLE matches (composit_key TEXT NOT NULL, job_id TEXT NOT NULL,
+                                  PRIMARY KEY (composit_key, job_id));
+            INSERT INTO matched_keys VALUES ('1_3_3_4');
+            INSERT INTO matches VALUES ('1_3_3_4', 'J1');
+        """)
+    jobs = pd.DataFrame({'job_id': ['J1'], 'composit_key': ['1_3_3_5']})
+    cands = pd.DataFrame({'candidate_id': [1], 'composit_key': ['1_3_3_4']})
+    assert _pairs(MatchStore(path).match_pairs(jobs, cands, SalaryAtMost())) == [(0, 0)]
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from finploy_core import matching
+from finploy_core.matching import HikeRatioBand, SalaryAtMost, match_pairs, typed_key_columns
+
+
+def _baseline_pairs(jobs_df, candidates_df, salary_rule):
+    """The per-job filter the pipelines used before the shared matcher (prefix text + salary test)."""
+    def parse(key):
+        if pd.isna(key) or str(key).count('_') != 3:
+            return None
+        parts = str(key).split('_')
+        try:
+            return '_'.join(parts[:3]), float(parts[3])
+        except ValueError:
+            return None
+
+    cands = [parse(k) for k in candidates_df['composit_key']]
+    pairs = set()
+    for j, job_key in enumerate(jobs_df['composit_key']):
+        job = parse(job_key)
+        if job is None:
+            continue
+        for c, cand in enumerate(cands):
+            if cand is not None and cand[0] == job[0] and salary_rule(np.array(cand[1]), np.array(job[1])):
+                pairs.add((j, c))
+    return pairs
+
+
+def _random_keys(rng, n):
+    keys = [f'{rng.integers(1, 4)}_{rng.integers(1, 3)}_{rng.integers(1, 3)}_{rng.integers(10, 100) / 10}'
+            for _ in range(n)]
+    junk = [np.nan, '', '1_1_1', '1_1_1_x', '2_1_1_1_5', 'none']
+    for i in rng.choice(n, size=n // 10, replace=False):
+        keys[i] = junk[i % len(junk)]
+    return keys
+
+
+@pytest.fixture
+def frames():
+    rng = np.random.default_rng(11)
+    jobs = pd.DataFrame({'job_id': [f'J{i}' for i in range(80)], 'composit_key': _random_keys(rng, 80)})
+    cands = pd.DataFrame({'candidate_id': range(400), 'composit_key': _random_keys(rng, 400)})
+    return jobs, cands
+
+
+@pytest.mark.parametrize('rule', [SalaryAtMost(), HikeRatioBand(1.05, 1.90), HikeRatioBand(1.0, 1.0)])
+def test_match_pairs_equals_per_job_filter(frames, rule):
+    jobs, cands = frames
+    expected = _baseline_pairs(jobs, cands, rule)
+    pairs = match_pairs(jobs, cands, rule)
+    assert expected
+    assert set(zip(pairs.job_pos.tolist(), pairs.cand_pos.tolist())) == expected
+
+
+def test_typed_key_columns_give_the_same_pairs(frames):
+    jobs, cands = frames
+    parts = cands['composit_key'].astype(str).str.split('_', expand=True)
+    valid = cands['composit_key'].notna() & (cands['composit_key'].astype(str).str.count('_') == 3)
+    typed = typed_key_columns(parts[0].where(valid), parts[1].where(valid), parts[2].where(valid),
+                              pd.to_numeric(parts[3].where(valid), errors='coerce'))
+    rule = HikeRatioBand(1.05, 1.90)
+    plain = match_pairs(jobs, cands, rule)
+    keyed = match_pairs(jobs, cands.join(typed), rule)
+    assert set(zip(keyed.job_pos.tolist(), keyed.cand_pos.tolist())) == \
+        set(zip(plain.job_pos.tolist(), plain.cand_pos.tolist()))
+
+
+def test_sharded_matching_is_identical(frames, monkeypatch):
+    jobs, cands = frames
+    monkeypatch.setattr(matching, 'PARALLEL_MIN_CANDIDATES', 1)
+    rule = SalaryAtMost()
+    serial = match_pairs(jobs, cands, rule)
+    sharded = match_pairs(jobs, cands, rule, workers=2)
+    assert sharded.job_pos.tolist() == serial.job_pos.tolist()
+    assert sharded.cand_pos.tolist() == serial.cand_pos.tolist()
+
+
+def test_typed_key_columns_out_of_range_codes_are_na():
+    keys = typed_key_columns([5, 5], [40000, 70000], [3, 3], [2.5, 2.5])
+    assert keys['key_department'].tolist()[0] == 40000
+    assert keys['key_department'].isna().tolist() == [False, True]
+    assert keys['key_prefix'].isna().tolist() == [False, True]
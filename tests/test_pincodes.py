@@ -0,0 +1,23 @@
+import pandas as pd
+
+from finploy_core.pincodes import PincodeIndex, parse_pincodes
+
+
+def _index():
+    return PincodeIndex(pd.DataFrame({'pincode': ['400001', '400020', '401001', '401005', 'na']}))
+
+
+def test_exact_and_nearest_pincodes():
+    assert _index().lookup([400001, 400005, 400013, 401003, 0]).tolist() == [0, 0, 1, 2, -1]
+
+
+def test_nearest_must_share_the_district():
+    # 400998 is 3 away from 401001 (other district) but 978 from 400020
+    assert _index().lookup([400998]).tolist() == [-1]
+    # 400999 is nearest to 401001 across the boundary; 400985 inside it is taken instead
+    index = PincodeIndex(pd.DataFrame({'pincode': [400985, 401001]}), max_gap=20)
+    assert index.lookup([400999]).tolist() == [0]
+
+
+def test_parse_pincodes():
+    assert parse_pincodes(['400001.0', ' 110001 ', '12345', None]).tolist() == [400001, 110001, 0, 0]
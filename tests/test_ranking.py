@@ -0,0 +1,11 @@
+import numpy as np
+
+from finploy_core.ranking import hike_score
+
+
+def test_hike_score_peaks_mid_band():
+    assert hike_score([10, 50, 70, 90, np.nan], (10, 90)).tolist() == [0.0, 1.0, 0.5, 0.0, 0.0]
+
+
+def test_hike_score_zero_width_band():
+    assert hike_score([0.0, 5.0, np.nan], (0, 0)).tolist() == [1.0, 0.0, 0.0]
@@ -0,0 +1,32 @@
+import numpy as np
+
+from finploy_core.tracker import TrackerIndex, normalize_contact
+
+VALUES = [
+    ['candidate_id', 'Contact', 'name_location'],
+    ['1', '9800000001', 'asha_pune'],
+    ['2', ' 9800000002 ', 'ravi_mumbai'],
+    ['3', '9800000001', 'asha_pune'],
+    ['4', '', ''],
+]
+
+
+def test_blank_contacts_normalize_to_empty():
+    assert normalize_contact([np.nan, None, ' 98 ', 9800000001]).tolist() == ['', '', '98', '9800000001']
+
+
+def test_match_returns_last_row_and_skips_blanks():
+    tracker = TrackerIndex(VALUES)
+    assert tracker.match(['9800000001', '9800000002', np.nan, '', '7']).tolist() == [4, 3, 0, 0, 0]
+    assert tracker.match(['ravi_mumbai'], by='name_location').tolist() == [3]
+    assert '' not in tracker.by_contact
+
+
+def test_append_updates_indexes_and_ids():
+    tracker = TrackerIndex(VALUES)
+    assert tracker.next_candidate_id() == 5
+    rownum = tracker.append(['9', '9800000009', np.nan])
+    assert rownum == 6
+    assert tracker.match(['9800000009']).tolist() == [6]
+    assert 'nan' not in tracker.by_name_location
+    assert tracker.next_candidate_id() == 10